@@ -0,0 +1,144 @@
+"""Deterministic synthetic CSV datasets for benchmarks."""
+
+import csv
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+CATEGORIES = ["north", "south", "east", "west", "central"]
+PRODUCTS = ["widget", "gadget", "gizmo", "doohickey", "sprocket", "thingamajig"]
+WORDS = [
+    "late",
+    "delivery",
+    "customer",
+    "refund",
+    "priority",
+    "damaged",
+    "repeat",
+    "order",
+    "support",
+    "review",
+]
+
+# Fraction of cells left empty, so completeness stats have work to do
+EMPTY_RATE = 0.03
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Shape of a synthetic dataset."""
+
+    name: str
+    rows: int
+    columns: int
+    seed: int = 0
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}-{self.rows}x{self.columns}-s{self.seed}.csv"
+
+
+def _column_kinds(columns: int) -> List[str]:
+    """Cycle through mixed column types so every shape covers each type."""
+    kinds = ["int", "float", "date", "category", "text", "money", "id"]
+    return [kinds[i % len(kinds)] for i in range(columns)]
+
+
+def _cell_factory(kind: str, rng: random.Random) -> Callable[[int], str]:
+    start = date(2020, 1, 1)
+    if kind == "int":
+        return lambda i: str(rng.randint(0, 10_000))
+    if kind == "float":
+        return lambda i: f"{rng.uniform(-1000, 1000):.3f}"
+    if kind == "date":
+        return lambda i: (start + timedelta(days=rng.randint(0, 1500))).isoformat()
+    if kind == "category":
+        return lambda i: rng.choice(CATEGORIES)
+    if kind == "text":
+        return lambda i: " ".join(rng.choices(WORDS, k=rng.randint(2, 8)))
+    if kind == "money":
+        return lambda i: f"{rng.uniform(0, 250_000):,.2f}"
+    return lambda i: f"{rng.choice(PRODUCTS)}-{i}"
+
+
+def generate_csv(spec: DatasetSpec, path: Path) -> Path:
+    """
+    Write a synthetic dataset with mixed column types.
+
+    Rows are streamed to disk, so memory stays flat for any row count. The
+    same spec always produces the same bytes.
+
+    Args:
+        spec: Dataset shape and seed
+        path: File to write
+
+    Returns:
+        Path of the written file
+    """
+    rng = random.Random(spec.seed)
+    kinds = _column_kinds(spec.columns)
+    headers = [f"{kind}_{i}" for i, kind in enumerate(kinds)]
+    factories = [_cell_factory(kind, rng) for kind in kinds]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(headers)
+        batch = []
+        for i in range(spec.rows):
+            batch.append(
+                [
+                    "" if rng.random() < EMPTY_RATE else factory(i)
+                    for factory in factories
+                ]
+            )
+            if len(batch) == 10_000:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
+    return path
+
+
+def get_dataset(spec: DatasetSpec, data_dir: Path) -> Path:
+    """
+    Get the file of a dataset, generating it on first use.
+
+    Args:
+        spec: Dataset shape and seed
+        data_dir: Directory generated datasets are kept in
+
+    Returns:
+        Path of the dataset file
+    """
+    path = data_dir / spec.filename
+    if not path.exists():
+        tmp_path = path.with_suffix(".tmp")
+        generate_csv(spec, tmp_path)
+        tmp_path.replace(path)
+    return path
+
+
+NARROW_COLUMNS = 7
+WIDE_COLUMNS = 70
+
+# Named sets of datasets; "full" goes up to 10M rows and takes a long time.
+# Wide datasets stop at 1M rows (70M cells), as 10M wide rows is ~5 GB on disk.
+PROFILES = {
+    "smoke": [DatasetSpec("narrow", 1_000, NARROW_COLUMNS)],
+    "quick": [
+        DatasetSpec("narrow", 10_000, NARROW_COLUMNS),
+        DatasetSpec("wide", 10_000, WIDE_COLUMNS),
+        DatasetSpec("narrow", 100_000, NARROW_COLUMNS),
+    ],
+    "full": [
+        DatasetSpec("narrow", 10_000, NARROW_COLUMNS),
+        DatasetSpec("wide", 10_000, WIDE_COLUMNS),
+        DatasetSpec("narrow", 100_000, NARROW_COLUMNS),
+        DatasetSpec("wide", 100_000, WIDE_COLUMNS),
+        DatasetSpec("narrow", 1_000_000, NARROW_COLUMNS),
+        DatasetSpec("wide", 1_000_000, WIDE_COLUMNS),
+        DatasetSpec("narrow", 10_000_000, NARROW_COLUMNS),
+    ],
+}
@@ -0,0 +1,358 @@
+"""
+Local OpenAI-compatible stand-in server for load tests.
+
+Serves chat completions (streaming and non-streaming) and embeddings with
+deterministic outputs, configurable latency and injected rate-limit errors.
+Point the backend at it with ``OPENAI_BASE_URL=http://localhost:9000/v1``.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.fake_openai --port 9000 \\
+        --first-token-latency lognormal:0.4,0.5 --token-latency fixed:0.01 \\
+        --error-rate 0.02 --rpm 3000
+
+Latency specs are ``fixed:S``, ``uniform:LOW,HIGH``, ``normal:MEAN,STD`` or
+``lognormal:MEDIAN,SIGMA``, all in seconds.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "the data shows revenue grew in the north region while costs held steady "
+    "across most months with a peak in march and a dip in august overall "
+    "average order value rose slightly and returns were concentrated in two "
+    "product lines"
+).split()
+
+
+@dataclass
+class LatencyDistribution:
+    """Distribution of a delay in seconds."""
+
+    kind: str = "fixed"
+    params: tuple = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """
+        Parse a latency spec such as ``lognormal:0.4,0.5``.
+
+        Args:
+            spec: Distribution name and comma-separated parameters
+
+        Returns:
+            Parsed distribution
+        """
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(p) for p in raw.split(",")) if raw else (0.0,)
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a delay, never negative."""
+        if self.kind == "fixed":
+            value = self.params[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(*self.params)
+        elif self.kind == "normal":
+            value = rng.gauss(*self.params)
+        else:
+            median, sigma = self.params
+            value = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0
+        return max(value, 0.0)
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """Behaviour of the stand-in server."""
+
+    first_token_latency: LatencyDistribution = field(
+        default_factory=LatencyDistribution
+    )
+    token_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    embedding_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    completion_tokens: int = 60
+    embedding_dimensions: int = 1536
+    error_rate: float = 0.0
+    requests_per_minute: Optional[int] = None
+    seed: int = 0
+
+
+class _RateLimiter:
+    """Token bucket refilled at a requests-per-minute rate."""
+
+    def __init__(self, requests_per_minute: int):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(requests_per_minute / 60.0, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> Optional[float]:
+        """Take a token, or return the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return None
+            return (1 - self.tokens) / self.rate
+
+
+def _digest(value: Any) -> bytes:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).digest()
+
+
+def fake_completion(messages: List[Dict[str, Any]], max_tokens: int) -> List[str]:
+    """
+    Build the deterministic answer to a conversation.
+
+    Args:
+        messages: Chat messages of the request
+        max_tokens: Completion limit of the request
+
+    Returns:
+        Answer as a list of word tokens (each with its leading space)
+    """
+    rng = random.Random(_digest(messages))
+    count = min(max_tokens, rng.randint(max_tokens // 2 or 1, max_tokens))
+    return [(" " if i else "") + rng.choice(WORDS) for i in range(count)]
+
+
+def fake_embedding(text: str, dimensions: int) -> List[float]:
+    """
+    Build a deterministic unit-length embedding of a text.
+
+    Args:
+        text: Text to embed
+        dimensions: Vector length
+
+    Returns:
+        Embedding vector
+    """
+    values: List[float] = []
+    counter = 0
+    while len(values) < dimensions:
+        block = hashlib.sha256(f"{counter}:{text}".encode()).digest()
+        values.extend(v / 2**31 for v in struct.unpack("<8i", block))
+        counter += 1
+    values = values[:dimensions]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+def _count_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+def create_fake_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    """
+    Create the stand-in server.
+
+    Args:
+        config: Server behaviour (defaults: no latency, no errors)
+
+    Returns:
+        FastAPI application serving ``/v1``
+    """
+    config = config or FakeOpenAIConfig()
+    app = FastAPI(title="Fake OpenAI")
+    rng = random.Random(config.seed)
+    limiter = (
+        _RateLimiter(config.requests_per_minute) if config.requests_per_minute else None
+    )
+    stats = {"chat": 0, "stream": 0, "embeddings": 0, "rate_limited": 0}
+    app.state.stats = stats
+
+    def rate_limited() -> Optional[JSONResponse]:
+        retry_after = limiter.try_acquire() if limiter else None
+        if retry_after is None and rng.random() < config.error_rate:
+            retry_after = 1.0
+        if retry_after is None:
+            return None
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": f"{retry_after:.3f}"},
+            content={
+                "error": {
+                    "message": "Rate limit reached (fake server)",
+                    "type": "requests",
+                    "param": None,
+                    "code": "rate_limit_exceeded",
+                }
+            },
+        )
+
+    @app.get("/v1/models")
+    async def list_models() -> Dict[str, Any]:
+        return {
+            "object": "list",
+            "data": [
+                {"id": model, "object": "model", "created": 0, "owned_by": "fake"}
+                for model in ("gpt-4o-mini", "gpt-4o", "text-embedding-3-small")
+            ],
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        error = rate_limited()
+        if error is not None:
+            return error
+
+        messages = body.get("messages", [])
+        model = body.get("model", "gpt-4o-mini")
+        max_tokens = body.get("max_tokens") or config.completion_tokens
+        tokens = fake_completion(messages, min(max_tokens, config.completion_tokens))
+        prompt_tokens = sum(_count_tokens(str(m.get("content", ""))) for m in messages)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        completion_id = f"chatcmpl-fake-{_digest(messages).hex()[:12]}"
+        created = int(time.time())
+
+        await asyncio.sleep(config.first_token_latency.sample(rng))
+
+        if not body.get("stream"):
+            stats["chat"] += 1
+            await asyncio.sleep(
+                sum(config.token_latency.sample(rng) for _ in tokens[1:])
+            )
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+
+        stats["stream"] += 1
+        include_usage = (body.get("stream_options") or {}).get("include_usage")
+
+        def chunk(delta: Dict[str, Any], finish_reason=None, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": (
+                    [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                    if delta is not None
+                    else []
+                ),
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events() -> AsyncIterator[str]:
+            yield chunk({"role": "assistant", "content": ""})
+            for i, token in enumerate(tokens):
+                if i:
+                    await asyncio.sleep(config.token_latency.sample(rng))
+                yield chunk({"content": token})
+            yield chunk({}, finish_reason="stop")
+            if include_usage:
+                yield chunk(None, usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        error = rate_limited()
+        if error is not None:
+            return error
+
+        inputs = body.get("input", [])
+        texts = [inputs] if isinstance(inputs, str) else [str(t) for t in inputs]
+        dimensions = body.get("dimensions") or config.embedding_dimensions
+        stats["embeddings"] += 1
+        await asyncio.sleep(config.embedding_latency.sample(rng))
+
+        prompt_tokens = sum(_count_tokens(text) for text in texts)
+        return {
+            "object": "list",
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": i,
+                    "embedding": fake_embedding(text, dimensions),
+                }
+                for i, text in enumerate(texts)
+            ],
+            "model": body.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+        }
+
+    @app.get("/stats")
+    async def get_stats() -> Dict[str, int]:
+        return dict(stats)
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the stand-in server from the command line."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--first-token-latency", default="fixed:0")
+    parser.add_argument("--token-latency", default="fixed:0")
+    parser.add_argument("--embedding-latency", default="fixed:0")
+    parser.add_argument("--completion-tokens", type=int, default=60)
+    parser.add_argument("--embedding-dimensions", type=int, default=1536)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of calls given 429"
+    )
+    parser.add_argument(
+        "--rpm", type=int, default=None, help="Requests per minute before 429"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = FakeOpenAIConfig(
+        first_token_latency=LatencyDistribution.parse(args.first_token_latency),
+        token_latency=LatencyDistribution.parse(args.token_latency),
+        embedding_latency=LatencyDistribution.parse(args.embedding_latency),
+        completion_tokens=args.completion_tokens,
+        embedding_dimensions=args.embedding_dimensions,
+        error_rate=args.error_rate,
+        requests_per_minute=args.rpm,
+        seed=args.seed,
+    )
+    uvicorn.run(create_fake_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
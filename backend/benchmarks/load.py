@@ -0,0 +1,239 @@
+"""
+Load generator reporting throughput and latency percentiles per concurrency.
+
+Run the backend against the fake OpenAI server, then drive it:
+
+    python -m benchmarks.fake_openai --port 9000 --first-token-latency lognormal:0.3,0.4
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:9000/v1 python run.py
+    python -m benchmarks.load --url http://127.0.0.1:8000 --target ask upload \\
+        --concurrency 1 4 16 64 --requests 200 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.datasets import DatasetSpec, get_dataset
+from benchmarks.run import DEFAULT_DATA_DIR
+
+QUESTIONS = [
+    "What is the total revenue?",
+    "Which region has the most orders?",
+    "Explain why sales dipped in August",
+    "What is the average order value?",
+    "Compare revenue between north and south",
+    "How many rows are missing a date?",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+
+    Args:
+        values: Observed values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or 0.0 for no values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+async def run_level(
+    send: Callable[[httpx.AsyncClient, int], Any],
+    client: httpx.AsyncClient,
+    concurrency: int,
+    requests: int,
+) -> Dict[str, Any]:
+    """
+    Send a number of requests with a fixed number in flight.
+
+    Args:
+        send: Coroutine function sending request ``i``; returns the response
+        client: HTTP client
+        concurrency: Requests kept in flight
+        requests: Total requests to send
+
+    Returns:
+        Throughput, latency percentiles and status counts of the level
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            start_time = time.perf_counter()
+            try:
+                response = await send(client, index)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start_time)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+        "p50_seconds": round(percentile(latencies, 50), 4),
+        "p95_seconds": round(percentile(latencies, 95), 4),
+        "p99_seconds": round(percentile(latencies, 99), 4),
+        "max_seconds": round(max(latencies, default=0.0), 4),
+        "statuses": statuses,
+    }
+
+
+def ask_sender(file_id: Optional[str], unique: bool):
+    """Build a sender posting questions to ``/ask/``."""
+
+    async def send(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        question = QUESTIONS[index % len(QUESTIONS)]
+        if unique:
+            # Defeat the answer cache and in-flight deduplication
+            question = f"{question} (request {index})"
+        return await client.post(
+            "/ask/", json={"question": question, "file_id": file_id}
+        )
+
+    return send
+
+
+def upload_sender(content: bytes, uploaded: List[str]):
+    """Build a sender posting a CSV to ``/upload/``."""
+
+    async def send(client: httpx.AsyncClient, index: int) -> httpx.Response:
+        response = await client.post(
+            "/upload/", files={"file": (f"load-{index}.csv", content, "text/csv")}
+        )
+        if response.status_code == 200:
+            uploaded.append(response.json()["file_id"])
+        return response
+
+    return send
+
+
+async def run_load(
+    url: str,
+    targets: List[str],
+    concurrency_levels: List[int],
+    requests: int,
+    rows: int = 10_000,
+    unique_questions: bool = True,
+    timeout: float = 120.0,
+) -> Dict[str, Any]:
+    """
+    Load-test the backend at increasing concurrency.
+
+    Args:
+        url: Base URL of the backend
+        targets: Endpoints to test (``ask``, ``upload``)
+        concurrency_levels: Requests in flight for each level
+        requests: Requests sent per level
+        rows: Rows of the CSV used for uploads and questions
+        unique_questions: Make every question distinct
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Results per target and level
+    """
+    dataset = get_dataset(DatasetSpec("narrow", rows, 7), DEFAULT_DATA_DIR)
+    content = dataset.read_bytes()
+    results: Dict[str, Any] = {"url": url, "rows": rows, "targets": {}}
+
+    limits = httpx.Limits(max_connections=max(concurrency_levels))
+    async with httpx.AsyncClient(
+        base_url=url, timeout=timeout, limits=limits
+    ) as client:
+        file_id = None
+        if "ask" in targets:
+            response = await client.post(
+                "/upload/", files={"file": (dataset.name, content, "text/csv")}
+            )
+            response.raise_for_status()
+            file_id = response.json()["file_id"]
+
+        for target in targets:
+            levels = []
+            for concurrency in concurrency_levels:
+                uploaded: List[str] = []
+                send = (
+                    ask_sender(file_id, unique_questions)
+                    if target == "ask"
+                    else upload_sender(content, uploaded)
+                )
+                level = await run_level(send, client, concurrency, requests)
+                levels.append(level)
+                print(
+                    f"{target:<7} c={concurrency:<4} {level['throughput_rps']:>8} rps  "
+                    f"p50 {level['p50_seconds']:.3f}s  p95 {level['p95_seconds']:.3f}s  "
+                    f"p99 {level['p99_seconds']:.3f}s  {level['statuses']}",
+                    file=sys.stderr,
+                )
+                for uploaded_id in uploaded:
+                    await client.delete(f"/upload/files/{uploaded_id}")
+            results["targets"][target] = levels
+
+        if file_id:
+            await client.delete(f"/upload/files/{file_id}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the load generator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--target", nargs="+", choices=["ask", "upload"], default=["ask"]
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument(
+        "--repeat-questions",
+        action="store_true",
+        help="Reuse a few questions, so the cache and deduplication apply",
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        run_load(
+            args.url,
+            args.target,
+            args.concurrency,
+            args.requests,
+            args.rows,
+            unique_questions=not args.repeat_questions,
+        )
+    )
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
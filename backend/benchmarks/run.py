@@ -0,0 +1,489 @@
+"""
+Benchmark runner for the ingest hot paths.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.run --profile quick
+    python -m benchmarks.run --profile quick --save-baseline
+    python -m benchmarks.run --profile full --output results.json
+
+Results are written as JSON and compared against the stored baseline; the
+exit status is 1 when any benchmark regressed beyond the threshold.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.datasets import PROFILES, DatasetSpec, get_dataset
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCHMARK_DIR.parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_DATA_DIR = BENCHMARK_DIR / ".data"
+
+# Differences below this many seconds are treated as noise
+NOISE_FLOOR_SECONDS = 0.005
+
+
+def _isolate_settings(work_dir: Path) -> None:
+    """Point storage at a scratch directory and disable network calls."""
+    from src.core.config import settings
+
+    settings.upload_dir = str(work_dir / "uploads")
+    settings.chroma_db_path = str(work_dir / "chroma")
+    settings.database_url = f"sqlite:///{work_dir / 'sessions.db'}"
+    settings.profiling_dir = str(work_dir / "profiles")
+    # Uploads are measured without embedding calls, so results are local
+    settings.openai_api_key = None
+    settings.log_level = "WARNING"
+    logging.getLogger("data_ghost").setLevel(logging.WARNING)
+
+
+def _time(fn: Callable[[], Any], repeats: int) -> List[float]:
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+
+def _result(
+    name: str,
+    spec: DatasetSpec,
+    timings: List[float],
+    items: int,
+    unit: str = "rows",
+) -> Dict[str, Any]:
+    median = statistics.median(timings)
+    return {
+        "name": name,
+        "dataset": spec.filename,
+        "rows": spec.rows,
+        "columns": spec.columns,
+        "repeats": len(timings),
+        "seconds_min": round(min(timings), 6),
+        "seconds_median": round(median, 6),
+        f"{unit}_per_second": round(items / median, 1) if median else None,
+    }
+
+
+def run_csv_benchmarks(
+    spec: DatasetSpec, path: Path, repeats: int
+) -> List[Dict[str, Any]]:
+    """Benchmark CSVService parsing, analysis, type inference and chunking."""
+    from src.services.csv_service import CSVService
+
+    service = CSVService()
+    results = []
+
+    csv_data: Dict[str, Any] = {}
+    timings = _time(lambda: csv_data.update(service.parse_csv(str(path))), repeats)
+    results.append(_result("parse_csv", spec, timings, spec.rows))
+
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    headers, data_rows = rows[0], rows[1:]
+    del rows
+
+    timings = _time(lambda: service._analyze_columns(headers, data_rows), repeats)
+    results.append(_result("analyze_columns", spec, timings, spec.rows))
+
+    columns = [
+        [row[i] if i < len(row) else "" for row in data_rows]
+        for i in range(len(headers))
+    ]
+    del data_rows
+    timings = _time(
+        lambda: [service._infer_data_type(column) for column in columns], repeats
+    )
+    results.append(
+        _result("infer_data_type", spec, timings, len(columns), unit="columns")
+    )
+    del columns
+
+    timings = _time(lambda: service.extract_text_for_embedding(csv_data), repeats)
+    results.append(_result("extract_text_for_embedding", spec, timings, 1, "calls"))
+    return results
+
+
+def run_storage_benchmarks(
+    spec: DatasetSpec, path: Path, repeats: int, lookups: int = 1000
+) -> List[Dict[str, Any]]:
+    """Benchmark FileStorage save, lookup, listing and delete."""
+    from src.storage import FileStorage
+
+    storage = FileStorage()
+    content = path.read_bytes()
+    results = []
+
+    saved: List[str] = []
+    timings = _time(
+        lambda: saved.append(storage.save_uploaded_file(content, path.name)["file_id"]),
+        repeats,
+    )
+    results.append(_result("file_storage.save", spec, timings, len(content), "bytes"))
+
+    timings = _time(
+        lambda: [storage.get_file_path(saved[i % len(saved)]) for i in range(lookups)],
+        repeats,
+    )
+    results.append(
+        _result("file_storage.get_file_path", spec, timings, lookups, "lookups")
+    )
+
+    timings = _time(lambda: storage.list_files(limit=50), repeats)
+    results.append(_result("file_storage.list_files", spec, timings, 1, "calls"))
+
+    timings = _time(lambda: storage.get_storage_info(), repeats)
+    results.append(_result("file_storage.get_storage_info", spec, timings, 1, "calls"))
+
+    timings = _time(lambda: storage.delete_file(saved.pop()), len(saved))
+    results.append(_result("file_storage.delete", spec, timings, 1, "calls"))
+    return results
+
+
+def run_preview_benchmarks(
+    spec: DatasetSpec, path: Path, repeats: int, page_size: int = 100
+) -> List[Dict[str, Any]]:
+    """Benchmark building the row-offset index and reading first and last pages."""
+    from src.storage import RowIndex
+
+    index_path = str(DEFAULT_DATA_DIR / f"{spec.filename}.rows.bin")
+    timings = _time(lambda: RowIndex.build(str(path), index_path), repeats)
+    results = [_result("row_index.build", spec, timings, spec.rows)]
+
+    index = RowIndex(index_path)
+    for name, offset in (
+        ("row_index.first_page", 0),
+        ("row_index.last_page", max(index.row_count - page_size, 0)),
+    ):
+        timings = _time(lambda: index.read_rows(str(path), offset, page_size), repeats)
+        results.append(_result(name, spec, timings, page_size))
+    Path(index_path).unlink(missing_ok=True)
+    return results
+
+
+def run_response_benchmarks(
+    spec: DatasetSpec, path: Path, repeats: int, page_size: int = 1000
+) -> List[Dict[str, Any]]:
+    """Benchmark encoding a row page with its column stats, and compressing it."""
+    from fastapi.encoders import jsonable_encoder
+
+    from src.core.config import settings
+    from src.services.csv_service import CSVService
+    from src.storage import RowIndex
+    from src.utils.serialization import dumps
+
+    index_path = str(DEFAULT_DATA_DIR / f"{spec.filename}.rows.bin")
+    index = RowIndex.build(str(path), index_path)
+    csv_data = CSVService().parse_csv(str(path))
+    payload = {
+        "column_stats": csv_data["column_stats"],
+        "rows": index.read_rows(str(path), 0, page_size),
+    }
+    Path(index_path).unlink(missing_ok=True)
+    del csv_data
+
+    # What FastAPI does for an endpoint returning a dict
+    timings = _time(
+        lambda: json.dumps(jsonable_encoder(payload), separators=(",", ":")), repeats
+    )
+    results = [_result("response.jsonable_encoder", spec, timings, 1, "calls")]
+    timings = _time(lambda: dumps(payload), repeats)
+    results.append(_result("response.fast_json", spec, timings, 1, "calls"))
+
+    body = dumps(payload)
+    compressed = b""
+
+    def gzip_body() -> None:
+        nonlocal compressed
+        gzip = zlib.compressobj(
+            settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+        compressed = gzip.compress(body) + gzip.flush()
+
+    timings = _time(gzip_body, repeats)
+    result = _result("response.gzip", spec, timings, len(body), "bytes")
+    result["compression_ratio"] = round(len(body) / len(compressed), 2)
+    results.append(result)
+    return results
+
+
+def run_upload_benchmark(
+    spec: DatasetSpec, path: Path, repeats: int
+) -> List[Dict[str, Any]]:
+    """Benchmark POST /upload/ end to end, without embedding calls."""
+    from fastapi.testclient import TestClient
+
+    from src.main import app
+
+    content = path.read_bytes()
+    file_ids: List[str] = []
+
+    with TestClient(app) as client:
+
+        def upload() -> None:
+            response = client.post(
+                "/upload/", files={"file": (path.name, content, "text/csv")}
+            )
+            response.raise_for_status()
+            file_ids.append(response.json()["file_id"])
+
+        timings = _time(upload, repeats)
+        for file_id in file_ids:
+            client.delete(f"/upload/files/{file_id}")
+
+    result = _result("upload_endpoint", spec, timings, spec.rows)
+    result["megabytes_per_second"] = round(
+        len(content) / (1024 * 1024) / result["seconds_median"], 2
+    )
+    return [result]
+
+
+# Times ``import src.main`` and then the warm-up in a fresh interpreter
+_IMPORT_SCRIPT = """
+import json, sys, time
+start_time = time.perf_counter()
+import src.main
+imported = time.perf_counter() - start_time
+from src.utils.warmup import LAZY_MODULES, warm_up
+eager = [name for name in LAZY_MODULES if name in sys.modules]
+start_time = time.perf_counter()
+warm_up()
+print(json.dumps({"import": imported, "warmup": time.perf_counter() - start_time,
+                  "eager": eager}))
+"""
+
+
+def run_import_benchmarks(work_dir: Path, repeats: int) -> List[Dict[str, Any]]:
+    """
+    Benchmark cold application import and the background warm-up.
+
+    Each run starts a new interpreter, so module caches do not carry over.
+
+    Args:
+        work_dir: Scratch directory for storage created by the warm-up
+        repeats: Interpreters started
+
+    Returns:
+        Results for ``import_app`` and ``warmup``
+    """
+    env = {
+        **os.environ,
+        "UPLOAD_DIR": str(work_dir / "uploads"),
+        "CHROMA_DB_PATH": str(work_dir / "chroma"),
+        "DATABASE_URL": f"sqlite:///{work_dir / 'sessions.db'}",
+        "PROFILING_DIR": str(work_dir / "profiles"),
+        "OPENAI_API_KEY": "",
+        "LOG_LEVEL": "WARNING",
+    }
+    runs = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SCRIPT],
+            capture_output=True,
+            text=True,
+            cwd=BACKEND_DIR,
+            env=env,
+            check=True,
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    results = []
+    for name, key in (("import_app", "import"), ("warmup", "warmup")):
+        timings = [run[key] for run in runs]
+        results.append(
+            {
+                "name": name,
+                "dataset": "-",
+                "repeats": len(timings),
+                "seconds_min": round(min(timings), 6),
+                "seconds_median": round(statistics.median(timings), 6),
+            }
+        )
+    # Heavy modules imported at startup defeat the lazy loading
+    results[0]["eager_modules"] = runs[0]["eager"]
+    return results
+
+
+def _metadata(profile: str) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=BENCHMARK_DIR,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "profile": profile,
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(
+    profile: str = "quick",
+    data_dir: Path = DEFAULT_DATA_DIR,
+    repeats: Optional[int] = None,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run every benchmark on every dataset of a profile.
+
+    Args:
+        profile: Dataset profile name from ``PROFILES``
+        data_dir: Directory generated datasets are cached in
+        repeats: Timed runs per benchmark (default 3, 1 from a million rows)
+        only: Benchmark groups to run (``csv``, ``storage``, ``preview``,
+            ``responses``, ``upload``, ``imports``)
+
+    Returns:
+        Dictionary with run metadata and one result per benchmark and dataset
+    """
+    groups = {
+        "csv": run_csv_benchmarks,
+        "storage": run_storage_benchmarks,
+        "preview": run_preview_benchmarks,
+        "responses": run_response_benchmarks,
+        "upload": run_upload_benchmark,
+    }
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="data-ghost-bench-") as work_dir:
+        _isolate_settings(Path(work_dir))
+        if not only or "imports" in only:
+            print("  imports...", file=sys.stderr)
+            results.extend(run_import_benchmarks(Path(work_dir), repeats or 3))
+        for spec in PROFILES[profile]:
+            path = get_dataset(spec, data_dir)
+            spec_repeats = repeats or (1 if spec.rows >= 1_000_000 else 3)
+            for group, run in groups.items():
+                if only and group not in only:
+                    continue
+                print(f"  {group} on {spec.filename}...", file=sys.stderr)
+                results.extend(run(spec, path, spec_repeats))
+    return {"metadata": _metadata(profile), "results": results}
+
+
+def compare_results(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25
+) -> List[Dict[str, Any]]:
+    """
+    Compare results against a baseline run.
+
+    A benchmark regressed when its median time grew by more than
+    ``threshold`` (a fraction) and by more than the noise floor.
+
+    Args:
+        results: Output of ``run_benchmarks``
+        baseline: Earlier output of ``run_benchmarks``
+        threshold: Allowed relative slowdown
+
+    Returns:
+        One comparison per benchmark present in both runs
+    """
+    base = {(r["name"], r["dataset"]): r for r in baseline.get("results", [])}
+    comparisons = []
+    for result in results["results"]:
+        previous = base.get((result["name"], result["dataset"]))
+        if previous is None:
+            continue
+        before = previous["seconds_median"]
+        after = result["seconds_median"]
+        change = (after - before) / before if before else 0.0
+        comparisons.append(
+            {
+                "name": result["name"],
+                "dataset": result["dataset"],
+                "baseline_seconds": before,
+                "seconds": after,
+                "change": round(change, 4),
+                "regressed": change > threshold
+                and after - before > NOISE_FLOOR_SECONDS,
+            }
+        )
+    return comparisons
+
+
+def _print_report(results: Dict[str, Any], comparisons: List[Dict[str, Any]]):
+    by_key = {(c["name"], c["dataset"]): c for c in comparisons}
+    print(f"{'benchmark':<32} {'dataset':<34} {'median s':>10} {'change':>9}")
+    for result in results["results"]:
+        comparison = by_key.get((result["name"], result["dataset"]))
+        change = f"{comparison['change']:+.1%}" if comparison else "-"
+        flag = "  REGRESSION" if comparison and comparison["regressed"] else ""
+        print(
+            f"{result['name']:<32} {result['dataset']:<34} "
+            f"{result['seconds_median']:>10.4f} {change:>9}{flag}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--repeats", type=int, default=None)
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=["csv", "storage", "preview", "responses", "upload", "imports"],
+        default=None,
+    )
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.profile, args.data_dir, args.repeats, args.only)
+
+    comparisons: List[Dict[str, Any]] = []
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        comparisons = compare_results(results, baseline, args.threshold)
+        results["comparison"] = {
+            "baseline": str(args.baseline),
+            "threshold": args.threshold,
+            "benchmarks": comparisons,
+        }
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    _print_report(results, comparisons)
+
+    regressions = [c for c in comparisons if c["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,7 +17,39 @@ class Settings(BaseSettings):
 
     # OpenAI Configuration
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
+    openai_base_url: Optional[str] = Field(
+        default=None, env="OPENAI_BASE_URL"
+    )  # e.g. a local stand-in server for load tests
     openai_model: str = Field(default="gpt-4o-mini", env="OPENAI_MODEL")
+    openai_timeout_seconds: float = Field(default=20.0, env="OPENAI_TIMEOUT_SECONDS")
+    openai_max_retries: int = Field(default=2, env="OPENAI_MAX_RETRIES")
+    openai_retry_budget_ratio: float = Field(
+        default=0.1, env="OPENAI_RETRY_BUDGET_RATIO"
+    )  # retries and hedges allowed per call
+    openai_hedging_enabled: bool = Field(default=False, env="OPENAI_HEDGING_ENABLED")
+    openai_hedge_percentile: float = Field(default=95.0, env="OPENAI_HEDGE_PERCENTILE")
+    openai_hedge_min_delay_seconds: float = Field(
+        default=1.0, env="OPENAI_HEDGE_MIN_DELAY_SECONDS"
+    )
+
+    # Model Routing Configuration
+    model_routing_enabled: bool = Field(
+        default=False, env="MODEL_ROUTING_ENABLED"
+    )  # only applies when the simple model differs from the complex one
+    routing_simple_model: str = Field(default="gpt-4o-mini", env="ROUTING_SIMPLE_MODEL")
+    routing_complex_model: Optional[str] = Field(
+        default=None, env="ROUTING_COMPLEX_MODEL"
+    )  # defaults to OPENAI_MODEL
+    routing_simple_max_tokens: int = Field(default=300, env="ROUTING_SIMPLE_MAX_TOKENS")
+    routing_complex_max_tokens: int = Field(
+        default=1000, env="ROUTING_COMPLEX_MAX_TOKENS"
+    )
+    routing_max_simple_question_words: int = Field(
+        default=30, env="ROUTING_MAX_SIMPLE_QUESTION_WORDS"
+    )
+    routing_max_simple_prompt_tokens: int = Field(
+        default=2000, env="ROUTING_MAX_SIMPLE_PROMPT_TOKENS"
+    )
 
     # ElevenLabs Configuration
     elevenlabs_api_key: Optional[str] = Field(default=None, env="ELEVENLABS_API_KEY")
@@ -28,6 +60,61 @@ class Settings(BaseSettings):
     # ChromaDB Configuration
     chroma_db_path: str = Field(default="./chroma_db", env="CHROMA_DB_PATH")
 
+    # Vector Quantization Configuration
+    vector_quantization: str = Field(
+        default="none", env="VECTOR_QUANTIZATION"
+    )  # none, int8 or pq
+    vector_rerank_factor: int = Field(default=4, env="VECTOR_RERANK_FACTOR")
+    vector_quantization_train_size: int = Field(
+        default=1024, env="VECTOR_QUANTIZATION_TRAIN_SIZE"
+    )
+    pq_subvectors: int = Field(default=96, env="PQ_SUBVECTORS")
+    compaction_interval_seconds: int = Field(
+        default=3600, env="COMPACTION_INTERVAL_SECONDS"
+    )  # 0 disables background compaction
+
+    # Prompt Assembly Configuration
+    prompt_token_budget: int = Field(default=3000, env="PROMPT_TOKEN_BUDGET")
+    retrieval_top_k: int = Field(default=8, env="RETRIEVAL_TOP_K")
+
+    # Batch Query Configuration
+    batch_max_questions: int = Field(default=50, env="BATCH_MAX_QUESTIONS")
+    batch_max_concurrency: int = Field(default=5, env="BATCH_MAX_CONCURRENCY")
+
+    # Admission Control Configuration
+    admission_chat_max_concurrency: int = Field(
+        default=8, env="ADMISSION_CHAT_MAX_CONCURRENCY"
+    )
+    admission_embedding_max_concurrency: int = Field(
+        default=4, env="ADMISSION_EMBEDDING_MAX_CONCURRENCY"
+    )
+    admission_max_queue: int = Field(default=100, env="ADMISSION_MAX_QUEUE")
+    request_timeout_seconds: float = Field(
+        default=30.0, env="REQUEST_TIMEOUT_SECONDS"
+    )  # deadline for interactive /ask requests
+
+    # Session History Configuration
+    session_cache_size: int = Field(default=1000, env="SESSION_CACHE_SIZE")
+    session_max_turns: int = Field(default=20, env="SESSION_MAX_TURNS")
+    session_history_token_budget: int = Field(
+        default=1000, env="SESSION_HISTORY_TOKEN_BUDGET"
+    )
+
+    # Answer Cache Configuration
+    answer_cache_enabled: bool = Field(default=True, env="ANSWER_CACHE_ENABLED")
+    answer_cache_max_entries: int = Field(default=1000, env="ANSWER_CACHE_MAX_ENTRIES")
+    answer_cache_ttl_seconds: int = Field(default=3600, env="ANSWER_CACHE_TTL_SECONDS")
+    answer_cache_similarity_threshold: float = Field(
+        default=0.92, env="ANSWER_CACHE_SIMILARITY_THRESHOLD"
+    )
+
+    # Column Statistics Configuration
+    column_stats_cache_max_entries: int = Field(
+        default=1024, env="COLUMN_STATS_CACHE_MAX_ENTRIES"
+    )
+    column_stats_bins: int = Field(default=20, env="COLUMN_STATS_BINS")
+    column_stats_top_k: int = Field(default=10, env="COLUMN_STATS_TOP_K")
+
     # File Storage Configuration
     upload_dir: str = Field(default="./uploads", env="UPLOAD_DIR")
     max_file_size: int = Field(default=10 * 1024 * 1024, env="MAX_FILE_SIZE")  # 10MB
@@ -35,6 +122,32 @@ class Settings(BaseSettings):
     # Logging Configuration
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
 
+    # Metrics Configuration
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
+
+    # Response Compression Configuration
+    compression_enabled: bool = Field(default=True, env="COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(
+        default=1024, env="COMPRESSION_MINIMUM_SIZE"
+    )  # bytes; smaller bodies are sent as they are
+    compression_gzip_level: int = Field(default=5, env="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, env="COMPRESSION_BROTLI_QUALITY")
+
+    # Health Probe Configuration
+    health_probe_interval_seconds: float = Field(
+        default=15.0, env="HEALTH_PROBE_INTERVAL_SECONDS"
+    )  # 0 disables background probing
+
+    # Startup Configuration
+    warmup_on_startup: bool = Field(default=True, env="WARMUP_ON_STARTUP")
+
+    # Profiling Configuration
+    profiling_enabled: bool = Field(default=True, env="PROFILING_ENABLED")
+    profiling_token: Optional[str] = Field(default=None, env="PROFILING_TOKEN")
+    profiling_sample_rate: float = Field(default=0.0, env="PROFILING_SAMPLE_RATE")
+    profiling_dir: str = Field(default="./profiles", env="PROFILING_DIR")
+    profiling_max_profiles: int = Field(default=50, env="PROFILING_MAX_PROFILES")
+
     # CORS Configuration
     cors_origins: list[str] = Field(
         default=[
@@ -1,12 +1,26 @@
 """Main FastAPI application entry point."""
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from src.core.config import settings
 from src.core.logging import get_logger, setup_logging
-from src.routers import upload_router, query_router, health_router
+from src.routers import (
+    upload_router,
+    query_router,
+    health_router,
+    metrics_router,
+    profiling_router,
+)
+from src.services.dataset_service import run_compaction_loop
+from src.services.health_monitor import run_health_probe_loop
+from src.utils.compression import CompressionMiddleware
+from src.utils.metrics import MetricsMiddleware
+from src.utils.profiling import ProfilingMiddleware
+from src.utils.warmup import run_warmup
 
 logger = get_logger(__name__)
 
@@ -20,10 +34,22 @@ async def lifespan(app: FastAPI):
     logger.info(f"ChromaDB Path: {settings.chroma_db_path}")
     logger.info(f"Upload Directory: {settings.upload_dir}")
 
+    background_tasks = []
+    if settings.warmup_on_startup:
+        # Heavy dependencies load on first use; preload them in the background
+        # so startup is not delayed and the first request does not wait either
+        background_tasks.append(asyncio.create_task(run_warmup()))
+    if settings.health_probe_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(run_health_probe_loop()))
+    if settings.compaction_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(run_compaction_loop()))
+
     yield
 
     # Shutdown
     logger.info("Shutting down Data Ghost Backend...")
+    for task in background_tasks:
+        task.cancel()
 
 
 def create_app() -> FastAPI:
@@ -51,10 +77,31 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Profile requests that ask for it with the debug header, or are sampled
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
+
+    # Compress large JSON and text responses the client can decode
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_quality=settings.compression_brotli_quality,
+        )
+
+    # Count and time requests per route
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
     # Include routers
     app.include_router(health_router)
     app.include_router(upload_router)
     app.include_router(query_router)
+    if settings.metrics_enabled:
+        app.include_router(metrics_router)
+    if settings.profiling_enabled:
+        app.include_router(profiling_router)
 
     # Root endpoint
     @app.get("/")
@@ -3,9 +3,13 @@
 from .upload import router as upload_router
 from .query import router as query_router
 from .health import router as health_router
+from .metrics import router as metrics_router
+from .profiling import router as profiling_router
 
 __all__ = [
     "upload_router",
     "query_router",
     "health_router",
+    "metrics_router",
+    "profiling_router",
 ]
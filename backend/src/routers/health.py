@@ -1,10 +1,16 @@
 """Health check router for API monitoring."""
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
 
 from src.core.config import settings
-from src.storage import ChromaClient, FileStorage
+from src.services.admission import get_admission_stats
+from src.services.health_monitor import get_health_monitor
+from src.services.hedging import get_completion_hedger
+from src.services.model_router import get_model_router
+from src.utils.cancellation import get_cancellation_stats
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -20,59 +26,65 @@ async def health_check() -> Dict[str, Any]:
     }
 
 
+@router.get("/live")
+async def liveness_check() -> Dict[str, str]:
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness_check() -> Dict[str, Any]:
+    """
+    Readiness probe from the cached component health.
+
+    Returns 503 until the first probe has found the vector store and file
+    storage healthy, and whenever the latest probe is failing or stale.
+    """
+    monitor = get_health_monitor()
+    if monitor.interval_seconds <= 0:
+        # Without background probing every check probes
+        await asyncio.to_thread(monitor.probe)
+    readiness = monitor.readiness()
+    if not readiness["ready"]:
+        raise HTTPException(status_code=503, detail=readiness)
+    return readiness
+
+
 @router.get("/detailed")
 async def detailed_health_check() -> Dict[str, Any]:
-    """Detailed health check with component status."""
+    """
+    Detailed health check with component status.
+
+    Component status comes from the background prober's latest snapshot,
+    with the time each check ran. A probe runs for the request only before
+    the first background probe, or when background probing is disabled.
+    """
+    monitor = get_health_monitor()
+    snapshot = monitor.snapshot()
+    if snapshot is None or monitor.interval_seconds <= 0:
+        await asyncio.to_thread(monitor.probe)
+        snapshot = monitor.snapshot()
+
     health_status = {
-        "status": "healthy",
+        "status": snapshot["status"],
         "service": settings.app_name,
         "version": settings.app_version,
         "environment": "development" if settings.debug else "production",
-        "components": {},
+        "checked_at": snapshot["checked_at"],
+        "age_seconds": snapshot["age_seconds"],
+        "components": snapshot["components"],
     }
 
-    # Check ChromaDB
-    try:
-        chroma_client = ChromaClient()
-        chroma_info = chroma_client.get_collection_info()
-        health_status["components"]["chromadb"] = {
-            "status": "healthy",
-            "collection_count": chroma_info["document_count"],
-        }
-    except Exception as e:
-        health_status["components"]["chromadb"] = {
-            "status": "unhealthy",
-            "error": str(e),
-        }
-        health_status["status"] = "degraded"
-
-    # Check file storage
-    try:
-        file_storage = FileStorage()
-        storage_info = file_storage.get_storage_info()
-        health_status["components"]["file_storage"] = {
-            "status": "healthy",
-            "total_files": storage_info["total_files"],
-            "total_size_mb": storage_info["total_size_mb"],
-        }
-    except Exception as e:
-        health_status["components"]["file_storage"] = {
-            "status": "unhealthy",
-            "error": str(e),
-        }
-        health_status["status"] = "degraded"
-
-    # Check OpenAI configuration
+    # In-process counters are cheap to read, so they are always current
     if settings.openai_api_key:
-        health_status["components"]["openai"] = {
-            "status": "configured",
-            "model": settings.openai_model,
-        }
-    else:
-        health_status["components"]["openai"] = {
-            "status": "not_configured",
-            "message": "OpenAI API key not set. AI features will be disabled.",
-        }
-        health_status["status"] = "degraded"
+        openai_status = health_status["components"]["openai"]
+        openai_status["calls"] = get_completion_hedger().get_stats()
+        openai_status["routing"] = get_model_router().get_stats()
+
+    # Report admission queues in front of the OpenAI API
+    health_status["components"]["admission"] = get_admission_stats()
+
+    # Report work abandoned because clients disconnected
+    health_status["components"]["cancellation"] = get_cancellation_stats()
 
     return health_status
@@ -0,0 +1,186 @@
+"""Metrics router exposing Prometheus metrics."""
+
+from typing import Any, Dict, List, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.services.admission import get_admission_stats
+from src.services.answer_cache import get_answer_cache
+from src.services.column_stats import get_column_stats_cache
+from src.services.singleflight import get_singleflight
+from src.utils.cancellation import get_cancellation_stats
+from src.utils.metrics import Samples, registry
+from src.utils.tokenizer import get_tokenizer_stats
+from src.utils.warmup import get_warmup_status
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _family(
+    name: str, kind: str, help: str, samples: Samples
+) -> Tuple[str, str, str, Samples]:
+    return (f"data_ghost_{name}", kind, help, samples)
+
+
+def _per_key(stats: Dict[str, Dict[str, Any]], label: str, field: str) -> Samples:
+    return [({label: key}, values[field]) for key, values in stats.items()]
+
+
+def collect_component_metrics() -> List[Tuple[str, str, str, Samples]]:
+    """
+    Read queue, cache and cancellation statistics of running components.
+
+    These are kept by the components themselves and only read at scrape
+    time, so they add nothing to request hot paths.
+
+    Returns:
+        Metric families as (name, type, help, samples)
+    """
+    admission = get_admission_stats()
+    answer_cache = get_answer_cache().get_stats()
+    column_stats = get_column_stats_cache().get_stats()
+    singleflight = get_singleflight().get_stats()
+    tokenizers = get_tokenizer_stats()
+    cancellation = get_cancellation_stats()
+    warmup = get_warmup_status()
+
+    return [
+        _family(
+            "admission_active",
+            "gauge",
+            "Calls holding an admission slot",
+            _per_key(admission, "pool", "active"),
+        ),
+        _family(
+            "admission_queue_depth",
+            "gauge",
+            "Calls waiting for an admission slot",
+            _per_key(admission, "pool", "queue_depth"),
+        ),
+        _family(
+            "admission_admitted_total",
+            "counter",
+            "Calls admitted",
+            _per_key(admission, "pool", "admitted"),
+        ),
+        _family(
+            "admission_rejected_total",
+            "counter",
+            "Calls rejected because the queue was full",
+            _per_key(admission, "pool", "rejected"),
+        ),
+        _family(
+            "admission_shed_total",
+            "counter",
+            "Calls shed because they would miss their deadline",
+            _per_key(admission, "pool", "shed"),
+        ),
+        _family(
+            "admission_wait_seconds_avg",
+            "gauge",
+            "Average seconds admitted calls waited for a slot",
+            _per_key(admission, "pool", "avg_wait_seconds"),
+        ),
+        _family(
+            "admission_wait_seconds_max",
+            "gauge",
+            "Longest seconds an admitted call waited for a slot",
+            _per_key(admission, "pool", "max_wait_seconds"),
+        ),
+        _family(
+            "answer_cache_lookups_total",
+            "counter",
+            "Answer cache lookups by result",
+            [
+                ({"result": "exact_hit"}, answer_cache["exact_hits"]),
+                ({"result": "semantic_hit"}, answer_cache["semantic_hits"]),
+                ({"result": "miss"}, answer_cache["misses"]),
+            ],
+        ),
+        _family(
+            "answer_cache_hit_ratio",
+            "gauge",
+            "Fraction of answer cache lookups that hit",
+            [({}, answer_cache["hit_rate"])],
+        ),
+        _family(
+            "answer_cache_entries",
+            "gauge",
+            "Answers held in the cache",
+            [({}, answer_cache["size"])],
+        ),
+        _family(
+            "column_stats_lookups_total",
+            "counter",
+            "Column statistics cache lookups by result",
+            [
+                ({"result": "hit"}, column_stats["hits"]),
+                ({"result": "miss"}, column_stats["misses"]),
+            ],
+        ),
+        _family(
+            "column_stats_computed_total",
+            "counter",
+            "Columns whose statistics were computed",
+            [({}, column_stats["computed"])],
+        ),
+        _family(
+            "singleflight_calls_total",
+            "counter",
+            "Model calls started for deduplicated questions",
+            [({}, singleflight["calls"])],
+        ),
+        _family(
+            "singleflight_shared_total",
+            "counter",
+            "Callers that shared an in-flight call",
+            [({}, singleflight["shared"])],
+        ),
+        _family(
+            "tokenizer_cache_hits_total",
+            "counter",
+            "Memoized token count hits",
+            _per_key(tokenizers, "model", "hits"),
+        ),
+        _family(
+            "tokenizer_cache_misses_total",
+            "counter",
+            "Memoized token count misses",
+            _per_key(tokenizers, "model", "misses"),
+        ),
+        _family(
+            "cancelled_requests_total",
+            "counter",
+            "Requests cancelled because the client disconnected",
+            _per_key(cancellation, "endpoint", "cancelled"),
+        ),
+        _family(
+            "cancelled_wasted_tokens_total",
+            "counter",
+            "Tokens spent on cancelled requests",
+            _per_key(cancellation, "endpoint", "wasted_tokens"),
+        ),
+        _family(
+            "cancelled_wasted_cpu_seconds_total",
+            "counter",
+            "CPU seconds spent on cancelled requests",
+            _per_key(cancellation, "endpoint", "wasted_cpu_seconds"),
+        ),
+        _family(
+            "warmup_step_seconds",
+            "gauge",
+            "Seconds spent on each startup warm-up step",
+            [({"step": step}, seconds) for step, seconds in warmup["steps"].items()],
+        ),
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Expose metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        registry.render(collect_component_metrics()), media_type=CONTENT_TYPE
+    )
@@ -0,0 +1,49 @@
+"""Router for downloading request profiles."""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from src.utils.profiling import get_profile_file, is_authorized, list_profiles
+
+router = APIRouter(prefix="/debug/profiles", tags=["debug"])
+
+
+def _check_authorized(token: Optional[str]) -> None:
+    # Hide the endpoints entirely from callers without the profiling token
+    if not is_authorized(token):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/")
+async def get_profiles(
+    x_debug_profile: Optional[str] = Header(None),
+) -> Dict[str, Any]:
+    """List stored request profiles, newest first."""
+    _check_authorized(x_debug_profile)
+    return {"profiles": list_profiles()}
+
+
+@router.get("/{profile_id}")
+async def download_profile(
+    profile_id: str, x_debug_profile: Optional[str] = Header(None)
+) -> FileResponse:
+    """Download a profile in pstats format (``python -m pstats`` or snakeviz)."""
+    _check_authorized(x_debug_profile)
+    path = get_profile_file(profile_id, ".prof")
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+
+@router.get("/{profile_id}/summary", response_class=PlainTextResponse)
+async def get_profile_summary(
+    profile_id: str, x_debug_profile: Optional[str] = Header(None)
+) -> PlainTextResponse:
+    """Get the functions of a profile with the most cumulative time."""
+    _check_authorized(x_debug_profile)
+    path = get_profile_file(profile_id, ".txt")
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(path.read_text())
@@ -1,25 +1,44 @@
 """Query router for handling AI-powered questions about CSV data."""
 
+import json
 import time
-from fastapi import APIRouter, HTTPException
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 from src.core.logging import get_logger
-from src.schemas.requests import AskQueryRequest
-from src.schemas.responses import AskQueryResponse
+from src.core.config import settings
+from src.schemas.requests import AskQueryRequest, BatchAskQueryRequest
+from src.schemas.responses import (
+    AskQueryResponse,
+    BatchAnswer,
+    BatchAskQueryResponse,
+)
 from src.services import QueryService
+from src.services.admission import OverloadedError, Priority, request_context
+from src.services.answer_cache import get_answer_cache
+from src.services.singleflight import get_singleflight
+from src.storage.session_store import get_session_store
+from src.utils.cancellation import ClientDisconnected, run_until_disconnected
+from src.utils.serialization import NDJSON_MEDIA_TYPE, dumps, json_lines
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/ask", tags=["query"])
 
 
 @router.post("/", response_model=AskQueryResponse)
-async def ask_question(request: AskQueryRequest) -> AskQueryResponse:
+async def ask_question(
+    request: AskQueryRequest, http_request: Request
+) -> AskQueryResponse:
     """
     Ask a question about uploaded CSV data.
 
+    The query is cancelled, aborting any in-flight OpenAI call, if the client
+    disconnects before the answer is ready.
+
     Args:
         request: Query request containing question and context
+        http_request: Incoming HTTP request, watched for disconnects
 
     Returns:
         AI-generated answer with confidence and sources
@@ -31,10 +50,16 @@ async def ask_question(request: AskQueryRequest) -> AskQueryResponse:
         query_service = QueryService()
 
         # Process the query
-        answer = await query_service.process_query(
-            question=request.question,
-            context_data=request.context,
-        )
+        with request_context(Priority.INTERACTIVE, settings.request_timeout_seconds):
+            answer = await run_until_disconnected(
+                http_request,
+                query_service.process_query(
+                    question=request.question,
+                    context_data=request.context,
+                    file_id=request.file_id,
+                    session_id=request.session_id,
+                ),
+            )
 
         processing_time = time.time() - start_time
 
@@ -48,6 +73,14 @@ async def ask_question(request: AskQueryRequest) -> AskQueryResponse:
             processing_time=processing_time,
         )
 
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(round(e.retry_after))},
+        )
     except Exception as e:
         logger.error(f"Error processing query: {e}")
         raise HTTPException(
@@ -55,12 +88,189 @@ async def ask_question(request: AskQueryRequest) -> AskQueryResponse:
         )
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _json_line_event(event: str, data: Dict[str, Any]) -> bytes:
+    """Format an event as a JSON line with its name under ``event``."""
+    return dumps({"event": event, **data}) + b"\n"
+
+
+@router.post("/stream")
+async def ask_question_stream(
+    request: AskQueryRequest, http_request: Request
+) -> StreamingResponse:
+    """
+    Ask a question and stream the answer as Server-Sent Events.
+
+    Emits a ``delta`` event for each chunk of the answer as soon as the model
+    produces it, then a final ``done`` event with timing and token usage. An
+    ``error`` event is sent instead if generation fails part-way. Clients
+    accepting ``application/x-ndjson`` get the same events as JSON lines.
+
+    Args:
+        request: Query request containing question and context
+        http_request: Incoming HTTP request, checked for the accepted format
+
+    Returns:
+        Streaming response with ``text/event-stream`` or JSON lines content
+    """
+    start_time = time.time()
+    query_service = QueryService()
+    as_json_lines = NDJSON_MEDIA_TYPE in http_request.headers.get("accept", "")
+    format_event = _json_line_event if as_json_lines else _sse_event
+
+    async def event_stream() -> AsyncIterator[Union[str, bytes]]:
+        try:
+            with request_context(
+                Priority.INTERACTIVE, settings.request_timeout_seconds
+            ):
+                async for event in query_service.stream_query(
+                    question=request.question,
+                    context_data=request.context,
+                    file_id=request.file_id,
+                    session_id=request.session_id,
+                ):
+                    if event["type"] == "delta":
+                        yield format_event("delta", {"content": event["content"]})
+                    else:
+                        processing_time = time.time() - start_time
+                        logger.info(
+                            f"Streamed query: '{request.question}' "
+                            f"in {processing_time:.2f}s"
+                        )
+                        yield format_event(
+                            "done",
+                            {
+                                "session_id": request.session_id,
+                                "processing_time": processing_time,
+                                "time_to_first_token": event["time_to_first_token"],
+                                "model": event["model"],
+                                "cached": event["cached"],
+                                "usage": event["usage"],
+                            },
+                        )
+        except OverloadedError as e:
+            yield format_event(
+                "error", {"detail": str(e), "retry_after": round(e.retry_after)}
+            )
+        except Exception as e:
+            logger.error(f"Error streaming query: {e}")
+            yield format_event(
+                "error", {"detail": f"Query processing failed: {str(e)}"}
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type=NDJSON_MEDIA_TYPE if as_json_lines else "text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/batch", response_model=BatchAskQueryResponse)
+async def ask_questions_batch(request: BatchAskQueryRequest):
+    """
+    Ask several questions about the same dataset in one request.
+
+    The dataset context is built once for the whole batch and the questions
+    are answered concurrently. With ``stream`` set, each result is sent as a
+    JSON line as soon as it completes, and a failure part-way ends the stream
+    with an ``error`` event line; otherwise all results are returned together
+    in request order.
+
+    Args:
+        request: Batch query request containing questions and context
+
+    Returns:
+        Answers for every question, or a JSON lines stream of them
+    """
+    if len(request.questions) > settings.batch_max_questions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many questions. Maximum is {settings.batch_max_questions}",
+        )
+
+    start_time = time.time()
+    try:
+        query_service = QueryService()
+        results = query_service.process_batch(
+            questions=request.questions,
+            context_data=request.context,
+            file_id=request.file_id,
+            max_concurrency=request.max_concurrency,
+        )
+
+        if request.stream:
+
+            async def result_items() -> AsyncIterator[Any]:
+                # Headers are already sent, so failures end the stream with
+                # an error line
+                try:
+                    with request_context(Priority.BATCH):
+                        async for result in results:
+                            yield BatchAnswer(**result)
+                except OverloadedError as e:
+                    yield {
+                        "event": "error",
+                        "detail": str(e),
+                        "retry_after": round(e.retry_after),
+                    }
+                except Exception as e:
+                    logger.error(f"Error streaming batch query: {e}")
+                    yield {
+                        "event": "error",
+                        "detail": f"Batch query processing failed: {str(e)}",
+                    }
+
+            return StreamingResponse(
+                json_lines(result_items()), media_type=NDJSON_MEDIA_TYPE
+            )
+
+        with request_context(Priority.BATCH):
+            answers = [BatchAnswer(**result) async for result in results]
+        answers.sort(key=lambda answer: answer.index)
+        processing_time = time.time() - start_time
+
+        logger.info(
+            f"Processed batch of {len(answers)} queries in {processing_time:.2f}s"
+        )
+
+        return BatchAskQueryResponse(results=answers, processing_time=processing_time)
+
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(round(e.retry_after))},
+        )
+    except Exception as e:
+        logger.error(f"Error processing batch query: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Batch query processing failed: {str(e)}"
+        )
+
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    """Get answer cache hit-rate and in-flight deduplication statistics."""
+    return {
+        **get_answer_cache().get_stats(),
+        "singleflight": get_singleflight().get_stats(),
+    }
+
+
 @router.get("/sessions/{session_id}/history")
 async def get_session_history(session_id: str):
     """Get query history for a session."""
     try:
-        # For now, return empty history since we simplified the service
-        return {"session_id": session_id, "queries": []}
+        history = get_session_store().get_history(session_id)
+        return {
+            "session_id": session_id,
+            "summary": history["summary"],
+            "queries": history["turns"],
+        }
     except Exception as e:
         logger.error(f"Error getting session history: {e}")
         raise HTTPException(
@@ -72,7 +282,7 @@ async def get_session_history(session_id: str):
 async def clear_session(session_id: str):
     """Clear a session's history."""
     try:
-        # For now, just return success since we simplified the service
+        get_session_store().clear(session_id)
         return {"message": f"Session {session_id} cleared successfully"}
     except Exception as e:
         logger.error(f"Error clearing session: {e}")
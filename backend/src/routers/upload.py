@@ -1,21 +1,123 @@
 """Upload router for handling CSV file uploads."""
 
+import asyncio
 import os
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from typing import Optional
+import threading
+import time
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    UploadFile,
+    File,
+    HTTPException,
+    Form,
+    Query,
+    Request,
+)
+from typing import Any, Dict, List, Optional
 
 from src.core.logging import get_logger
 from src.schemas.responses import UploadResponse
 from src.storage import FileStorage
-from src.services import CSVService
+from src.services import CSVService, DatasetService
+from src.services.admission import Priority, request_context
+from src.utils.cancellation import (
+    ClientDisconnected,
+    OperationCancelled,
+    record_wasted,
+    run_until_disconnected,
+)
 from src.utils.file_utils import validate_csv_file, get_file_extension
+from src.utils.profiling import profile_thread
+from src.utils.serialization import FastJSONResponse
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/upload", tags=["upload"])
 
 
+async def _ingest(
+    dataset_service: DatasetService,
+    file_info: Dict[str, Any],
+    cancel_event: threading.Event,
+) -> Dict[str, Any]:
+    """
+    Parse, summarize and index a saved upload.
+
+    Besides the summary and vector index, a row-offset index is built so
+    rows can later be previewed a page at a time.
+
+    Parsing runs in a worker thread that stops when ``cancel_event`` is set;
+    CPU time spent before a cancellation is reported as wasted work. A
+    cancelled ingest waits for the thread to stop, so it writes no sidecars
+    after the caller deletes the dataset.
+
+    Args:
+        dataset_service: Dataset service to index with
+        file_info: File information returned by FileStorage
+        cancel_event: Event set when the client disconnects
+
+    Returns:
+        Data summary of the dataset
+    """
+    csv_service = CSVService()
+    parse_cpu_seconds = 0.0
+
+    def parse() -> Dict[str, Any]:
+        nonlocal parse_cpu_seconds
+        start_time = time.thread_time()
+        try:
+            csv_data = csv_service.parse_csv(file_info["file_path"], cancel_event)
+            dataset_service.build_row_index(
+                file_info["file_id"], file_info["file_path"], cancel_event
+            )
+        except OperationCancelled:
+            record_wasted("upload", cpu_seconds=time.thread_time() - start_time)
+            raise
+        parse_cpu_seconds = time.thread_time() - start_time
+        return csv_data
+
+    try:
+        # Parse and analyze CSV
+        parsing = asyncio.ensure_future(asyncio.to_thread(profile_thread(parse)))
+        try:
+            csv_data = await asyncio.shield(parsing)
+        except asyncio.CancelledError:
+            # The thread cannot be interrupted; wait until it sees cancel_event
+            try:
+                await parsing
+            except Exception:
+                pass
+            raise
+
+        # Generate data summary
+        data_summary = {
+            "total_rows": csv_data["total_rows"],
+            "total_columns": csv_data["total_columns"],
+            "headers": csv_data["headers"],
+            "column_stats": csv_data["column_stats"],
+            "summary": csv_service.generate_summary(csv_data),
+        }
+
+        # Persist the profile and index text chunks for retrieval
+        try:
+            with request_context(Priority.BACKGROUND):
+                await dataset_service.index_dataset(file_info, csv_data, data_summary)
+        except Exception as e:
+            logger.error(f"Error indexing dataset {file_info['file_id']}: {e}")
+
+        return data_summary
+
+    except asyncio.CancelledError:
+        # Parsing finished but indexing was cut short
+        if parse_cpu_seconds:
+            record_wasted("upload", cpu_seconds=parse_cpu_seconds)
+        raise
+
+
 @router.post("/", response_model=UploadResponse)
 async def upload_csv(
+    request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     description: Optional[str] = Form(None),
     tags: Optional[str] = Form(None),
@@ -23,7 +125,12 @@ async def upload_csv(
     """
     Upload a CSV file for analysis.
 
+    Parsing and indexing are cancelled, and the saved file removed, if the
+    client disconnects before they finish.
+
     Args:
+        request: Incoming HTTP request, watched for disconnects
+        background_tasks: Tasks run after the response is sent
         file: CSV file to upload
         description: Optional description of the file
         tags: Optional comma-separated tags
@@ -62,18 +169,21 @@ async def upload_csv(
             metadata=metadata,
         )
 
-        # Parse and analyze CSV
-        csv_service = CSVService()
-        csv_data = csv_service.parse_csv(file_info["file_path"])
+        # Parse, analyze and index, abandoning the work if the client leaves
+        dataset_service = DatasetService(file_storage=file_storage)
+        cancel_event = threading.Event()
+        try:
+            data_summary = await run_until_disconnected(
+                request,
+                _ingest(dataset_service, file_info, cancel_event),
+                cancel_event,
+            )
+        except ClientDisconnected:
+            dataset_service.delete_dataset(file_info["file_id"])
+            raise HTTPException(status_code=499, detail="Client closed request")
 
-        # Generate data summary
-        data_summary = {
-            "total_rows": csv_data["total_rows"],
-            "total_columns": csv_data["total_columns"],
-            "headers": csv_data["headers"],
-            "column_stats": csv_data["column_stats"],
-            "summary": csv_service.generate_summary(csv_data),
-        }
+        # Precompute standard insights once the response has been sent
+        background_tasks.add_task(dataset_service.build_insights, file_info["file_id"])
 
         logger.info(f"Successfully uploaded and processed CSV: {file.filename}")
 
@@ -93,24 +203,186 @@ async def upload_csv(
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+@router.post("/files/{file_id}/append", response_model=UploadResponse)
+async def append_csv(
+    file_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+) -> UploadResponse:
+    """
+    Append rows to an uploaded file.
+
+    The CSV must start with the same header row as the dataset. Only the new
+    rows are parsed, indexed and embedded; the insight pack is rebuilt once
+    the response has been sent.
+
+    Args:
+        file_id: File ID of the dataset
+        background_tasks: Tasks run after the response is sent
+        file: CSV file with the rows to append
+
+    Returns:
+        Upload response with the updated dataset summary
+    """
+    try:
+        if not file.filename:
+            raise HTTPException(status_code=400, detail="No filename provided")
+
+        file_extension = get_file_extension(file.filename)
+        if file_extension != "csv":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type. Expected CSV, got {file_extension.upper()}",
+            )
+
+        file_content = await file.read()
+        if not file_content:
+            raise HTTPException(status_code=400, detail="Empty file")
+
+        file_storage = FileStorage()
+        dataset_service = DatasetService(file_storage=file_storage)
+        data_summary = await dataset_service.append_rows(file_id, file_content)
+        if data_summary is None:
+            raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+
+        background_tasks.add_task(dataset_service.build_insights, file_id)
+
+        file_info = file_storage.get_file_info(file_id)
+        return UploadResponse(
+            success=True,
+            message=f"Appended {data_summary['appended_rows']} rows",
+            file_id=file_id,
+            file_name=file_info["original_filename"],
+            file_size=file_info["file_size"],
+            data_summary=data_summary,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error appending to file {file_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Append failed: {str(e)}")
+
+
 @router.get("/files")
-async def list_uploaded_files():
-    """List all uploaded files."""
+async def list_uploaded_files(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[int] = None,
+):
+    """List uploaded files, newest first, optionally one page at a time."""
     try:
         file_storage = FileStorage()
-        files = file_storage.list_files()
-        return {"files": files, "total_count": len(files)}
+        page = file_storage.list_files(limit=limit, cursor=cursor)
+        return FastJSONResponse(
+            {
+                "files": page["files"],
+                "total_count": file_storage.get_storage_info()["total_files"],
+                "next_cursor": page["next_cursor"],
+            }
+        )
     except Exception as e:
         logger.error(f"Error listing files: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to list files: {str(e)}")
 
 
+@router.get("/files/{file_id}/rows")
+async def preview_rows(
+    file_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    columns: Optional[List[str]] = Query(None),
+):
+    """
+    Preview a page of rows of an uploaded file.
+
+    Rows are read through the row-offset index built at upload, so any page
+    loads as fast as the first. Repeat ``columns`` to return only those
+    columns, in that order.
+    """
+    try:
+        page = await asyncio.to_thread(
+            profile_thread(DatasetService().preview_rows),
+            file_id,
+            offset,
+            limit,
+            columns,
+        )
+        if page is None:
+            raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+        return FastJSONResponse(page)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error previewing rows of file {file_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to preview rows: {str(e)}")
+
+
+@router.get("/files/{file_id}/columns/stats")
+async def get_column_stats(
+    file_id: str,
+    columns: Optional[List[str]] = Query(None),
+):
+    """
+    Get full statistics of columns of an uploaded file.
+
+    Repeat ``columns`` to choose the columns (all by default). Numeric
+    columns get min/max/mean/stddev, quartiles and a histogram; every column
+    gets top-k value frequencies. Statistics are computed on first request
+    and cached per dataset version.
+    """
+    try:
+        stats = await DatasetService().get_column_stats(file_id, columns)
+        if stats is None:
+            raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+        return FastJSONResponse(stats)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing column stats of file {file_id}: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to compute column stats: {str(e)}"
+        )
+
+
+@router.get("/files/{file_id}/insights")
+async def get_file_insights(file_id: str):
+    """Get the precomputed insight pack of an uploaded file."""
+    try:
+        profile = DatasetService().get_profile(file_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+
+        insights = profile.get("insights")
+        return FastJSONResponse(
+            {
+                "file_id": file_id,
+                "version": profile.get("version"),
+                "status": "ready" if insights else "pending",
+                "insights": insights,
+            }
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting insights for file {file_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get insights: {str(e)}")
+
+
 @router.delete("/files/{file_id}")
 async def delete_file(file_id: str):
-    """Delete an uploaded file."""
+    """Delete an uploaded file along with its vectors, profile and sidecars."""
     try:
-        file_storage = FileStorage()
-        success = file_storage.delete_file(file_id)
+        dataset_service = DatasetService()
+        success = dataset_service.delete_dataset(file_id)
 
         if success:
             return {"message": f"File {file_id} deleted successfully"}
@@ -1,12 +1,21 @@
 """Pydantic schemas for request/response models."""
 
-from .requests import AskQueryRequest, UploadRequest
-from .responses import AskQueryResponse, UploadResponse, ErrorResponse
+from .requests import AskQueryRequest, BatchAskQueryRequest, UploadRequest
+from .responses import (
+    AskQueryResponse,
+    BatchAnswer,
+    BatchAskQueryResponse,
+    UploadResponse,
+    ErrorResponse,
+)
 
 __all__ = [
     "AskQueryRequest",
+    "BatchAskQueryRequest",
     "UploadRequest",
     "AskQueryResponse",
+    "BatchAnswer",
+    "BatchAskQueryResponse",
     "UploadResponse",
     "ErrorResponse",
 ]
@@ -8,6 +8,9 @@ class AskQueryRequest(BaseModel):
     """Request schema for asking questions about CSV data."""
 
     question: str = Field(..., description="The question to ask about the data")
+    file_id: Optional[str] = Field(
+        None, description="Identifier of the uploaded dataset being asked about"
+    )
     context: Optional[Dict[str, Any]] = Field(
         None, description="Additional context data about the CSV"
     )
@@ -16,6 +19,28 @@ class AskQueryRequest(BaseModel):
     )
 
 
+class BatchAskQueryRequest(BaseModel):
+    """Request schema for asking several questions about one dataset."""
+
+    questions: list[str] = Field(
+        ..., min_length=1, description="The questions to ask about the data"
+    )
+    file_id: Optional[str] = Field(
+        None, description="Identifier of the uploaded dataset being asked about"
+    )
+    context: Optional[Dict[str, Any]] = Field(
+        None, description="Additional context data about the CSV"
+    )
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, description="Maximum number of questions answered at once"
+    )
+    stream: bool = Field(
+        False,
+        description="Stream results as JSON lines in completion order instead of "
+        "returning them all at once in request order",
+    )
+
+
 class UploadRequest(BaseModel):
     """Request schema for file upload metadata."""
 
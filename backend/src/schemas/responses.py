@@ -18,6 +18,29 @@ class AskQueryResponse(BaseModel):
     )
 
 
+class BatchAnswer(BaseModel):
+    """Answer to one question of a batch."""
+
+    index: int = Field(..., description="Position of the question in the request")
+    question: str = Field(..., description="The question asked")
+    answer: Optional[str] = Field(None, description="The answer, if successful")
+    error: Optional[str] = Field(None, description="Error message, if failed")
+    processing_time: Optional[float] = Field(
+        None, description="Time taken to answer this question"
+    )
+
+
+class BatchAskQueryResponse(BaseModel):
+    """Response schema for batch query answers."""
+
+    results: list[BatchAnswer] = Field(
+        ..., description="Answers in the same order as the questions"
+    )
+    processing_time: Optional[float] = Field(
+        None, description="Time taken to process the whole batch"
+    )
+
+
 class UploadResponse(BaseModel):
     """Response schema for file uploads."""
 
@@ -3,9 +3,13 @@
 from .csv_service import CSVService
 from .query_service import QueryService
 from .embedding_service import EmbeddingService
+from .dataset_service import DatasetService
+from .insight_service import InsightService
 
 __all__ = [
     "CSVService",
     "QueryService",
     "EmbeddingService",
+    "DatasetService",
+    "InsightService",
 ]
@@ -0,0 +1,278 @@
+"""Admission control and backpressure for calls to the OpenAI API."""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are admitted first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+    BACKGROUND = 2
+
+
+class OverloadedError(Exception):
+    """Raised when a call is rejected or shed instead of being queued."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# Priority and absolute deadline (time.monotonic()) of the current request
+_request_context: ContextVar[Tuple[Priority, Optional[float]]] = ContextVar(
+    "admission_request_context", default=(Priority.INTERACTIVE, None)
+)
+
+
+@contextmanager
+def request_context(
+    priority: Priority, timeout_seconds: Optional[float] = None
+) -> Iterator[None]:
+    """
+    Set the priority and deadline used by admission inside this block.
+
+    Tasks created inside the block inherit the context, so one deadline
+    covers every embedding and completion call made for a request.
+
+    Args:
+        priority: Admission priority of the request
+        timeout_seconds: Seconds from now until the request's deadline
+    """
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+    token = _request_context.set((priority, deadline))
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left until the current request's deadline, or None if unset."""
+    _, deadline = _request_context.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded priority queue and deadline shedding.
+
+    At most ``max_concurrency`` calls run at once. Further calls wait in a
+    priority queue; a call is shed with :class:`OverloadedError` when the
+    queue is full, when its estimated wait already exceeds its deadline, or
+    when its deadline passes while it is still queued. Shedding early keeps
+    hopeless requests from holding workers and lets clients retry elsewhere.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int = 100):
+        """
+        Initialize admission controller.
+
+        Args:
+            name: Name used in logs and statistics
+            max_concurrency: Maximum calls running at once
+            max_queue: Maximum calls waiting for a slot
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._service_time = 1.0  # EWMA of seconds a call holds its slot
+        self._stats = {
+            "admitted": 0,
+            "rejected": 0,
+            "shed": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def _estimated_wait(self, priority: int) -> float:
+        """Estimate the queueing delay of a new call with this priority."""
+        ahead = sum(1 for waiter in self._waiters if waiter[0] <= priority)
+        if self._active < self.max_concurrency and not ahead:
+            return 0.0
+        return (ahead + 1) / self.max_concurrency * self._service_time
+
+    def _reject(self, reason: str, priority: int) -> OverloadedError:
+        retry_after = max(self._estimated_wait(priority), 1.0)
+        logger.warning(f"Admission {self.name}: {reason}")
+        return OverloadedError(
+            f"Server is overloaded ({reason}). Please retry later.", retry_after
+        )
+
+    def _record_wait(self, waited: float) -> None:
+        self._stats["admitted"] += 1
+        self._stats["total_wait_seconds"] += waited
+        self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+
+    async def acquire(
+        self, priority: Optional[Priority] = None, deadline: Optional[float] = None
+    ) -> None:
+        """
+        Wait for a slot, or raise OverloadedError if it cannot be had in time.
+
+        Args:
+            priority: Admission priority (defaults to the request context)
+            deadline: Absolute ``time.monotonic()`` deadline (defaults to the
+                request context)
+        """
+        context_priority, context_deadline = _request_context.get()
+        priority = context_priority if priority is None else priority
+        deadline = context_deadline if deadline is None else deadline
+
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._record_wait(0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._stats["rejected"] += 1
+            raise self._reject("queue full", priority)
+
+        now = time.monotonic()
+        if deadline is not None and now + self._estimated_wait(priority) > deadline:
+            self._stats["shed"] += 1
+            raise self._reject("deadline cannot be met", priority)
+
+        waiter = (int(priority), next(self._sequence), asyncio.Future())
+        heapq.heappush(self._waiters, waiter)
+        try:
+            timeout = None if deadline is None else max(deadline - now, 0.0)
+            await asyncio.wait_for(asyncio.shield(waiter[2]), timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(waiter)
+            if waiter[2].done():
+                # Granted just as the deadline passed; give the slot back
+                self.release()
+            self._stats["shed"] += 1
+            raise self._reject("deadline passed while queued", priority)
+        except asyncio.CancelledError:
+            self._remove_waiter(waiter)
+            if waiter[2].done():
+                self.release()
+            raise
+        self._record_wait(time.monotonic() - now)
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot only if one is free right now, without queueing.
+
+        Returns:
+            True if a slot was taken and must be released
+        """
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._record_wait(0.0)
+            return True
+        return False
+
+    def _remove_waiter(self, waiter: Tuple[int, int, asyncio.Future]) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+
+    def release(self) -> None:
+        """Free a slot, handing it directly to the next queued call if any."""
+        if self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            future.set_result(None)
+        else:
+            self._active -= 1
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Optional[Priority] = None, deadline: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Args:
+            priority: Admission priority (defaults to the request context)
+            deadline: Absolute ``time.monotonic()`` deadline (defaults to the
+                request context)
+        """
+        await self.acquire(priority, deadline)
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self._service_time = 0.8 * self._service_time + 0.2 * (
+                time.monotonic() - start_time
+            )
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get admission statistics.
+
+        Returns:
+            Active calls, queue depth, wait times and shed/rejected counters
+        """
+        admitted = self._stats["admitted"]
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": admitted,
+            "rejected": self._stats["rejected"],
+            "shed": self._stats["shed"],
+            "avg_wait_seconds": (
+                round(self._stats["total_wait_seconds"] / admitted, 4)
+                if admitted
+                else 0.0
+            ),
+            "max_wait_seconds": round(self._stats["max_wait_seconds"], 4),
+            "avg_service_seconds": round(self._service_time, 4),
+        }
+
+
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(name: str) -> AdmissionController:
+    """
+    Get the process-wide admission controller for a kind of call.
+
+    Args:
+        name: ``"chat"`` or ``"embeddings"``
+
+    Returns:
+        Shared AdmissionController instance
+    """
+    with _controllers_lock:
+        if name not in _controllers:
+            max_concurrency = (
+                settings.admission_chat_max_concurrency
+                if name == "chat"
+                else settings.admission_embedding_max_concurrency
+            )
+            _controllers[name] = AdmissionController(
+                name, max_concurrency, settings.admission_max_queue
+            )
+        return _controllers[name]
+
+
+def get_admission_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics of every admission controller."""
+    return {
+        name: get_admission_controller(name).get_stats()
+        for name in ("chat", "embeddings")
+    }
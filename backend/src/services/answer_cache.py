@@ -0,0 +1,260 @@
+"""Semantic cache for answers to repeated questions about the same dataset."""
+
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase a question and collapse punctuation and whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", question.lower()).split())
+
+
+@dataclass
+class CacheEntry:
+    """A cached answer and the question embedding it was stored under."""
+
+    dataset_key: str
+    question: str
+    embedding: Optional[np.ndarray]
+    answer: str
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """
+    LRU answer cache with TTL, matched by question embedding similarity.
+
+    Entries are scoped to a dataset key (dataset ID plus version), so a new
+    version of a dataset never serves answers computed for an older one.
+    Normalized question text is checked first, which lets exact repeats hit
+    without embedding the question at all.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600,
+        similarity_threshold: float = 0.92,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl_seconds: Seconds before an entry expires
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._by_dataset: Dict[str, set[str]] = {}
+        self._stats = {
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def dataset_key(dataset_id: str, version: Optional[str]) -> str:
+        """Build the cache scope for a dataset version."""
+        return f"{dataset_id}@{version or 'unversioned'}"
+
+    def _remove(self, entry_id: str) -> None:
+        entry = self._entries.pop(entry_id)
+        bucket = self._by_dataset.get(entry.dataset_key)
+        if bucket is not None:
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._by_dataset[entry.dataset_key]
+
+    def _live_entries(self, dataset_key: str) -> List[str]:
+        """Entry IDs for a dataset, dropping any that have expired."""
+        now = time.time()
+        live = []
+        for entry_id in list(self._by_dataset.get(dataset_key, ())):
+            if now - self._entries[entry_id].created_at > self.ttl_seconds:
+                self._remove(entry_id)
+                self._stats["expirations"] += 1
+            else:
+                live.append(entry_id)
+        return live
+
+    def lookup_exact(self, dataset_key: str, question: str) -> Optional[str]:
+        """
+        Look up an answer by normalized question text.
+
+        Does not count a miss, since a semantic lookup normally follows.
+
+        Args:
+            dataset_key: Dataset scope from ``dataset_key()``
+            question: Question text
+
+        Returns:
+            Cached answer if found, None otherwise
+        """
+        normalized = normalize_question(question)
+        with self._lock:
+            for entry_id in self._live_entries(dataset_key):
+                if self._entries[entry_id].question == normalized:
+                    self._entries.move_to_end(entry_id)
+                    self._stats["exact_hits"] += 1
+                    return self._entries[entry_id].answer
+        return None
+
+    def lookup(
+        self, dataset_key: str, embedding: Optional[List[float]]
+    ) -> Optional[str]:
+        """
+        Look up the most similar cached question above the threshold.
+
+        Args:
+            dataset_key: Dataset scope from ``dataset_key()``
+            embedding: Question embedding, or None if unavailable
+
+        Returns:
+            Cached answer if found, None otherwise
+        """
+        with self._lock:
+            candidates = [
+                entry_id
+                for entry_id in self._live_entries(dataset_key)
+                if self._entries[entry_id].embedding is not None
+            ]
+            if embedding is None or not candidates:
+                self._stats["misses"] += 1
+                return None
+
+            query = np.asarray(embedding, dtype=np.float32)
+            query /= max(float(np.linalg.norm(query)), 1e-12)
+            matrix = np.stack([self._entries[i].embedding for i in candidates])
+            similarities = matrix @ query
+            best = int(similarities.argmax())
+            if similarities[best] < self.similarity_threshold:
+                self._stats["misses"] += 1
+                return None
+
+            entry_id = candidates[best]
+            self._entries.move_to_end(entry_id)
+            self._stats["semantic_hits"] += 1
+            return self._entries[entry_id].answer
+
+    def store(
+        self,
+        dataset_key: str,
+        question: str,
+        embedding: Optional[List[float]],
+        answer: str,
+    ) -> None:
+        """
+        Cache an answer, evicting the least recently used entries if full.
+
+        Args:
+            dataset_key: Dataset scope from ``dataset_key()``
+            question: Question text
+            embedding: Question embedding, or None if unavailable
+            answer: Answer to cache
+        """
+        vector = None
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            vector /= max(float(np.linalg.norm(vector)), 1e-12)
+
+        entry_id = str(uuid.uuid4())
+        with self._lock:
+            self._entries[entry_id] = CacheEntry(
+                dataset_key=dataset_key,
+                question=normalize_question(question),
+                embedding=vector,
+                answer=answer,
+                created_at=time.time(),
+            )
+            self._by_dataset.setdefault(dataset_key, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, dataset_id: str, keep_version: Optional[str] = None) -> int:
+        """
+        Drop cached answers for a dataset.
+
+        Args:
+            dataset_id: Dataset whose answers should be dropped
+            keep_version: Version to keep, e.g. the current one
+
+        Returns:
+            Number of entries removed
+        """
+        keep_key = self.dataset_key(dataset_id, keep_version) if keep_version else None
+        with self._lock:
+            stale_keys = [
+                key
+                for key in self._by_dataset
+                if key.startswith(f"{dataset_id}@") and key != keep_key
+            ]
+            removed = 0
+            for key in stale_keys:
+                for entry_id in list(self._by_dataset.get(key, ())):
+                    self._remove(entry_id)
+                    removed += 1
+            self._stats["invalidations"] += removed
+            return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Hit, miss and eviction counters plus the current size and hit rate
+        """
+        with self._lock:
+            hits = self._stats["exact_hits"] + self._stats["semantic_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hits": hits,
+                "lookups": lookups,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "datasets": len(self._by_dataset),
+            }
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    """
+    Get the process-wide answer cache.
+
+    Returns:
+        Shared SemanticAnswerCache instance
+    """
+    global _answer_cache
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            _answer_cache = SemanticAnswerCache(
+                max_entries=settings.answer_cache_max_entries,
+                ttl_seconds=settings.answer_cache_ttl_seconds,
+                similarity_threshold=settings.answer_cache_similarity_threshold,
+            )
+        return _answer_cache
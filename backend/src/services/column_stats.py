@@ -0,0 +1,315 @@
+"""Full column statistics computed on demand and cached per dataset version."""
+
+import asyncio
+import csv
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.singleflight import SingleFlight
+from src.utils.metrics import observe_stage
+
+logger = get_logger(__name__)
+
+# Share of non-empty cells that must parse as numbers for numeric stats
+NUMERIC_THRESHOLD = 0.8
+
+
+def _parse_number(cell: str) -> Optional[float]:
+    try:
+        return float(cell.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _numbers(cells: np.ndarray) -> np.ndarray:
+    """Parse non-empty cells as floats, dropping cells that are not numbers."""
+    try:
+        return cells.astype(np.float64)
+    except ValueError:
+        pass
+    # Mostly text, as in type inference: skip parsing every cell
+    sample = cells[:100]
+    parsed = sum(_parse_number(str(cell)) is not None for cell in sample)
+    if parsed < NUMERIC_THRESHOLD * len(sample):
+        return np.empty(0)
+    try:
+        return np.char.replace(cells, ",", "").astype(np.float64)
+    except ValueError:
+        # Mixed values; parse cell by cell
+        values = (_parse_number(str(cell)) for cell in cells)
+        return np.fromiter((v for v in values if v is not None), dtype=np.float64)
+
+
+def describe_column(
+    values: List[str], bins: int = 20, top_k: int = 10
+) -> Dict[str, Any]:
+    """
+    Compute full statistics of one column with vectorized numpy passes.
+
+    Args:
+        values: Raw cell values of the column
+        bins: Histogram bins for numeric columns
+        top_k: Most frequent values to report
+
+    Returns:
+        Counts, distinct values, top-k frequencies and string lengths, plus
+        min/max/mean/stddev, quartiles and a histogram for numeric columns
+    """
+    cells = np.char.strip(np.asarray(values, dtype=np.str_))
+    present = cells[cells != ""]
+
+    distinct, counts = np.unique(present, return_counts=True)
+    top = np.argsort(-counts, kind="stable")[:top_k]
+    lengths = np.char.str_len(present)
+
+    stats: Dict[str, Any] = {
+        "data_type": "text",
+        "count": len(cells),
+        "non_empty": len(present),
+        "empty": len(cells) - len(present),
+        "distinct": len(distinct),
+        "top_values": [
+            {"value": str(distinct[i]), "count": int(counts[i])} for i in top
+        ],
+        "length": {
+            "min": int(lengths.min()) if len(present) else None,
+            "max": int(lengths.max()) if len(present) else None,
+            "mean": round(float(lengths.mean()), 4) if len(present) else None,
+        },
+        "numeric": None,
+    }
+
+    numbers = _numbers(present) if len(present) else np.empty(0)
+    numbers = numbers[np.isfinite(numbers)]
+    if len(present) and len(numbers) >= NUMERIC_THRESHOLD * len(present):
+        quartiles = np.percentile(numbers, [25, 50, 75])
+        histogram, edges = np.histogram(numbers, bins=bins)
+        stats["data_type"] = "numeric"
+        stats["numeric"] = {
+            "count": len(numbers),
+            "min": float(numbers.min()),
+            "max": float(numbers.max()),
+            "mean": float(numbers.mean()),
+            "stddev": float(numbers.std()),
+            "p25": float(quartiles[0]),
+            "median": float(quartiles[1]),
+            "p75": float(quartiles[2]),
+            "histogram": {
+                "edges": [float(edge) for edge in edges],
+                "counts": [int(count) for count in histogram],
+            },
+        }
+    return stats
+
+
+def read_columns(file_path: str, columns: List[str]) -> Dict[str, List[str]]:
+    """
+    Read the values of some columns in one pass over a CSV file.
+
+    Args:
+        file_path: Path of the CSV file
+        columns: Column names to read
+
+    Returns:
+        Values per column, with short rows padded with empty strings
+    """
+    with open(file_path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        headers = next(reader, [])
+        positions = {column: headers.index(column) for column in columns}
+        values: Dict[str, List[str]] = {column: [] for column in columns}
+        for row in reader:
+            width = len(row)
+            for column, position in positions.items():
+                values[column].append(row[position] if position < width else "")
+    return values
+
+
+class ColumnStatsCache:
+    """
+    LRU cache of full column statistics keyed by dataset version and column.
+
+    Statistics of a column are computed on first request only. Concurrent
+    requests for the same column share one computation, and the columns
+    missing from a request are read in a single pass over the file.
+    """
+
+    def __init__(self, max_entries: int = 1024, bins: int = 20, top_k: int = 10):
+        """
+        Initialize column statistics cache.
+
+        Args:
+            max_entries: Maximum number of cached columns
+            bins: Histogram bins for numeric columns
+            top_k: Most frequent values reported per column
+        """
+        self.max_entries = max_entries
+        self.bins = bins
+        self.top_k = top_k
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._singleflight = SingleFlight()
+        self._hits = 0
+        self._misses = 0
+        self._computed = 0
+
+    def _get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            stats = self._entries.get(key)
+            if stats is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+            return stats
+
+    def _put(self, key: Tuple[str, str, str], stats: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = stats
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def compute(self, file_path: str, columns: List[str]) -> Dict[str, Any]:
+        """
+        Compute statistics of some columns, bypassing the cache.
+
+        Args:
+            file_path: Path of the CSV file
+            columns: Column names
+
+        Returns:
+            Statistics per column
+        """
+        start_time = time.perf_counter()
+        values = read_columns(file_path, columns)
+        stats = {
+            column: describe_column(values.pop(column), self.bins, self.top_k)
+            for column in columns
+        }
+        observe_stage("column_stats", time.perf_counter() - start_time)
+        with self._lock:
+            self._computed += len(columns)
+        return stats
+
+    async def get(
+        self, file_id: str, version: str, file_path: str, columns: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Get statistics of some columns, computing the ones not cached.
+
+        Args:
+            file_id: File ID of the dataset
+            version: Dataset version the statistics belong to
+            file_path: Path of the CSV file
+            columns: Column names (must exist in the file)
+
+        Returns:
+            Statistics per column, in the requested order
+        """
+        results: Dict[str, Any] = {}
+        missing: List[str] = []
+        for column in columns:
+            stats = self._get((file_id, version, column))
+            if stats is None:
+                missing.append(column)
+            else:
+                results[column] = stats
+
+        if missing:
+            owned: List[str] = []
+            batch: Optional[asyncio.Future] = None
+
+            def start(column: str):
+                # SingleFlight calls this only for columns no other request is
+                # computing. All calls are made before the first flight runs,
+                # so ``owned`` is complete when the batch is started.
+                owned.append(column)
+
+                async def call() -> Dict[str, Any]:
+                    nonlocal batch
+                    if batch is None:
+                        batch = asyncio.ensure_future(
+                            asyncio.to_thread(self.compute, file_path, list(owned))
+                        )
+                    stats = (await asyncio.shield(batch))[column]
+                    self._put((file_id, version, column), stats)
+                    return stats
+
+                return call()
+
+            computed = await asyncio.gather(
+                *(
+                    self._singleflight.do(
+                        f"{file_id}:{version}:{column}",
+                        lambda column=column: start(column),
+                    )
+                    for column in missing
+                )
+            )
+            results.update(zip(missing, computed))
+
+        return {column: results[column] for column in columns}
+
+    def invalidate(self, file_id: str) -> int:
+        """
+        Drop the cached statistics of a dataset.
+
+        Args:
+            file_id: File ID of the dataset
+
+        Returns:
+            Number of cached columns removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == file_id]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Hits, misses, columns computed, shared computations and size
+        """
+        shared = self._singleflight.get_stats()["shared"]
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "computed": self._computed,
+                "shared": shared,
+                "size": len(self._entries),
+            }
+
+
+_column_stats_cache: Optional[ColumnStatsCache] = None
+_column_stats_cache_lock = threading.Lock()
+
+
+def get_column_stats_cache() -> ColumnStatsCache:
+    """
+    Get the process-wide column statistics cache.
+
+    Returns:
+        Shared ColumnStatsCache instance
+    """
+    global _column_stats_cache
+    with _column_stats_cache_lock:
+        if _column_stats_cache is None:
+            _column_stats_cache = ColumnStatsCache(
+                max_entries=settings.column_stats_cache_max_entries,
+                bins=settings.column_stats_bins,
+                top_k=settings.column_stats_top_k,
+            )
+        return _column_stats_cache
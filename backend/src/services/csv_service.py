@@ -1,15 +1,25 @@
 """CSV processing and analysis service."""
 
 import csv
+import io
 import json
+import threading
+import time
+from itertools import islice
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 from src.core.logging import get_logger
+from src.storage.row_index import first_record_end
+from src.utils.cancellation import OperationCancelled
+from src.utils.metrics import observe_stage
 from src.utils.token_counter import count_tokens
 
 logger = get_logger(__name__)
 
+# Leading cells used for type inference and unique value samples
+SAMPLE_CELLS = 100
+
 
 class CSVService:
     """Service for processing and analyzing CSV files."""
@@ -18,20 +28,27 @@ class CSVService:
         """Initialize CSV service."""
         pass
 
-    def parse_csv(self, file_path: str) -> Dict[str, Any]:
+    def parse_csv(
+        self, file_path: str, cancel_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
         """
         Parse a CSV file and return structured data.
 
         Args:
             file_path: Path to the CSV file
+            cancel_event: Event that aborts parsing with OperationCancelled
 
         Returns:
             Dictionary containing parsed CSV data
         """
+        start_time = time.perf_counter()
         try:
             with open(file_path, "r", encoding="utf-8") as file:
                 reader = csv.reader(file)
-                rows = list(reader)
+                rows = []
+                while chunk := list(islice(reader, 10000)):
+                    rows.extend(chunk)
+                    self._check_cancelled(cancel_event)
 
                 if not rows:
                     raise ValueError("CSV file is empty")
@@ -44,7 +61,7 @@ class CSVService:
                 total_columns = len(headers)
 
                 # Column analysis
-                column_stats = self._analyze_columns(headers, data_rows)
+                column_stats = self._analyze_columns(headers, data_rows, cancel_event)
 
                 # Sample data
                 sample_data = data_rows[:5] if len(data_rows) > 5 else data_rows
@@ -58,15 +75,99 @@ class CSVService:
                     "file_path": file_path,
                 }
 
+                observe_stage("csv_parse", time.perf_counter() - start_time)
                 logger.info(f"Parsed CSV: {total_rows} rows, {total_columns} columns")
                 return result
 
+        except OperationCancelled:
+            logger.info(f"Cancelled parsing CSV file {file_path}")
+            raise
         except Exception as e:
             logger.error(f"Error parsing CSV file {file_path}: {e}")
             raise
 
+    def parse_append(self, content: bytes, headers: List[str]) -> Dict[str, Any]:
+        """
+        Parse rows to be appended to an existing dataset.
+
+        Args:
+            content: CSV bytes starting with the dataset's header row
+            headers: Header row of the existing dataset
+
+        Returns:
+            Dictionary with the data bytes after the header row (``body``),
+            the parsed ``rows`` and their ``column_stats``
+
+        Raises:
+            ValueError: If the header row differs from the dataset's
+        """
+        header_end = first_record_end(content)
+        header = next(csv.reader(io.StringIO(content[:header_end].decode("utf-8"))), [])
+        if header != headers:
+            raise ValueError(
+                f"Header row does not match the dataset columns: {', '.join(headers)}"
+            )
+
+        body = content[header_end:]
+        rows = list(csv.reader(io.StringIO(body.decode("utf-8"), newline="")))
+        return {
+            "body": body,
+            "rows": rows,
+            "column_stats": self._analyze_columns(headers, rows),
+        }
+
+    def merge_column_stats(
+        self,
+        existing: Dict[str, Any],
+        appended: Dict[str, Any],
+        leading_rows: Optional[List[List[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Merge column statistics of appended rows into a dataset's statistics.
+
+        Cell counts are added. Data types and unique value samples come from
+        the first cells of a column, so they only change while the dataset
+        has fewer rows than the sample; pass its first rows in that case.
+
+        Args:
+            existing: Column statistics of the dataset before the append
+            appended: Column statistics of the appended rows
+            leading_rows: First rows of the dataset after the append, if the
+                dataset had fewer rows than the type inference sample
+
+        Returns:
+            Column statistics of the whole dataset
+        """
+        headers = list(existing)
+        leading = (
+            self._analyze_columns(headers, leading_rows[:SAMPLE_CELLS])
+            if leading_rows is not None
+            else existing
+        )
+        merged = {}
+        for header in headers:
+            old, new = existing[header], appended.get(header, {})
+            merged[header] = {
+                "data_type": leading[header]["data_type"],
+                "total_cells": old["total_cells"] + new.get("total_cells", 0),
+                "non_empty_cells": old["non_empty_cells"]
+                + new.get("non_empty_cells", 0),
+                "empty_cells": old["empty_cells"] + new.get("empty_cells", 0),
+                "unique_values_count": leading[header]["unique_values_count"],
+                "sample_unique_values": leading[header]["sample_unique_values"],
+            }
+        return merged
+
+    def _check_cancelled(self, cancel_event: Optional[threading.Event]) -> None:
+        """Raise OperationCancelled if the cancel event is set."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise OperationCancelled("CSV parsing was cancelled")
+
     def _analyze_columns(
-        self, headers: List[str], data_rows: List[List[str]]
+        self,
+        headers: List[str],
+        data_rows: List[List[str]],
+        cancel_event: Optional[threading.Event] = None,
     ) -> Dict[str, Any]:
         """
         Analyze columns for data types and statistics.
@@ -74,13 +175,16 @@ class CSVService:
         Args:
             headers: Column headers
             data_rows: Data rows
+            cancel_event: Event that aborts analysis with OperationCancelled
 
         Returns:
             Column analysis dictionary
         """
+        start_time = time.perf_counter()
         column_stats = {}
 
         for i, header in enumerate(headers):
+            self._check_cancelled(cancel_event)
             column_data = [row[i] if i < len(row) else "" for row in data_rows]
 
             # Basic stats
@@ -92,7 +196,7 @@ class CSVService:
 
             # Unique values (limited to first 100 for performance)
             unique_values = list(
-                set(cell for cell in column_data[:100] if cell.strip())
+                set(cell for cell in column_data[:SAMPLE_CELLS] if cell.strip())
             )
             unique_count = len(unique_values)
 
@@ -105,6 +209,7 @@ class CSVService:
                 "sample_unique_values": unique_values[:10],  # First 10 unique values
             }
 
+        observe_stage("column_analysis", time.perf_counter() - start_time)
         return column_stats
 
     def _infer_data_type(self, column_data: List[str]) -> str:
@@ -221,3 +326,27 @@ class CSVService:
             chunks.append(row_text)
 
         return chunks
+
+    def extract_text_for_append(
+        self, headers: List[str], rows: List[List[str]], first_row_number: int
+    ) -> List[str]:
+        """
+        Extract text chunks describing rows appended to a dataset.
+
+        Args:
+            headers: Column headers
+            rows: Appended rows
+            first_row_number: 1-based number of the first appended row
+
+        Returns:
+            List of text chunks for embedding
+        """
+        last_row_number = first_row_number + len(rows) - 1
+        chunks = [
+            f"Rows {first_row_number:,} to {last_row_number:,} were appended to the "
+            f"dataset with columns: {', '.join(headers)}"
+        ]
+        for i, row in enumerate(rows[:10]):
+            row_text = f"Row {first_row_number + i}: {', '.join(str(c) for c in row)}"
+            chunks.append(row_text)
+        return chunks
@@ -0,0 +1,503 @@
+"""Dataset lifecycle service tying uploaded files to their derived artifacts."""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.answer_cache import get_answer_cache
+from src.services.column_stats import get_column_stats_cache
+from src.services.csv_service import SAMPLE_CELLS, CSVService
+from src.services.embedding_service import EmbeddingService
+from src.services.insight_service import InsightService
+from src.storage import ChromaClient, FileStorage, RowIndex, get_chroma_client
+from src.utils.metrics import observe_stage
+
+logger = get_logger(__name__)
+
+ROW_INDEX_FILENAME = "row_offsets.bin"
+
+# Position of the summary among a dataset's embedded chunks
+SUMMARY_CHUNK_INDEX = 1
+
+# Appends to the same dataset are applied one at a time; a dataset's lock is
+# dropped when it is deleted
+_append_locks: Dict[str, threading.Lock] = {}
+_append_locks_lock = threading.Lock()
+
+
+def _append_lock(file_id: str) -> threading.Lock:
+    with _append_locks_lock:
+        return _append_locks.setdefault(file_id, threading.Lock())
+
+
+class DatasetService:
+    """Service for indexing, deleting and compacting datasets."""
+
+    def __init__(
+        self,
+        file_storage: Optional[FileStorage] = None,
+        chroma_client: Optional[ChromaClient] = None,
+    ):
+        """
+        Initialize dataset service.
+
+        Args:
+            file_storage: File storage to use (created if not provided)
+            chroma_client: ChromaDB client to use (the shared client if not provided)
+        """
+        self.file_storage = file_storage or FileStorage()
+        self._chroma_client = chroma_client
+
+    @property
+    def chroma_client(self) -> ChromaClient:
+        """ChromaDB client, opened on first use."""
+        if self._chroma_client is None:
+            self._chroma_client = get_chroma_client()
+        return self._chroma_client
+
+    async def index_dataset(
+        self,
+        file_info: Dict[str, Any],
+        csv_data: Dict[str, Any],
+        data_summary: Dict[str, Any],
+    ) -> int:
+        """
+        Store the dataset profile and embed its text chunks.
+
+        Args:
+            file_info: File information returned by FileStorage
+            csv_data: Parsed CSV data
+            data_summary: Summary returned to the client
+
+        Returns:
+            Number of chunks added to the vector store
+        """
+        file_id = file_info["file_id"]
+        version = file_info["content_hash"][:16]
+        embedding_service = EmbeddingService()
+        chunks = (
+            CSVService().extract_text_for_embedding(csv_data)
+            if embedding_service.client
+            else []
+        )
+        self.file_storage.save_profile(
+            file_id,
+            {
+                "file_id": file_id,
+                "version": version,
+                **data_summary,
+                "chunk_count": len(chunks),
+            },
+        )
+        get_answer_cache().invalidate(file_id, keep_version=version)
+
+        if not chunks:
+            logger.info(f"Skipping vector indexing for {file_id}: no OpenAI key")
+            return 0
+
+        embeddings = await embedding_service.batch_create_embeddings(chunks)
+        self.chroma_client.add_documents(
+            documents=chunks,
+            metadatas=[
+                {"file_id": file_id, "chunk_index": i} for i in range(len(chunks))
+            ],
+            ids=[f"{file_id}:{i}" for i in range(len(chunks))],
+            embeddings=embeddings,
+        )
+        logger.info(f"Indexed {len(chunks)} chunks for dataset {file_id}")
+        return len(chunks)
+
+    def _apply_append(self, file_id: str, content: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Append rows to a dataset's file, row index and profile.
+
+        Only the appended bytes are parsed and scanned. Blocking; run it in
+        a worker thread.
+
+        Args:
+            file_id: File ID of the dataset
+            content: CSV bytes starting with the dataset's header row
+
+        Returns:
+            Updated profile, the appended rows and the first chunk index
+            free for them, or None if the dataset does not exist
+        """
+        with _append_lock(file_id):
+            profile = self.get_profile(file_id)
+            row_index = self.get_row_index(file_id)
+            if row_index is None:
+                return None
+            if profile is None:
+                raise ValueError(
+                    f"Dataset {file_id} has no profile to append to; upload it again"
+                )
+
+            csv_service = CSVService()
+            headers = profile["headers"]
+            appended = csv_service.parse_append(content, headers)
+            if not appended["rows"]:
+                raise ValueError("No rows to append")
+
+            previous_rows = profile["total_rows"]
+            file_info = self.file_storage.append_to_file(file_id, appended["body"])
+            start_time = time.perf_counter()
+            row_index.extend(file_info["file_path"], file_info["append_offset"])
+            observe_stage("row_index", time.perf_counter() - start_time)
+
+            # Type inference looks at the first rows, so it can only change
+            # while the dataset is smaller than its sample
+            leading_rows = (
+                row_index.read_rows(file_info["file_path"], 0, SAMPLE_CELLS)
+                if previous_rows < SAMPLE_CELLS
+                else None
+            )
+            csv_data = {
+                "headers": headers,
+                "total_rows": previous_rows + len(appended["rows"]),
+                "total_columns": len(headers),
+                "column_stats": csv_service.merge_column_stats(
+                    profile["column_stats"], appended["column_stats"], leading_rows
+                ),
+            }
+
+            # Profiles from before chunk counts were stored embedded the
+            # columns, the summary and up to five sample rows
+            chunk_count = profile.get("chunk_count", 2 + min(previous_rows, 5))
+            new_chunks = 0
+            if EmbeddingService().client:
+                new_chunks = min(len(appended["rows"]), 10) + 1
+            updated = {
+                **profile,
+                "version": file_info["content_hash"][:16],
+                "total_rows": csv_data["total_rows"],
+                "column_stats": csv_data["column_stats"],
+                "summary": csv_service.generate_summary(csv_data),
+                "chunk_count": chunk_count + new_chunks,
+                # Rebuilt from the whole file after the append
+                "insights": None,
+            }
+            self.file_storage.save_profile(file_id, updated)
+
+        return {
+            "profile": updated,
+            "rows": appended["rows"],
+            "first_row_number": previous_rows + 1,
+            "first_chunk_index": chunk_count,
+        }
+
+    async def append_rows(
+        self, file_id: str, content: bytes
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Append rows to an existing dataset.
+
+        Ingest cost scales with the appended rows: they are parsed on their
+        own, their column statistics are merged into the stored ones, the
+        row index is extended and only new chunks are embedded (the summary
+        chunk is replaced, as it states the row count). The insight pack is
+        left for ``build_insights``, which reads the whole file.
+
+        Args:
+            file_id: File ID of the dataset
+            content: CSV bytes starting with the dataset's header row
+
+        Returns:
+            Data summary of the whole dataset with the number of appended
+            rows, or None if the dataset does not exist
+
+        Raises:
+            ValueError: If the header row differs or there are no rows
+        """
+        result = await asyncio.to_thread(self._apply_append, file_id, content)
+        if result is None:
+            return None
+        profile = result["profile"]
+        version = profile["version"]
+        get_answer_cache().invalidate(file_id, keep_version=version)
+        get_column_stats_cache().invalidate(file_id)
+
+        embedding_service = EmbeddingService()
+        if embedding_service.client:
+            chunks = [profile["summary"]] + CSVService().extract_text_for_append(
+                profile["headers"], result["rows"], result["first_row_number"]
+            )
+            chunk_indexes = [SUMMARY_CHUNK_INDEX] + list(
+                range(
+                    result["first_chunk_index"],
+                    result["first_chunk_index"] + len(chunks) - 1,
+                )
+            )
+            try:
+                embeddings = await embedding_service.batch_create_embeddings(chunks)
+                self.chroma_client.delete([f"{file_id}:{SUMMARY_CHUNK_INDEX}"])
+                self.chroma_client.add_documents(
+                    documents=chunks,
+                    metadatas=[
+                        {"file_id": file_id, "chunk_index": i} for i in chunk_indexes
+                    ],
+                    ids=[f"{file_id}:{i}" for i in chunk_indexes],
+                    embeddings=embeddings,
+                )
+            except Exception as e:
+                logger.error(f"Error indexing rows appended to {file_id}: {e}")
+
+        logger.info(f"Appended {len(result['rows'])} rows to dataset {file_id}")
+        return {
+            "total_rows": profile["total_rows"],
+            "total_columns": profile["total_columns"],
+            "headers": profile["headers"],
+            "column_stats": profile["column_stats"],
+            "summary": profile["summary"],
+            "appended_rows": len(result["rows"]),
+            "version": version,
+        }
+
+    def build_row_index(
+        self,
+        file_id: str,
+        file_path: str,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> RowIndex:
+        """
+        Build the row-offset index of a dataset for paged previews.
+
+        Args:
+            file_id: File ID of the dataset
+            file_path: Path of the uploaded CSV file
+            cancel_event: Event that aborts the scan with OperationCancelled
+
+        Returns:
+            The built index
+        """
+        start_time = time.perf_counter()
+        index_path = self.file_storage.get_sidecar_dir(file_id, create=True)
+        row_index = RowIndex.build(
+            file_path, str(index_path / ROW_INDEX_FILENAME), cancel_event
+        )
+        observe_stage("row_index", time.perf_counter() - start_time)
+        return row_index
+
+    def get_row_index(self, file_id: str) -> Optional[RowIndex]:
+        """
+        Open the row-offset index of a dataset, building it if missing.
+
+        Files uploaded before row indexes existed are indexed on first use.
+
+        Args:
+            file_id: File ID of the dataset
+
+        Returns:
+            Row index, or None if the dataset does not exist
+        """
+        file_path = self.file_storage.get_file_path(file_id)
+        if not file_path:
+            return None
+        index_path = self.file_storage.get_sidecar_dir(file_id) / ROW_INDEX_FILENAME
+        if index_path.exists():
+            return RowIndex(str(index_path))
+        return self.build_row_index(file_id, file_path)
+
+    def preview_rows(
+        self,
+        file_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read a page of rows of a dataset, optionally keeping only some columns.
+
+        Args:
+            file_id: File ID of the dataset
+            offset: Index of the first data row
+            limit: Maximum rows to return
+            columns: Column names to return, in order (all if None)
+
+        Returns:
+            Page with headers, rows, total row count and the next offset, or
+            None if the dataset does not exist
+
+        Raises:
+            ValueError: If a requested column does not exist
+        """
+        row_index = self.get_row_index(file_id)
+        if row_index is None:
+            return None
+        file_path = self.file_storage.get_file_path(file_id)
+
+        headers = row_index.read_header(file_path)
+        rows = row_index.read_rows(file_path, offset, limit)
+        if columns:
+            missing = [column for column in columns if column not in headers]
+            if missing:
+                raise ValueError(f"Unknown columns: {', '.join(missing)}")
+            positions = [headers.index(column) for column in columns]
+            headers = list(columns)
+        else:
+            positions = list(range(len(headers)))
+        # Short rows are padded, as in column analysis
+        rows = [[row[i] if i < len(row) else "" for i in positions] for row in rows]
+
+        next_offset = offset + len(rows)
+        return {
+            "file_id": file_id,
+            "offset": offset,
+            "limit": limit,
+            "total_rows": row_index.row_count,
+            "headers": headers,
+            "rows": rows,
+            "next_offset": next_offset if next_offset < row_index.row_count else None,
+        }
+
+    async def get_column_stats(
+        self, file_id: str, columns: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get full statistics of some columns of a dataset.
+
+        Statistics are computed on first request and cached per dataset
+        version and column.
+
+        Args:
+            file_id: File ID of the dataset
+            columns: Column names (all columns if None)
+
+        Returns:
+            Dataset version and statistics per column, or None if the
+            dataset does not exist
+
+        Raises:
+            ValueError: If a requested column does not exist
+        """
+        file_info = self.file_storage.get_file_info(file_id)
+        row_index = await asyncio.to_thread(self.get_row_index, file_id)
+        if file_info is None or row_index is None:
+            return None
+
+        headers = await asyncio.to_thread(row_index.read_header, file_info["file_path"])
+        if columns:
+            missing = [column for column in columns if column not in headers]
+            if missing:
+                raise ValueError(f"Unknown columns: {', '.join(missing)}")
+        else:
+            columns = list(dict.fromkeys(headers))
+
+        version = file_info["content_hash"][:16]
+        stats = await get_column_stats_cache().get(
+            file_id, version, file_info["file_path"], list(dict.fromkeys(columns))
+        )
+        return {
+            "file_id": file_id,
+            "version": version,
+            "total_rows": row_index.row_count,
+            "columns": stats,
+        }
+
+    def build_insights(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Compute the insight pack of a dataset and store it with its profile.
+
+        Runs after the upload response has been sent, so the pack is ready
+        by the time the first questions arrive.
+
+        Args:
+            file_id: File ID of the dataset
+
+        Returns:
+            Insight pack, or None if the dataset no longer exists
+        """
+        profile = self.get_profile(file_id)
+        file_path = self.file_storage.get_file_path(file_id)
+        if not profile or not file_path:
+            logger.info(f"Skipping insights for {file_id}: dataset not found")
+            return None
+
+        try:
+            insights = InsightService().build_insight_pack(
+                file_path, profile.get("column_stats") or {}
+            )
+        except Exception as e:
+            logger.error(f"Error building insights for dataset {file_id}: {e}")
+            return None
+
+        self.file_storage.save_profile(file_id, {**profile, "insights": insights})
+        return insights
+
+    def get_profile(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored profile of a dataset.
+
+        Args:
+            file_id: File ID of the dataset
+
+        Returns:
+            Profile dictionary if one was saved, None otherwise
+        """
+        return self.file_storage.load_profile(file_id)
+
+    def get_dataset_version(self, file_id: str) -> Optional[str]:
+        """
+        Get the current version of a dataset.
+
+        Args:
+            file_id: File ID of the dataset
+
+        Returns:
+            Version string if the dataset has a profile, None otherwise
+        """
+        profile = self.get_profile(file_id)
+        return profile.get("version") if profile else None
+
+    def delete_dataset(self, file_id: str) -> bool:
+        """
+        Delete a dataset together with its vectors, profile and sidecars.
+
+        Vectors are removed first so a failure never leaves documents behind
+        for a file that no longer exists.
+
+        Args:
+            file_id: File ID to delete
+
+        Returns:
+            True if the file existed and was deleted, False otherwise
+        """
+        if not self.file_storage.get_file_path(file_id):
+            return False
+
+        with _append_lock(file_id):
+            removed = self.chroma_client.delete_where({"file_id": file_id})
+            deleted = self.file_storage.delete_file(file_id)
+        with _append_locks_lock:
+            _append_locks.pop(file_id, None)
+        get_answer_cache().invalidate(file_id)
+        get_column_stats_cache().invalidate(file_id)
+        logger.info(f"Deleted dataset {file_id}: file={deleted}, vectors={removed}")
+        return deleted
+
+    def compact(self) -> Dict[str, Any]:
+        """
+        Reclaim vector store space held by datasets that no longer exist.
+
+        Returns:
+            Compaction statistics
+        """
+        return self.chroma_client.compact(self.file_storage.list_file_ids)
+
+
+async def run_compaction_loop(interval_seconds: Optional[float] = None) -> None:
+    """
+    Periodically compact the vector store until cancelled.
+
+    Args:
+        interval_seconds: Seconds between runs (defaults to settings)
+    """
+    interval = interval_seconds or settings.compaction_interval_seconds
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(lambda: DatasetService().compact())
+        except Exception as e:
+            logger.error(f"Vector store compaction failed: {e}")
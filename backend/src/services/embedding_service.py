@@ -1,10 +1,14 @@
 """Embedding service for creating vector embeddings of text."""
 
+import asyncio
 from typing import List, Dict, Any, Optional
-import openai
 
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.services.admission import get_admission_controller
+from src.utils.cancellation import record_wasted
+from src.utils.metrics import record_token_usage, time_stage
+from src.utils.token_counter import estimate_tokens
 
 logger = get_logger(__name__)
 
@@ -20,7 +24,11 @@ class EmbeddingService:
             )
             self.client = None
         else:
-            self.client = openai.OpenAI(api_key=settings.openai_api_key)
+            import openai
+
+            self.client = openai.AsyncOpenAI(
+                api_key=settings.openai_api_key, base_url=settings.openai_base_url
+            )
 
     async def create_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
@@ -38,9 +46,13 @@ class EmbeddingService:
             )
 
         try:
-            response = self.client.embeddings.create(
-                model="text-embedding-3-small", input=texts
-            )
+            async with get_admission_controller("embeddings").slot():
+                with time_stage("embedding"):
+                    response = await self.client.embeddings.create(
+                        model="text-embedding-3-small", input=texts
+                    )
+            if response.usage is not None:
+                record_token_usage(response.model, response.usage.prompt_tokens)
 
             embeddings = [embedding.embedding for embedding in response.data]
             logger.info(f"Created embeddings for {len(texts)} texts")
@@ -84,13 +96,24 @@ class EmbeddingService:
 
         all_embeddings = []
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            batch_embeddings = await self.create_embeddings(batch)
-            all_embeddings.extend(batch_embeddings)
-
+        try:
+            for i in range(0, len(texts), batch_size):
+                batch = texts[i : i + batch_size]
+                batch_embeddings = await self.create_embeddings(batch)
+                all_embeddings.extend(batch_embeddings)
+
+                logger.info(
+                    f"Processed batch {i//batch_size + 1}/{(len(texts) + batch_size - 1)//batch_size}"
+                )
+        except asyncio.CancelledError:
+            # Remaining batches are never sent; report those already paid for
+            record_wasted(
+                "embeddings",
+                tokens=estimate_tokens(texts[: len(all_embeddings)]),
+            )
             logger.info(
-                f"Processed batch {i//batch_size + 1}/{(len(texts) + batch_size - 1)//batch_size}"
+                f"Embedding cancelled after {len(all_embeddings)}/{len(texts)} texts"
             )
+            raise
 
         return all_embeddings
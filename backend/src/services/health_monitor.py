@@ -0,0 +1,218 @@
+"""Background probing of component health, served from a cached snapshot."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Components that must be healthy for the instance to take traffic
+REQUIRED_COMPONENTS = ("chromadb", "file_storage")
+
+
+class HealthMonitor:
+    """
+    Probes components on an interval and keeps the latest results.
+
+    Health endpoints read the snapshot instead of opening the vector store
+    and upload index themselves, so polling them costs a dictionary copy.
+    The vector store is probed through the shared ChromaDB client; the file
+    storage a probe opens is kept for the next one.
+    """
+
+    def __init__(self, interval_seconds: float = 15.0):
+        """
+        Initialize health monitor.
+
+        Args:
+            interval_seconds: Seconds between probes
+        """
+        self.interval_seconds = interval_seconds
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._checked_monotonic: Optional[float] = None
+        self._probes = 0
+        self._file_storage = None
+        self._lock = threading.Lock()
+        # Serializes probes, so an on-demand probe never races the loop
+        self._probe_lock = threading.Lock()
+
+    def _check_chromadb(self) -> Dict[str, Any]:
+        from src.storage import get_chroma_client
+
+        info = get_chroma_client().get_collection_info()
+        return {"status": "healthy", "collection_count": info["document_count"]}
+
+    def _check_file_storage(self) -> Dict[str, Any]:
+        if self._file_storage is None:
+            from src.storage import FileStorage
+
+            self._file_storage = FileStorage()
+        info = self._file_storage.get_storage_info()
+        return {
+            "status": "healthy",
+            "total_files": info["total_files"],
+            "total_size_mb": info["total_size_mb"],
+        }
+
+    def _check_openai(self) -> Dict[str, Any]:
+        if settings.openai_api_key:
+            return {"status": "configured", "model": settings.openai_model}
+        return {
+            "status": "not_configured",
+            "message": "OpenAI API key not set. AI features will be disabled.",
+        }
+
+    def _run_check(self, name: str, check: Callable[[], Dict[str, Any]]):
+        start_time = time.perf_counter()
+        try:
+            result = check()
+        except Exception as e:
+            logger.warning(f"Health probe of {name} failed: {e}")
+            result = {"status": "unhealthy", "error": str(e)}
+            # Reopen file storage on the next probe; the shared ChromaDB
+            # client is process-wide and is not reopened here
+            if name == "file_storage":
+                self._file_storage = None
+        result["checked_at"] = datetime.now().isoformat()
+        result["latency_seconds"] = round(time.perf_counter() - start_time, 6)
+        return result
+
+    def probe(self) -> Dict[str, Any]:
+        """
+        Check every component and store the results as the new snapshot.
+
+        Blocking; run it in a worker thread.
+
+        Returns:
+            The new snapshot
+        """
+        with self._probe_lock:
+            start_time = time.perf_counter()
+            components = {
+                "chromadb": self._run_check("chromadb", self._check_chromadb),
+                "file_storage": self._run_check(
+                    "file_storage", self._check_file_storage
+                ),
+                "openai": self._run_check("openai", self._check_openai),
+            }
+            healthy = all(
+                component["status"] in ("healthy", "configured")
+                for component in components.values()
+            )
+            snapshot = {
+                "status": "healthy" if healthy else "degraded",
+                "checked_at": datetime.now().isoformat(),
+                "probe_seconds": round(time.perf_counter() - start_time, 6),
+                "components": components,
+            }
+            with self._lock:
+                self._snapshot = snapshot
+                self._checked_monotonic = time.monotonic()
+                self._probes += 1
+            return snapshot
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest probe results.
+
+        Returns:
+            Copy of the snapshot with its age in seconds, or None before the
+            first probe
+        """
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            snapshot = {
+                **self._snapshot,
+                "components": {
+                    name: dict(component)
+                    for name, component in self._snapshot["components"].items()
+                },
+            }
+            snapshot["age_seconds"] = round(
+                time.monotonic() - self._checked_monotonic, 3
+            )
+            return snapshot
+
+    def readiness(self) -> Dict[str, Any]:
+        """
+        Decide whether the instance can take traffic.
+
+        Ready means the last probe found every required component healthy
+        and is not older than three probe intervals; an older snapshot
+        means the prober is stuck.
+
+        Returns:
+            ``ready`` flag with the reason and time of the last probe
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            checked = self._checked_monotonic
+        if snapshot is None:
+            return {"ready": False, "reason": "starting", "checked_at": None}
+
+        age = time.monotonic() - checked
+        if self.interval_seconds > 0 and age > 3 * self.interval_seconds:
+            reason = "stale"
+        else:
+            unhealthy = [
+                name
+                for name in REQUIRED_COMPONENTS
+                if snapshot["components"][name]["status"] != "healthy"
+            ]
+            reason = f"unhealthy: {', '.join(unhealthy)}" if unhealthy else None
+        return {
+            "ready": reason is None,
+            "reason": reason,
+            "checked_at": snapshot["checked_at"],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get probe counters."""
+        with self._lock:
+            return {
+                "probes": self._probes,
+                "interval_seconds": self.interval_seconds,
+            }
+
+
+_health_monitor: Optional[HealthMonitor] = None
+_health_monitor_lock = threading.Lock()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """
+    Get the process-wide health monitor.
+
+    Returns:
+        Shared HealthMonitor instance
+    """
+    global _health_monitor
+    with _health_monitor_lock:
+        if _health_monitor is None:
+            _health_monitor = HealthMonitor(
+                interval_seconds=settings.health_probe_interval_seconds
+            )
+        return _health_monitor
+
+
+async def run_health_probe_loop(interval_seconds: Optional[float] = None) -> None:
+    """
+    Probe component health now and then on an interval, until cancelled.
+
+    Args:
+        interval_seconds: Seconds between probes (defaults to settings)
+    """
+    monitor = get_health_monitor()
+    interval = interval_seconds or monitor.interval_seconds
+    while True:
+        try:
+            await asyncio.to_thread(monitor.probe)
+        except Exception as e:
+            logger.error(f"Health probe failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,340 @@
+"""Deadlines, hedged requests and retry budgets for OpenAI completions."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.services.admission import AdmissionController
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=None)
+def retryable_errors() -> Tuple[type, ...]:
+    """Get the errors worth retrying (imports openai on first use)."""
+    import openai
+
+    return (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+        asyncio.TimeoutError,
+    )
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to derive the hedge delay."""
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Number of most recent latencies kept
+            min_samples: Samples needed before percentiles are trusted
+        """
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record one call latency."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(int(len(ordered) * percentile / 100), len(ordered) - 1)
+        return ordered[index]
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries and hedges to a fraction of calls.
+
+    Every first attempt deposits ``ratio`` tokens and every extra attempt
+    spends one, so extra load stays near ``ratio`` of normal traffic even
+    when the upstream is failing.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0):
+        """
+        Initialize retry budget.
+
+        Args:
+            ratio: Extra attempts allowed per first attempt
+            max_tokens: Maximum tokens that can be saved up
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+        self._stats = {"attempts": 0, "retries": 0, "hedges": 0, "denied": 0}
+
+    def deposit(self) -> None:
+        """Record a first attempt."""
+        with self._lock:
+            self._stats["attempts"] += 1
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self, kind: str) -> bool:
+        """
+        Try to spend a token on an extra attempt.
+
+        Args:
+            kind: ``"retries"`` or ``"hedges"``
+
+        Returns:
+            True if the extra attempt may be made
+        """
+        with self._lock:
+            if self._tokens < 1:
+                self._stats["denied"] += 1
+                return False
+            self._tokens -= 1
+            self._stats[kind] += 1
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get attempt, retry and hedge counters."""
+        with self._lock:
+            return {**self._stats, "tokens": round(self._tokens, 2)}
+
+
+async def _discard(task: asyncio.Task, on_discard: Optional[Callable]) -> None:
+    """Cancel a losing attempt, releasing its result if it already finished."""
+    if not task.done():
+        task.cancel()
+        return
+    if on_discard and not task.cancelled() and task.exception() is None:
+        try:
+            await on_discard(task.result())
+        except Exception as e:
+            logger.debug(f"Error discarding hedged result: {e}")
+
+
+def _start_hedge(
+    call: Callable[[], Awaitable[Any]],
+    budget: RetryBudget,
+    admission: Optional[AdmissionController],
+) -> Optional[asyncio.Task]:
+    """Start a hedge if the budget and a free admission slot allow it."""
+    if admission is not None and not admission.try_acquire():
+        logger.debug(f"Not hedging: no free {admission.name} admission slot")
+        return None
+    if not budget.try_spend("hedges"):
+        if admission is not None:
+            admission.release()
+        return None
+    task = asyncio.create_task(call())
+    if admission is not None:
+        # A done callback also runs if the task is cancelled before starting
+        task.add_done_callback(lambda _: admission.release())
+    return task
+
+
+async def hedged_call(
+    call: Callable[[], Awaitable[Any]],
+    timeout: float,
+    hedge_delay: Optional[float],
+    budget: RetryBudget,
+    tracker: LatencyTracker,
+    max_retries: int = 2,
+    on_discard: Optional[Callable[[Any], Awaitable[None]]] = None,
+    admission: Optional[AdmissionController] = None,
+) -> Any:
+    """
+    Run a call under a deadline, hedging and retrying within a budget.
+
+    If an attempt has not finished after ``hedge_delay`` a duplicate is
+    started, and whichever succeeds first wins; the other is cancelled (or
+    passed to ``on_discard`` if it had already finished). Retryable failures
+    are retried while the budget and deadline allow.
+
+    The caller's admission slot covers one upstream call, so a hedge must
+    take a free slot of ``admission`` for as long as it runs; when none is
+    free the attempt is not hedged, keeping upstream calls within the cap.
+
+    Args:
+        call: Factory creating one attempt
+        timeout: Seconds until the whole call gives up
+        hedge_delay: Seconds before hedging, or None to disable hedging
+        budget: Retry budget shared by all calls of this kind
+        tracker: Tracker the winning attempt's latency is recorded in
+        max_retries: Maximum retries after failed attempts
+        on_discard: Coroutine releasing the result of a losing attempt
+        admission: Admission controller hedges take their slot from
+
+    Returns:
+        Result of the first successful attempt
+    """
+    deadline = time.monotonic() + timeout
+    budget.deposit()
+    retries = 0
+    last_error: Optional[BaseException] = None
+
+    while True:
+        start_time = time.monotonic()
+        pending: Set[asyncio.Task] = {asyncio.create_task(call())}
+        # Each attempt may be hedged once, even if an earlier one was not
+        hedgeable = hedge_delay is not None
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait = remaining
+                if hedgeable:
+                    wait = min(
+                        wait, max(hedge_delay - (time.monotonic() - start_time), 0)
+                    )
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    tracker.record(time.monotonic() - start_time)
+                    # Both attempts may have finished; release every loser
+                    for other in (done | pending) - {winner}:
+                        await _discard(other, on_discard)
+                    pending = set()
+                    return winner.result()
+                for task in done:
+                    last_error = task.exception()
+                if not done and hedgeable:
+                    hedgeable = False
+                    hedge = _start_hedge(call, budget, admission)
+                    if hedge is not None:
+                        logger.info(f"Hedging slow call after {hedge_delay:.2f}s")
+                        pending.add(hedge)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if time.monotonic() >= deadline:
+            raise asyncio.TimeoutError(f"Call did not finish within {timeout:.1f}s")
+        if (
+            not isinstance(last_error, retryable_errors())
+            or retries >= max_retries
+            or not budget.try_spend("retries")
+        ):
+            raise last_error
+        retries += 1
+        logger.warning(f"Retrying failed call ({retries}/{max_retries}): {last_error}")
+
+
+class CompletionHedger:
+    """Per-kind latency trackers and retry budget for chat completions."""
+
+    def __init__(self):
+        """Initialize hedger from settings."""
+        self.budget = RetryBudget(ratio=settings.openai_retry_budget_ratio)
+        self.trackers = {
+            "completion": LatencyTracker(),
+            "first_token": LatencyTracker(),
+        }
+
+    def hedge_delay(self, kind: str) -> Optional[float]:
+        """
+        Get the delay before hedging a call of this kind.
+
+        Args:
+            kind: ``"completion"`` or ``"first_token"``
+
+        Returns:
+            Delay in seconds, or None if hedging is disabled
+        """
+        if not settings.openai_hedging_enabled:
+            return None
+        observed = self.trackers[kind].percentile(settings.openai_hedge_percentile)
+        return max(observed or 0.0, settings.openai_hedge_min_delay_seconds)
+
+    def timeout(self, remaining: Optional[float] = None) -> float:
+        """
+        Get the deadline for one call.
+
+        Args:
+            remaining: Seconds left until the request's own deadline, if any
+
+        Returns:
+            Seconds the call may take
+        """
+        timeout = settings.openai_timeout_seconds
+        return timeout if remaining is None else max(min(timeout, remaining), 0.0)
+
+    async def call(
+        self,
+        kind: str,
+        call: Callable[[], Awaitable[Any]],
+        remaining: Optional[float] = None,
+        on_discard: Optional[Callable[[Any], Awaitable[None]]] = None,
+        admission: Optional[AdmissionController] = None,
+    ) -> Any:
+        """
+        Run a completion call with the configured deadline, hedging and retries.
+
+        Args:
+            kind: ``"completion"`` or ``"first_token"``
+            call: Factory creating one attempt
+            remaining: Seconds left until the request's own deadline, if any
+            on_discard: Coroutine releasing the result of a losing attempt
+            admission: Admission controller hedges take their slot from
+
+        Returns:
+            Result of the first successful attempt
+        """
+        return await hedged_call(
+            call,
+            timeout=self.timeout(remaining),
+            hedge_delay=self.hedge_delay(kind),
+            budget=self.budget,
+            tracker=self.trackers[kind],
+            max_retries=settings.openai_max_retries,
+            on_discard=on_discard,
+            admission=admission,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budget counters and observed latency percentiles."""
+        return {
+            **self.budget.get_stats(),
+            "p95_seconds": {
+                kind: tracker.percentile(95) for kind, tracker in self.trackers.items()
+            },
+        }
+
+
+_hedger: Optional[CompletionHedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_completion_hedger() -> CompletionHedger:
+    """
+    Get the process-wide completion hedger.
+
+    Returns:
+        Shared CompletionHedger instance
+    """
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = CompletionHedger()
+        return _hedger
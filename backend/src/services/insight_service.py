@@ -0,0 +1,316 @@
+"""Precomputed insight packs answering predictable questions about a dataset."""
+
+import csv
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Distinct values tracked per text column before it is treated as free text
+MAX_TRACKED_CATEGORIES = 1000
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%d.%m.%Y"]
+
+# Words that filter or group a question; the pack only holds whole-dataset
+# numbers, so such questions go to the model
+SCOPE_WORDS = {
+    "in",
+    "for",
+    "by",
+    "per",
+    "where",
+    "which",
+    "each",
+    "group",
+    "grouped",
+    "with",
+    "whose",
+    "during",
+    "between",
+    "except",
+    "excluding",
+}
+MONTH_WORDS = {
+    datetime(2000, month, 1).strftime(fmt).lower()
+    for month in range(1, 13)
+    for fmt in ("%B", "%b")
+}
+# Phrases of the standard questions that contain scope words themselves
+STANDARD_PHRASES = r"\b(which|what) (columns|fields)\b|\b(per|by) month\b"
+
+
+def _parse_number(cell: str) -> Optional[float]:
+    try:
+        return float(cell.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _parse_date(cell: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(cell)
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(cell, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _format_number(value: float) -> str:
+    return f"{value:,.0f}" if float(value).is_integer() else f"{value:,.2f}"
+
+
+def _words(text: str) -> set[str]:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+class InsightService:
+    """Service for computing and serving standard dataset insights."""
+
+    def build_insight_pack(
+        self, file_path: str, column_stats: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Compute the standard insight pack for a dataset in one pass.
+
+        Covers the overview, totals and ranges of numeric columns, top
+        categories of low-cardinality text columns, monthly row counts for
+        the first date column and the columns with the most missing data.
+
+        Args:
+            file_path: Path to the CSV file
+            column_stats: Column statistics from CSVService
+
+        Returns:
+            Insight pack dictionary
+        """
+        with open(file_path, "r", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            headers = next(reader, [])
+            types = [column_stats.get(h, {}).get("data_type") for h in headers]
+            date_index = next(
+                (i for i, data_type in enumerate(types) if data_type == "date"), None
+            )
+
+            numeric = {
+                i: {"sum": 0.0, "count": 0, "min": None, "max": None}
+                for i, data_type in enumerate(types)
+                if data_type == "numeric"
+            }
+            categories = {
+                i: Counter() for i, data_type in enumerate(types) if data_type == "text"
+            }
+            months: Counter = Counter()
+            total_rows = 0
+
+            for row in reader:
+                total_rows += 1
+                for i, agg in numeric.items():
+                    value = _parse_number(row[i].strip()) if i < len(row) else None
+                    if value is None:
+                        continue
+                    agg["sum"] += value
+                    agg["count"] += 1
+                    agg["min"] = value if agg["min"] is None else min(agg["min"], value)
+                    agg["max"] = value if agg["max"] is None else max(agg["max"], value)
+                for i in list(categories):
+                    cell = row[i].strip() if i < len(row) else ""
+                    if not cell:
+                        continue
+                    counts = categories[i]
+                    counts[cell] += 1
+                    if len(counts) > MAX_TRACKED_CATEGORIES:
+                        del categories[i]
+                if date_index is not None and date_index < len(row):
+                    parsed = _parse_date(row[date_index].strip())
+                    if parsed is not None:
+                        months[parsed.strftime("%Y-%m")] += 1
+
+        totals = {
+            headers[i]: {
+                "sum": agg["sum"],
+                "mean": agg["sum"] / agg["count"],
+                "min": agg["min"],
+                "max": agg["max"],
+                "count": agg["count"],
+            }
+            for i, agg in numeric.items()
+            if agg["count"]
+        }
+        top_categories = {
+            headers[i]: [
+                {"value": value, "count": count}
+                for value, count in counts.most_common(5)
+            ]
+            for i, counts in categories.items()
+            if counts and len(counts) < total_rows
+        }
+        missing = sorted(
+            (
+                {
+                    "column": name,
+                    "empty_cells": stats["empty_cells"],
+                    "empty_ratio": round(
+                        stats["empty_cells"] / max(stats["total_cells"], 1), 4
+                    ),
+                }
+                for name, stats in column_stats.items()
+                if stats.get("empty_cells")
+            ),
+            key=lambda item: item["empty_ratio"],
+            reverse=True,
+        )
+
+        pack = {
+            "overview": {"total_rows": total_rows, "columns": headers},
+            "totals": totals,
+            "top_categories": top_categories,
+            "trend": (
+                {
+                    "date_column": headers[date_index],
+                    "rows_per_month": dict(sorted(months.items())),
+                }
+                if date_index is not None and months
+                else None
+            ),
+            "missing_data": missing[:10],
+        }
+        logger.info(
+            f"Built insight pack for {file_path}: {len(totals)} numeric, "
+            f"{len(top_categories)} categorical columns"
+        )
+        return pack
+
+    def _mentioned_columns(self, question: str, columns: List[str]) -> List[str]:
+        """Find the columns a question names, dropping names inside longer ones."""
+        question_words = _words(question)
+        matches = [c for c in columns if _words(c) and _words(c) <= question_words]
+        return [
+            c
+            for c in matches
+            if not any(other != c and _words(c) < _words(other) for other in matches)
+        ]
+
+    def _is_scoped(
+        self, question: str, pack: Dict[str, Any], standard_phrases: bool = False
+    ) -> bool:
+        """
+        Check whether a question filters or groups the data.
+
+        Args:
+            question: The question asked
+            pack: Insight pack from ``build_insight_pack()``
+            standard_phrases: Whether the scope words of standard questions
+                ("which columns", "by month") are allowed
+
+        Returns:
+            True if the question names scope words, column values, months
+            or numbers
+        """
+        if standard_phrases:
+            question = re.sub(STANDARD_PHRASES, " ", question.lower())
+        question_words = _words(question)
+        if question_words & (SCOPE_WORDS | MONTH_WORDS):
+            return True
+        if any(word.isdigit() for word in question_words):
+            return True
+        return any(
+            _words(str(item["value"])) <= question_words
+            for values in pack["top_categories"].values()
+            for item in values
+            if _words(str(item["value"]))
+        )
+
+    def answer_question(self, question: str, pack: Dict[str, Any]) -> Optional[str]:
+        """
+        Answer a question directly from an insight pack if it matches one.
+
+        Matching is deliberately conservative: anything that is not clearly
+        one of the standard questions returns None and goes to the model.
+        Questions that filter or group the data (scope words, column values,
+        months or numbers) are never answered, since the pack only holds
+        whole-dataset numbers, and per-column answers need exactly one
+        column to be named.
+
+        Args:
+            question: The question asked
+            pack: Insight pack from ``build_insight_pack()``
+
+        Returns:
+            Answer text, or None if the pack cannot answer the question
+        """
+        q = " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+        overview = pack["overview"]
+        columns = self._mentioned_columns(q, overview["columns"])
+        if self._is_scoped(q, pack, standard_phrases=not columns):
+            return None
+
+        if columns:
+            if len(columns) == 1:
+                return self._answer_column_question(q, columns[0], pack)
+            return None
+
+        if re.search(
+            r"\b(how many|number of|count of|total) (rows|records|entries)\b|"
+            r"\brow count\b",
+            q,
+        ):
+            return f"The dataset has {overview['total_rows']:,} rows."
+
+        if re.search(r"\b(what|which|list)( are)?( the)? (columns|fields)\b", q):
+            return (
+                f"The dataset has {len(overview['columns'])} columns: "
+                f"{', '.join(overview['columns'])}."
+            )
+
+        if re.search(
+            r"\b(missing|empty|null|blank) (data|values|cells)\b|"
+            r"\b(incomplete|completeness)\b",
+            q,
+        ):
+            if not pack["missing_data"]:
+                return "No column has missing values."
+            worst = ", ".join(
+                f"{item['column']} ({item['empty_ratio']:.1%} empty)"
+                for item in pack["missing_data"][:5]
+            )
+            return f"Columns with the most missing data: {worst}."
+
+        trend = pack.get("trend")
+        if trend and re.search(r"\b(trend|over time|per month|by month)\b", q):
+            months = trend["rows_per_month"]
+            busiest = max(months, key=months.get)
+            return (
+                f"Based on {trend['date_column']}, the data spans "
+                f"{min(months)} to {max(months)} across {len(months)} months; "
+                f"{busiest} has the most rows ({months[busiest]:,})."
+            )
+
+        return None
+
+    def _answer_column_question(
+        self, q: str, column: str, pack: Dict[str, Any]
+    ) -> Optional[str]:
+        """Answer a question about one column from its totals or categories."""
+        stats = pack["totals"].get(column)
+        if stats:
+            if re.search(r"\b(total|sum)\b", q):
+                return f"The total of {column} is {_format_number(stats['sum'])}."
+            if re.search(r"\b(average|mean)\b", q):
+                return f"The average {column} is {_format_number(stats['mean'])}."
+            if re.search(r"\b(max|maximum|highest|largest)\b", q):
+                return f"The maximum {column} is {_format_number(stats['max'])}."
+            if re.search(r"\b(min|minimum|lowest|smallest)\b", q):
+                return f"The minimum {column} is {_format_number(stats['min'])}."
+
+        top = pack["top_categories"].get(column)
+        if top and re.search(r"\b(top|most common|most frequent|popular)\b", q):
+            values = ", ".join(f"{item['value']} ({item['count']:,})" for item in top)
+            return f"The most common values of {column} are: {values}."
+        return None
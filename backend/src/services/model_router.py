@@ -0,0 +1,206 @@
+"""Routing of questions to models by estimated complexity."""
+
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.utils.token_counter import count_tokens
+
+logger = get_logger(__name__)
+
+# Phrases that signal reasoning beyond a lookup or a single aggregate
+COMPLEX_PATTERNS = [
+    r"\bwhy\b",
+    r"\bexplain",
+    r"\bcompar",
+    r"\bcorrelat",
+    r"\brelationship",
+    r"\banaly[sz]",
+    r"\bpredict",
+    r"\bforecast",
+    r"\brecommend",
+    r"\bimpact\b",
+    r"\bcause",
+    r"\bstep by step\b",
+    r"\bversus\b|\bvs\b",
+    r"\bpattern",
+    r"\banomal",
+    r"\boutlier",
+    r"\bsegment",
+    r"\bwhat if\b",
+]
+
+
+@dataclass
+class ModelRoute:
+    """Model and generation parameters chosen for a question."""
+
+    model: str
+    max_tokens: int
+    temperature: float
+    complexity: str
+    reason: str
+
+
+class ModelRouter:
+    """
+    Route questions to a small or large model using cheap local heuristics.
+
+    A question is complex if it contains reasoning phrases, asks several
+    things at once, is long, or arrives with a large prompt (for example a
+    long conversation). Everything else is treated as a simple lookup and
+    sent to the small model with a tight completion limit.
+    """
+
+    def __init__(
+        self,
+        simple_model: str,
+        complex_model: str,
+        simple_max_tokens: int = 300,
+        complex_max_tokens: int = 1000,
+        simple_temperature: float = 0.2,
+        complex_temperature: float = 0.7,
+        max_simple_question_words: int = 30,
+        max_simple_prompt_tokens: int = 2000,
+    ):
+        """
+        Initialize model router.
+
+        Args:
+            simple_model: Model for simple questions
+            complex_model: Model for complex questions
+            simple_max_tokens: Completion limit for simple questions
+            complex_max_tokens: Completion limit for complex questions
+            simple_temperature: Sampling temperature for simple questions
+            complex_temperature: Sampling temperature for complex questions
+            max_simple_question_words: Longest question still treated as simple
+            max_simple_prompt_tokens: Largest prompt still treated as simple
+        """
+        self.simple_model = simple_model
+        self.complex_model = complex_model
+        self.simple_max_tokens = simple_max_tokens
+        self.complex_max_tokens = complex_max_tokens
+        self.simple_temperature = simple_temperature
+        self.complex_temperature = complex_temperature
+        self.max_simple_question_words = max_simple_question_words
+        self.max_simple_prompt_tokens = max_simple_prompt_tokens
+        self._patterns = [re.compile(pattern) for pattern in COMPLEX_PATTERNS]
+        self._decisions: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _complex_reason(
+        self, question: str, messages: List[Dict[str, str]]
+    ) -> Optional[str]:
+        """Return why a question is complex, or None if it looks simple."""
+        text = question.lower()
+        for pattern in self._patterns:
+            match = pattern.search(text)
+            if match:
+                return f"matched '{match.group(0)}'"
+        if text.count("?") > 1:
+            return "multiple questions"
+        words = len(text.split())
+        if words > self.max_simple_question_words:
+            return f"{words} words"
+        prompt_tokens = count_tokens([m["content"] for m in messages], approximate=True)
+        if prompt_tokens > self.max_simple_prompt_tokens:
+            return f"{prompt_tokens} prompt tokens"
+        return None
+
+    def route(self, question: str, messages: List[Dict[str, str]]) -> ModelRoute:
+        """
+        Choose the model and generation parameters for a question.
+
+        Args:
+            question: The question asked
+            messages: Chat messages that will be sent
+
+        Returns:
+            Chosen route
+        """
+        reason = self._complex_reason(question, messages)
+        if reason:
+            route = ModelRoute(
+                model=self.complex_model,
+                max_tokens=self.complex_max_tokens,
+                temperature=self.complex_temperature,
+                complexity="complex",
+                reason=reason,
+            )
+        else:
+            route = ModelRoute(
+                model=self.simple_model,
+                max_tokens=self.simple_max_tokens,
+                temperature=self.simple_temperature,
+                complexity="simple",
+                reason="no complexity signals",
+            )
+
+        with self._lock:
+            self._decisions[route.complexity] += 1
+        logger.info(
+            f"Routed query to {route.model} ({route.complexity}: {route.reason}): "
+            f"{question[:50]}..."
+        )
+        return route
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number of questions routed to each model."""
+        with self._lock:
+            return {
+                "simple_model": self.simple_model,
+                "complex_model": self.complex_model,
+                "simple": self._decisions["simple"],
+                "complex": self._decisions["complex"],
+            }
+
+
+_model_router: Optional[ModelRouter] = None
+_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """
+    Get the process-wide model router.
+
+    When routing is disabled both routes use ``settings.openai_model`` with
+    the original completion limit, so behaviour is unchanged. Routing is also
+    left off when the simple model is the complex one, since it would then
+    only cut simple answers short.
+
+    Returns:
+        Shared ModelRouter instance
+    """
+    global _model_router
+    with _model_router_lock:
+        if _model_router is None:
+            complex_model = settings.routing_complex_model or settings.openai_model
+            routed = settings.model_routing_enabled
+            if routed and settings.routing_simple_model == complex_model:
+                logger.warning(
+                    "Model routing disabled: ROUTING_SIMPLE_MODEL must differ "
+                    f"from the complex model ({complex_model})"
+                )
+                routed = False
+            if routed:
+                _model_router = ModelRouter(
+                    simple_model=settings.routing_simple_model,
+                    complex_model=complex_model,
+                    simple_max_tokens=settings.routing_simple_max_tokens,
+                    complex_max_tokens=settings.routing_complex_max_tokens,
+                    max_simple_question_words=settings.routing_max_simple_question_words,
+                    max_simple_prompt_tokens=settings.routing_max_simple_prompt_tokens,
+                )
+            else:
+                _model_router = ModelRouter(
+                    simple_model=settings.openai_model,
+                    complex_model=settings.openai_model,
+                    simple_max_tokens=1000,
+                    complex_max_tokens=1000,
+                    simple_temperature=0.7,
+                )
+        return _model_router
@@ -0,0 +1,165 @@
+"""Token-budgeted prompt assembly for data questions."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.token_counter import count_tokens
+from src.utils.tokenizer import approximate_token_count
+
+COLUMN_TABLE_HEADER = "Columns (name | type | filled/total | unique | examples):"
+CHUNK_SECTION_HEADER = "Relevant data excerpts:"
+
+
+def _words(text: str) -> set[str]:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def encode_column_profile(name: str, stats: Dict[str, Any]) -> str:
+    """
+    Encode one column profile as a compact table row.
+
+    Args:
+        name: Column name
+        stats: Column statistics from CSVService
+
+    Returns:
+        Single table row, e.g. ``age | numeric | 95/100 | 40 | 30; 25; 41``
+    """
+    examples = "; ".join(str(v) for v in stats.get("sample_unique_values", [])[:3])
+    return (
+        f"{name} | {stats.get('data_type', 'unknown')} | "
+        f"{stats.get('non_empty_cells', '?')}/{stats.get('total_cells', '?')} | "
+        f"{stats.get('unique_values_count', '?')} | {examples}"
+    )
+
+
+class PromptBuilder:
+    """
+    Assemble prompts from dataset context under a token budget.
+
+    Context is split into small units (overview, one line per column, one
+    retrieved chunk each) which are packed greedily in priority order. Units
+    that do not fit are skipped so later, smaller ones can still be used.
+    """
+
+    def __init__(self, token_budget: int, model: str = "gpt-4o-mini"):
+        """
+        Initialize prompt builder.
+
+        Args:
+            token_budget: Maximum tokens for the assembled prompt
+            model: Model whose tokenizer is used for counting
+        """
+        self.token_budget = token_budget
+        self.model = model
+
+    def _column_units(
+        self, question: str, dataset: Dict[str, Any]
+    ) -> Tuple[List[str], List[str]]:
+        """Split column rows into those the question mentions and the rest."""
+        column_stats = dataset.get("column_stats") or {}
+        headers = dataset.get("headers") or list(column_stats)
+        question_words = _words(question)
+
+        mentioned, others = [], []
+        for name in headers:
+            stats = column_stats.get(name)
+            row = encode_column_profile(name, stats) if stats else name
+            if _words(name) & question_words:
+                mentioned.append(row)
+            else:
+                others.append(row)
+        return mentioned, others
+
+    def build(
+        self,
+        question: str,
+        dataset: Optional[Dict[str, Any]] = None,
+        chunks: Optional[List[str]] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build a prompt for a question.
+
+        Args:
+            question: The question to ask
+            dataset: Dataset profile or request context (headers, total_rows,
+                summary, column_stats)
+            chunks: Retrieved text chunks, most relevant first
+
+        Returns:
+            Tuple of (prompt, packing statistics)
+        """
+        dataset = dataset or {}
+        head = f"Question: {question}\n\n"
+        tail = (
+            "\nPlease provide a clear and helpful answer based on the available data."
+        )
+        approximate = False
+
+        def cost_of(text: str) -> int:
+            # Switch to length estimates for the rest of the build when the
+            # encoding cannot be loaded, instead of retrying per unit
+            nonlocal approximate
+            if not approximate:
+                try:
+                    return count_tokens(text, self.model)
+                except Exception:
+                    approximate = True
+            return approximate_token_count(text)
+
+        used = cost_of(head + "Context:\n" + tail)
+
+        overview = []
+        if "total_rows" in dataset:
+            overview.append(f"Total rows: {dataset['total_rows']}")
+        if dataset.get("summary"):
+            overview.append(f"Data summary: {dataset['summary']}")
+
+        mentioned, other_columns = self._column_units(question, dataset)
+        summary = dataset.get("summary") or ""
+        retrieved = [chunk for chunk in chunks or [] if chunk and chunk not in summary]
+
+        # Priority order: overview, columns named in the question, retrieved
+        # chunks, then the remaining columns
+        candidates = (
+            [("overview", line) for line in overview]
+            + [("column", row) for row in mentioned]
+            + [("chunk", chunk) for chunk in retrieved]
+            + [("column", row) for row in other_columns]
+        )
+
+        included: Dict[str, List[str]] = {"overview": [], "column": [], "chunk": []}
+        dropped = 0
+        section_headers = {"column": COLUMN_TABLE_HEADER, "chunk": CHUNK_SECTION_HEADER}
+        for kind, text in candidates:
+            cost = cost_of(text + "\n")
+            if kind in section_headers and not included[kind]:
+                cost += cost_of(section_headers[kind] + "\n\n")
+            if used + cost > self.token_budget:
+                dropped += 1
+                continue
+            included[kind].append(text)
+            used += cost
+
+        sections = []
+        if included["overview"]:
+            sections.append("\n".join(included["overview"]))
+        if included["column"]:
+            sections.append("\n".join([COLUMN_TABLE_HEADER, *included["column"]]))
+        if included["chunk"]:
+            sections.append("\n".join([CHUNK_SECTION_HEADER, *included["chunk"]]))
+
+        prompt = head
+        if sections:
+            prompt += "Context:\n" + "\n\n".join(sections) + "\n"
+        prompt += tail
+
+        stats = {
+            "tokens": used,
+            "token_budget": self.token_budget,
+            "columns": len(included["column"]),
+            "chunks": len(included["chunk"]),
+            "dropped_units": dropped,
+            "approximate_tokens": approximate,
+        }
+        return prompt, stats
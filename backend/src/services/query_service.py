@@ -1,18 +1,56 @@
 """Query service for processing natural language queries about CSV data."""
 
-from typing import List, Dict, Any, Optional
-import openai
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
 from src.core.config import settings
 from src.core.logging import get_logger
-from src.storage import ChromaClient
+from src.services.admission import get_admission_controller, remaining_time
+from src.services.answer_cache import (
+    SemanticAnswerCache,
+    get_answer_cache,
+    normalize_question,
+)
+from src.services.dataset_service import DatasetService
+from src.services.embedding_service import EmbeddingService
+from src.services.hedging import get_completion_hedger
+from src.services.insight_service import InsightService
+from src.services.model_router import get_model_router
+from src.services.prompt_builder import PromptBuilder
+from src.services.singleflight import get_singleflight
+from src.storage import get_chroma_client
+from src.storage.session_store import get_session_store
+from src.utils.cancellation import record_wasted
+from src.utils.metrics import observe_stage, record_token_usage, time_stage
+from src.utils.profiling import profile_thread
+from src.utils.token_counter import estimate_tokens
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class PreparedQuery:
+    """Dataset context and cache state resolved before calling the model."""
+
+    file_id: Optional[str]
+    dataset: Dict[str, Any]
+    dataset_key: str
+    embedding: Optional[List[float]] = None
+    cached_answer: Optional[str] = None
+    answer_source: str = "model"
+    session_id: Optional[str] = None
+    history: Optional[Dict[str, Any]] = None
+
+
 class QueryService:
     """Service for processing queries about uploaded CSV data."""
 
+    SYSTEM_PROMPT = "You are a helpful data analyst assistant. Answer questions about CSV data in a clear and concise manner."
+
     def __init__(self):
         """Initialize query service."""
         if not settings.openai_api_key:
@@ -21,18 +59,276 @@ class QueryService:
             )
             self.client = None
         else:
-            self.client = openai.OpenAI(api_key=settings.openai_api_key)
-        self.chroma_client = ChromaClient()
+            import openai
+
+            # Retries are made by the completion hedger, within its budget
+            self.client = openai.AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url,
+                max_retries=0,
+            )
+        self.chroma_client = get_chroma_client()
+        self.answer_cache = get_answer_cache()
+        self.session_store = get_session_store()
+
+    def _dataset_key(
+        self,
+        file_id: Optional[str],
+        context_data: Optional[Dict[str, Any]],
+        profile: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Identify the dataset version a question is asked against.
+
+        Uploaded datasets are keyed by file ID and content version. Requests
+        without a file ID are keyed by a hash of the context they carry.
+
+        Args:
+            file_id: Optional uploaded dataset ID
+            context_data: Optional context data about the CSV
+            profile: Stored profile of the uploaded dataset, if any
+
+        Returns:
+            Dataset key for the answer cache
+        """
+        if file_id:
+            version = profile.get("version") if profile else None
+            return SemanticAnswerCache.dataset_key(file_id, version)
+        context_hash = hashlib.sha256(
+            json.dumps(context_data or {}, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return SemanticAnswerCache.dataset_key("context", context_hash)
+
+    async def _cache_lookup(
+        self,
+        dataset_key: str,
+        question: str,
+        embedding: Optional[List[float]] = None,
+    ) -> Tuple[Optional[str], Optional[List[float]]]:
+        """
+        Look up a cached answer for a question.
+
+        Args:
+            dataset_key: Dataset key from ``_dataset_key()``
+            question: The question to ask
+            embedding: Precomputed question embedding, if available
+
+        Returns:
+            Tuple of (cached answer or None, question embedding or None)
+        """
+        if not settings.answer_cache_enabled:
+            return None, embedding
+
+        answer = self.answer_cache.lookup_exact(dataset_key, question)
+        if answer is not None:
+            return answer, embedding
+
+        if embedding is None:
+            try:
+                embedding = await EmbeddingService().create_single_embedding(question)
+            except Exception as e:
+                logger.warning(f"Could not embed question for answer cache: {e}")
+        return self.answer_cache.lookup(dataset_key, embedding), embedding
+
+    def _finish(
+        self, question: str, prepared: PreparedQuery, answer: Optional[str]
+    ) -> None:
+        """
+        Record an answer in the answer cache and the session history.
+
+        Answers to follow-up questions depend on the conversation, so they
+        are only cached when the question was asked without history.
+
+        Args:
+            question: The question asked
+            prepared: Prepared query state
+            answer: The answer returned
+        """
+        if not answer:
+            return
+        if (
+            settings.answer_cache_enabled
+            and prepared.cached_answer is None
+            and not (prepared.history and prepared.history["turns"])
+        ):
+            self.answer_cache.store(
+                prepared.dataset_key, question, prepared.embedding, answer
+            )
+        if prepared.session_id:
+            self.session_store.append_turn(prepared.session_id, question, answer)
+
+    def _load_dataset(
+        self, file_id: Optional[str], context_data: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Load the dataset context shared by every question about a dataset.
+
+        Args:
+            file_id: Optional ID of the uploaded dataset
+            context_data: Optional context data about the CSV
+
+        Returns:
+            Tuple of (dataset profile merged with context, dataset key)
+        """
+        profile = None
+        if file_id:
+            profile = DatasetService(chroma_client=self.chroma_client).get_profile(
+                file_id
+            )
+        return (
+            {**(profile or {}), **(context_data or {})},
+            self._dataset_key(file_id, context_data, profile),
+        )
+
+    async def _prepare(
+        self,
+        question: str,
+        context_data: Optional[Dict[str, Any]],
+        file_id: Optional[str],
+        session_id: Optional[str] = None,
+        dataset: Optional[Tuple[Dict[str, Any], str]] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> PreparedQuery:
+        """
+        Resolve the dataset profile, session history and answer cache.
+
+        Args:
+            question: The question to ask
+            context_data: Optional context data about the CSV
+            file_id: Optional ID of the uploaded dataset
+            session_id: Optional conversation session ID
+            dataset: Dataset context from ``_load_dataset()``, loaded if omitted
+            embedding: Precomputed question embedding, if available
+
+        Returns:
+            Prepared query state
+        """
+        dataset_context, dataset_key = dataset or self._load_dataset(
+            file_id, context_data
+        )
+        prepared = PreparedQuery(
+            file_id=file_id,
+            dataset=dataset_context,
+            dataset_key=dataset_key,
+            embedding=embedding,
+            session_id=session_id,
+        )
+
+        if session_id:
+            prepared.history = self.session_store.get_context_window(
+                session_id, settings.session_history_token_budget
+            )
+        if prepared.history and prepared.history["turns"]:
+            return prepared
+
+        insights = prepared.dataset.get("insights")
+        if insights:
+            prepared.cached_answer = InsightService().answer_question(
+                question, insights
+            )
+            if prepared.cached_answer is not None:
+                prepared.answer_source = "insight"
+                return prepared
+
+        prepared.cached_answer, prepared.embedding = await self._cache_lookup(
+            prepared.dataset_key, question, embedding
+        )
+        if prepared.cached_answer is not None:
+            prepared.answer_source = "cache"
+        return prepared
+
+    async def _retrieve(self, question: str, prepared: PreparedQuery) -> List[str]:
+        """
+        Retrieve the dataset chunks most relevant to a question.
+
+        Args:
+            question: The question to ask
+            prepared: Prepared query state
+
+        Returns:
+            Chunk texts, most relevant first
+        """
+        if not prepared.file_id or settings.retrieval_top_k <= 0:
+            return []
+
+        try:
+            if prepared.embedding is None:
+                prepared.embedding = await EmbeddingService().create_single_embedding(
+                    question
+                )
+            results = await asyncio.to_thread(
+                profile_thread(self.chroma_client.query),
+                query_embeddings=[prepared.embedding],
+                n_results=settings.retrieval_top_k,
+                where={"file_id": prepared.file_id},
+            )
+            return results["documents"][0] if results["documents"] else []
+        except Exception as e:
+            logger.warning(f"Retrieval failed for dataset {prepared.file_id}: {e}")
+            return []
+
+    async def _build_messages(
+        self, question: str, prepared: PreparedQuery
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a query.
+
+        Args:
+            question: The question to ask
+            prepared: Prepared query state
+
+        Returns:
+            List of chat messages
+        """
+        chunks = await self._retrieve(question, prepared)
+        messages = [{"role": "system", "content": self.SYSTEM_PROMPT}]
+
+        history = prepared.history or {"summary": "", "turns": []}
+        if history["summary"]:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Earlier in this conversation:\n{history['summary']}",
+                }
+            )
+        for turn in history["turns"]:
+            messages.append({"role": "user", "content": turn.question})
+            messages.append({"role": "assistant", "content": turn.answer})
+
+        messages.append(
+            {
+                "role": "user",
+                "content": self._build_prompt(question, prepared.dataset, chunks),
+            }
+        )
+        return messages
 
     async def process_query(
-        self, question: str, context_data: Optional[Dict[str, Any]] = None
+        self,
+        question: str,
+        context_data: Optional[Dict[str, Any]] = None,
+        file_id: Optional[str] = None,
+        session_id: Optional[str] = None,
     ) -> str:
         """
         Process a natural language query about the data.
 
+        Standard questions are answered from the dataset's precomputed
+        insight pack, and other answers are served from the semantic answer
+        cache when the same or a sufficiently similar question was already
+        answered for this dataset version. With a session ID, recent turns of
+        the conversation are sent along, trimmed to the session history token
+        budget.
+
+        Identical questions about the same dataset version that arrive while
+        one is already being answered share that answer instead of making
+        their own call. Follow-ups in a session with history are not shared.
+
         Args:
             question: The question to ask
             context_data: Optional context data about the CSV
+            file_id: Optional ID of the uploaded dataset
+            session_id: Optional conversation session ID
 
         Returns:
             Answer to the question
@@ -40,59 +336,336 @@ class QueryService:
         if not self.client:
             return "OpenAI API key not configured. Please configure the API key to use query functionality."
 
+        if session_id and self.session_store.has_history(session_id):
+            prepared = await self._prepare(question, context_data, file_id, session_id)
+            return await self._complete(question, prepared)
+
+        dataset = self._load_dataset(file_id, context_data)
+
+        async def answer() -> str:
+            prepared = await self._prepare(
+                question, context_data, file_id, dataset=dataset
+            )
+            return await self._complete(question, prepared)
+
+        result = await get_singleflight().do(
+            f"{dataset[1]}|{normalize_question(question)}", answer
+        )
+        if session_id:
+            self.session_store.append_turn(session_id, question, result)
+        return result
+
+    async def _complete(self, question: str, prepared: PreparedQuery) -> str:
+        """
+        Answer a prepared question from the cache or the model.
+
+        Args:
+            question: The question to ask
+            prepared: Prepared query state
+
+        Returns:
+            Answer to the question
+        """
+        if prepared.cached_answer is not None:
+            logger.info(
+                f"Answered from {prepared.answer_source} for query: {question[:50]}..."
+            )
+            self._finish(question, prepared, prepared.cached_answer)
+            return prepared.cached_answer
+
+        messages: List[Dict[str, str]] = []
         try:
-            # Build the prompt with context
-            prompt = self._build_prompt(question, context_data)
+            messages = await self._build_messages(question, prepared)
+            route = get_model_router().route(question, messages)
 
             # Get response from OpenAI
-            response = self.client.chat.completions.create(
-                model=settings.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful data analyst assistant. Answer questions about CSV data in a clear and concise manner.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=1000,
-                temperature=0.7,
-            )
+            admission = get_admission_controller("chat")
+            async with admission.slot():
+                with time_stage("llm_call"):
+                    response = await get_completion_hedger().call(
+                        "completion",
+                        lambda: self.client.chat.completions.create(
+                            model=route.model,
+                            messages=messages,
+                            max_tokens=route.max_tokens,
+                            temperature=route.temperature,
+                        ),
+                        remaining=remaining_time(),
+                        admission=admission,
+                    )
+            if response.usage is not None:
+                record_token_usage(
+                    route.model,
+                    response.usage.prompt_tokens,
+                    response.usage.completion_tokens,
+                )
 
             answer = response.choices[0].message.content
             logger.info(f"Processed query: {question[:50]}...")
+            self._finish(question, prepared, answer)
 
             return answer
 
+        except asyncio.CancelledError:
+            self._record_cancelled("ask", messages)
+            raise
         except Exception as e:
             logger.error(f"Error processing query: {e}")
             raise
 
+    async def process_batch(
+        self,
+        questions: List[str],
+        context_data: Optional[Dict[str, Any]] = None,
+        file_id: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer many questions about one dataset concurrently.
+
+        The dataset profile is loaded once and all questions are embedded in
+        a single request; the model calls then run concurrently, at most
+        ``max_concurrency`` at a time. Results are yielded as they complete.
+
+        Args:
+            questions: Questions to ask
+            context_data: Optional context data about the CSV
+            file_id: Optional ID of the uploaded dataset
+            max_concurrency: Maximum concurrent model calls for this batch
+
+        Yields:
+            Dictionaries with index, question, answer, error and processing_time
+        """
+        dataset = self._load_dataset(file_id, context_data)
+        embeddings: List[Optional[List[float]]] = [None] * len(questions)
+        if self.client and (settings.answer_cache_enabled or file_id):
+            try:
+                embeddings = await EmbeddingService().create_embeddings(questions)
+            except Exception as e:
+                logger.warning(f"Could not embed batch questions: {e}")
+
+        semaphore = asyncio.Semaphore(
+            min(
+                max_concurrency or settings.batch_max_concurrency,
+                settings.batch_max_concurrency,
+            )
+        )
+
+        async def answer(index: int) -> Dict[str, Any]:
+            question = questions[index]
+            start_time = time.perf_counter()
+            result: Dict[str, Any] = {"index": index, "question": question}
+            try:
+                async with semaphore:
+                    if not self.client:
+                        result["answer"] = await self.process_query(question)
+                    else:
+                        prepared = await self._prepare(
+                            question,
+                            context_data,
+                            file_id,
+                            dataset=dataset,
+                            embedding=embeddings[index],
+                        )
+                        result["answer"] = await self._complete(question, prepared)
+                result["error"] = None
+            except Exception as e:
+                result["answer"] = None
+                result["error"] = str(e)
+            result["processing_time"] = time.perf_counter() - start_time
+            return result
+
+        tasks = [asyncio.create_task(answer(i)) for i in range(len(questions))]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream_query(
+        self,
+        question: str,
+        context_data: Optional[Dict[str, Any]] = None,
+        file_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the answer to a query as it is generated.
+
+        Yields ``{"type": "delta", "content": ...}`` events for each completion
+        chunk, followed by one ``{"type": "done", ...}`` event carrying the
+        timing and token usage of the completion.
+
+        Args:
+            question: The question to ask
+            context_data: Optional context data about the CSV
+            file_id: Optional ID of the uploaded dataset
+            session_id: Optional conversation session ID
+
+        Yields:
+            Stream events
+        """
+        start_time = time.perf_counter()
+        if not self.client:
+            yield {
+                "type": "delta",
+                "content": "OpenAI API key not configured. Please configure the API key to use query functionality.",
+            }
+            yield {
+                "type": "done",
+                "model": None,
+                "cached": False,
+                "time_to_first_token": 0.0,
+                "generation_time": 0.0,
+                "usage": None,
+            }
+            return
+
+        prepared = await self._prepare(question, context_data, file_id, session_id)
+        if prepared.cached_answer is not None:
+            self._finish(question, prepared, prepared.cached_answer)
+            yield {"type": "delta", "content": prepared.cached_answer}
+            yield {
+                "type": "done",
+                "model": None,
+                "cached": True,
+                "time_to_first_token": time.perf_counter() - start_time,
+                "generation_time": time.perf_counter() - start_time,
+                "usage": None,
+            }
+            return
+
+        time_to_first_token = None
+        usage = None
+        parts = []
+        messages: List[Dict[str, str]] = []
+        stream = None
+        try:
+            messages = await self._build_messages(question, prepared)
+            route = get_model_router().route(question, messages)
+
+            async def open_stream():
+                stream = await self.client.chat.completions.create(
+                    model=route.model,
+                    messages=messages,
+                    max_tokens=route.max_tokens,
+                    temperature=route.temperature,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                try:
+                    return stream, await anext(stream, None)
+                except BaseException:
+                    await stream.close()
+                    raise
+
+            async def close_stream(opened) -> None:
+                await opened[0].close()
+
+            async def chunks(stream, first_chunk):
+                if first_chunk is not None:
+                    yield first_chunk
+                    async for chunk in stream:
+                        yield chunk
+
+            admission = get_admission_controller("chat")
+            async with admission.slot():
+                # Hedge on time to first chunk, the part a slow upstream stalls
+                llm_start_time = time.perf_counter()
+                stream, first_chunk = await get_completion_hedger().call(
+                    "first_token",
+                    open_stream,
+                    remaining=remaining_time(),
+                    on_discard=close_stream,
+                    admission=admission,
+                )
+                observe_stage("llm_first_token", time.perf_counter() - llm_start_time)
+
+                async for chunk in chunks(stream, first_chunk):
+                    if chunk.usage is not None:
+                        usage = chunk.usage.model_dump()
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        if time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - start_time
+                        parts.append(content)
+                        yield {"type": "delta", "content": content}
+
+            generation_time = time.perf_counter() - start_time
+            observe_stage("llm_stream", time.perf_counter() - llm_start_time)
+            if usage is not None:
+                record_token_usage(
+                    route.model, usage["prompt_tokens"], usage["completion_tokens"]
+                )
+            logger.info(
+                f"Streamed query: {question[:50]}... "
+                f"(first token {time_to_first_token or 0:.2f}s, "
+                f"total {generation_time:.2f}s)"
+            )
+            self._finish(question, prepared, "".join(parts))
+            yield {
+                "type": "done",
+                "model": route.model,
+                "cached": False,
+                "time_to_first_token": time_to_first_token,
+                "generation_time": generation_time,
+                "usage": usage,
+            }
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # The client went away; stop generation upstream
+            if stream is not None:
+                await stream.close()
+            self._record_cancelled("ask_stream", messages, parts)
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming query: {e}")
+            raise
+
+    def _record_cancelled(
+        self,
+        endpoint: str,
+        messages: List[Dict[str, str]],
+        answer_parts: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Record tokens spent on a query that was cancelled before it finished.
+
+        Args:
+            endpoint: Endpoint the query came from
+            messages: Messages already sent to the model, if any
+            answer_parts: Answer chunks already received, if any
+        """
+        texts = [message["content"] for message in messages] + (answer_parts or [])
+        tokens = estimate_tokens(texts) if texts else 0
+        logger.info(f"Query cancelled by client; {tokens} tokens wasted")
+        record_wasted(endpoint, tokens=tokens)
+
     def _build_prompt(
-        self, question: str, context_data: Optional[Dict[str, Any]] = None
+        self,
+        question: str,
+        context_data: Optional[Dict[str, Any]] = None,
+        chunks: Optional[List[str]] = None,
     ) -> str:
         """
-        Build a prompt for the query.
+        Build a prompt for the query within the configured token budget.
 
         Args:
             question: The question to ask
-            context_data: Optional context data
+            context_data: Optional dataset profile or context data
+            chunks: Optional retrieved chunks, most relevant first
 
         Returns:
             Formatted prompt
         """
-        prompt = f"Question: {question}\n\n"
-
-        if context_data:
-            prompt += f"Context:\n"
-            if "headers" in context_data:
-                prompt += f"Columns: {', '.join(context_data['headers'])}\n"
-            if "total_rows" in context_data:
-                prompt += f"Total rows: {context_data['total_rows']}\n"
-            if "summary" in context_data:
-                prompt += f"Data summary: {context_data['summary']}\n"
-
-        prompt += (
-            "\nPlease provide a clear and helpful answer based on the available data."
+        builder = PromptBuilder(settings.prompt_token_budget, settings.openai_model)
+        prompt, stats = builder.build(question, context_data, chunks)
+        logger.info(
+            f"Built prompt: {stats['tokens']}/{stats['token_budget']} tokens, "
+            f"{stats['columns']} columns, {stats['chunks']} chunks, "
+            f"{stats['dropped_units']} units dropped"
         )
-
         return prompt
@@ -0,0 +1,96 @@
+"""Deduplication of identical concurrent calls."""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Flight:
+    """A call in progress and the number of callers waiting on it."""
+
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time, sharing its result.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same task instead of starting their own. The call
+    is cancelled only once every caller waiting on it has been cancelled,
+    so one client disconnecting does not fail the others.
+    """
+
+    def __init__(self):
+        """Initialize the in-flight table."""
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {"calls": 0, "shared": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` for a key, or join the call already in flight for it.
+
+        Args:
+            key: Key identifying identical calls
+            fn: Factory starting the call
+
+        Returns:
+            Result of the shared call
+        """
+        flight = self._flights.get(key)
+        if flight is None or flight.task.cancelling():
+            flight = _Flight(task=asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self._stats["calls"] += 1
+        else:
+            self._stats["shared"] += 1
+            logger.info(f"Joined in-flight call: {key[:80]}")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get deduplication statistics.
+
+        Returns:
+            Calls started, callers that shared a call and calls in flight
+        """
+        return {**self._stats, "in_flight": len(self._flights)}
+
+
+_singleflight: Optional[SingleFlight] = None
+_singleflight_lock = threading.Lock()
+
+
+def get_singleflight() -> SingleFlight:
+    """
+    Get the process-wide in-flight query table.
+
+    Returns:
+        Shared SingleFlight instance
+    """
+    global _singleflight
+    with _singleflight_lock:
+        if _singleflight is None:
+            _singleflight = SingleFlight()
+        return _singleflight
@@ -1,9 +1,16 @@
 """Storage modules for file handling and ChromaDB interfaces."""
 
-from .chroma_client import ChromaClient
+from .chroma_client import ChromaClient, get_chroma_client
+from .file_index import FileIndex
 from .file_storage import FileStorage
+from .row_index import RowIndex
+from .session_store import SessionStore
 
 __all__ = [
     "ChromaClient",
+    "FileIndex",
     "FileStorage",
+    "RowIndex",
+    "SessionStore",
+    "get_chroma_client",
 ]
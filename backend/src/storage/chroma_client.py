@@ -1,21 +1,38 @@
 """ChromaDB client for vector storage and retrieval."""
 
+import threading
+import time
 import uuid
-from typing import List, Dict, Any, Optional
-import chromadb
-from chromadb.config import Settings
+from typing import Callable, Iterable, List, Dict, Any, Optional
 
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.storage.vector_index import get_vector_index
+from src.utils.metrics import time_stage
 
 logger = get_logger(__name__)
 
+# Compaction results shared by all clients in this process
+_compaction_stats: Dict[str, Any] = {
+    "runs": 0,
+    "last_run": None,
+    "last_duration_seconds": None,
+    "orphaned_datasets_removed": 0,
+    "documents_removed": 0,
+    "reclaimed_bytes": 0,
+}
+_compaction_lock = threading.Lock()
+
 
 class ChromaClient:
     """ChromaDB client wrapper for managing vector embeddings."""
 
     def __init__(self):
         """Initialize ChromaDB client."""
+        # Imported here so the app starts without loading chromadb
+        import chromadb
+        from chromadb.config import Settings
+
         self.client = chromadb.PersistentClient(
             path=settings.chroma_db_path,
             settings=Settings(anonymized_telemetry=False, allow_reset=True),
@@ -23,6 +40,11 @@ class ChromaClient:
         self.collection_name = "data_ghost_embeddings"
         self._ensure_collection()
 
+        # Quantized index stores documents added with explicit embeddings
+        self.vector_index = (
+            get_vector_index() if settings.vector_quantization != "none" else None
+        )
+
     def _ensure_collection(self) -> None:
         """Ensure the collection exists."""
         try:
@@ -40,14 +62,19 @@ class ChromaClient:
         documents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
         ids: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None,
     ) -> List[str]:
         """
         Add documents to the collection.
 
+        When vector quantization is enabled and embeddings are provided, the
+        documents go to the quantized index instead of the Chroma collection.
+
         Args:
             documents: List of document texts
             metadatas: List of metadata dictionaries
             ids: List of document IDs (optional)
+            embeddings: Precomputed embedding vectors (optional)
 
         Returns:
             List of document IDs
@@ -59,7 +86,19 @@ class ChromaClient:
             metadatas = [{} for _ in documents]
 
         try:
-            self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+            if embeddings is not None and self.vector_index is not None:
+                with time_stage("chroma_add"):
+                    self.vector_index.add(ids, embeddings, documents, metadatas)
+                logger.info(f"Added {len(documents)} documents to quantized index")
+                return ids
+
+            with time_stage("chroma_add"):
+                self.collection.add(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids,
+                    embeddings=embeddings,
+                )
             logger.info(f"Added {len(documents)} documents to ChromaDB")
             return ids
         except Exception as e:
@@ -68,26 +107,47 @@ class ChromaClient:
 
     def query(
         self,
-        query_texts: List[str],
+        query_texts: Optional[List[str]] = None,
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[List[float]]] = None,
     ) -> Dict[str, Any]:
         """
         Query the collection for similar documents.
 
+        Embedding queries are answered by the quantized index when vector
+        quantization is enabled, with exact re-ranking of the top candidates.
+
         Args:
             query_texts: List of query texts
             n_results: Number of results to return
             where: Filter conditions
+            query_embeddings: List of query embedding vectors
 
         Returns:
             Query results
         """
         try:
-            results = self.collection.query(
-                query_texts=query_texts, n_results=n_results, where=where
+            if query_embeddings is not None and self.vector_index is not None:
+                with time_stage("chroma_query"):
+                    results = self.vector_index.query(
+                        query_embeddings, n_results, where
+                    )
+                logger.info(
+                    f"Queried quantized index for {len(query_embeddings)} embeddings"
+                )
+                return results
+
+            with time_stage("chroma_query"):
+                results = self.collection.query(
+                    query_texts=query_texts,
+                    query_embeddings=query_embeddings,
+                    n_results=n_results,
+                    where=where,
+                )
+            logger.info(
+                f"Queried ChromaDB for {len(query_texts or query_embeddings)} queries"
             )
-            logger.info(f"Queried ChromaDB for {len(query_texts)} texts")
             return results
         except Exception as e:
             logger.error(f"Error querying ChromaDB: {e}")
@@ -102,11 +162,104 @@ class ChromaClient:
         """
         try:
             self.collection.delete(ids=ids)
+            if self.vector_index is not None:
+                self.vector_index.delete(ids)
             logger.info(f"Deleted {len(ids)} documents from ChromaDB")
         except Exception as e:
             logger.error(f"Error deleting documents from ChromaDB: {e}")
             raise
 
+    def delete_where(self, where: Dict[str, Any]) -> int:
+        """
+        Delete all documents matching a metadata filter.
+
+        Args:
+            where: Filter conditions, e.g. {"file_id": "..."}
+
+        Returns:
+            Number of documents deleted
+        """
+        try:
+            matches = self.collection.get(where=where, include=[])
+            deleted = len(matches["ids"])
+            if deleted:
+                self.collection.delete(ids=matches["ids"])
+            if self.vector_index is not None:
+                deleted += self.vector_index.delete_where(where)
+            logger.info(f"Deleted {deleted} documents from ChromaDB matching {where}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting documents from ChromaDB: {e}")
+            raise
+
+    def _indexed_file_ids(self, page_size: int = 1000) -> set[str]:
+        """Collect the distinct file IDs referenced by stored documents."""
+        file_ids = set()
+        offset = 0
+        while True:
+            page = self.collection.get(
+                include=["metadatas"], limit=page_size, offset=offset
+            )
+            for metadata in page["metadatas"]:
+                if metadata and metadata.get("file_id"):
+                    file_ids.add(metadata["file_id"])
+            if len(page["ids"]) < page_size:
+                break
+            offset += page_size
+        if self.vector_index is not None:
+            file_ids |= self.vector_index.metadata_values("file_id")
+        return file_ids
+
+    def compact(
+        self, list_live_file_ids: Callable[[], Iterable[str]]
+    ) -> Dict[str, Any]:
+        """
+        Remove documents of deleted datasets and rebuild the quantized index.
+
+        Indexed file IDs are read before the live ones, so a dataset uploaded
+        while compaction runs is never mistaken for an orphan.
+
+        Args:
+            list_live_file_ids: Returns the file IDs that still exist in
+                file storage
+
+        Returns:
+            Statistics for this compaction run
+        """
+        with _compaction_lock:
+            start_time = time.time()
+            indexed = self._indexed_file_ids()
+            orphaned = indexed - set(list_live_file_ids())
+            removed = sum(
+                self.delete_where({"file_id": file_id}) for file_id in orphaned
+            )
+
+            reclaimed = 0
+            if self.vector_index is not None:
+                reclaimed = self.vector_index.compact()["reclaimed_bytes"]
+
+            duration = time.time() - start_time
+            _compaction_stats["runs"] += 1
+            _compaction_stats["last_run"] = time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.localtime(start_time)
+            )
+            _compaction_stats["last_duration_seconds"] = round(duration, 3)
+            _compaction_stats["orphaned_datasets_removed"] += len(orphaned)
+            _compaction_stats["documents_removed"] += removed
+            _compaction_stats["reclaimed_bytes"] += reclaimed
+
+            logger.info(
+                f"Compacted ChromaDB: {len(orphaned)} orphaned datasets, "
+                f"{removed} documents removed, {reclaimed} bytes reclaimed "
+                f"in {duration:.2f}s"
+            )
+            return {
+                "orphaned_datasets": len(orphaned),
+                "documents_removed": removed,
+                "reclaimed_bytes": reclaimed,
+                "duration_seconds": round(duration, 3),
+            }
+
     def get_collection_info(self) -> Dict[str, Any]:
         """
         Get information about the collection.
@@ -116,11 +269,39 @@ class ChromaClient:
         """
         try:
             count = self.collection.count()
-            return {
+            info = {
                 "name": self.collection_name,
                 "document_count": count,
                 "path": settings.chroma_db_path,
             }
+            if self.vector_index is not None:
+                index_usage = self.vector_index.memory_usage()
+                info["document_count"] += index_usage["live_vectors"]
+                info["vector_index"] = index_usage
+            info["compaction"] = dict(_compaction_stats)
+            return info
         except Exception as e:
             logger.error(f"Error getting collection info: {e}")
             raise
+
+
+_clients: Dict[str, ChromaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_chroma_client() -> ChromaClient:
+    """
+    Get the shared ChromaDB client for the configured ChromaDB path.
+
+    Opening a persistent Chroma client is not thread-safe, and requests, the
+    health prober and the startup warm-up all need one, so it is opened once
+    per process under a lock.
+
+    Returns:
+        Shared ChromaClient instance
+    """
+    path = settings.chroma_db_path
+    with _clients_lock:
+        if path not in _clients:
+            _clients[path] = ChromaClient()
+        return _clients[path]
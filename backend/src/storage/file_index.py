@@ -0,0 +1,307 @@
+"""SQLite index of uploaded file metadata."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "file_index.sqlite3"
+
+_COLUMNS = (
+    "seq, file_id, original_filename, stored_filename, file_path, file_size, "
+    "content_hash, file_extension, uploaded_at, updated_at, metadata, tags"
+)
+
+
+def _row_to_info(row: Tuple) -> Dict[str, Any]:
+    (
+        seq,
+        file_id,
+        original_filename,
+        stored_filename,
+        file_path,
+        file_size,
+        content_hash,
+        file_extension,
+        uploaded_at,
+        updated_at,
+        metadata,
+        tags,
+    ) = row
+    return {
+        "seq": seq,
+        "file_id": file_id,
+        "original_filename": original_filename,
+        "stored_filename": stored_filename,
+        "file_path": file_path,
+        "file_size": file_size,
+        "content_hash": content_hash,
+        "file_extension": file_extension,
+        "upload_timestamp": uploaded_at,
+        "updated_timestamp": updated_at,
+        "metadata": json.loads(metadata),
+        "tags": json.loads(tags),
+    }
+
+
+class FileIndex:
+    """
+    Metadata index of uploaded files.
+
+    Files are looked up by primary key instead of globbing the upload
+    directory, listed by cursor in upload order, and storage totals are
+    kept in a one-row table updated in the same transaction as each change.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize file index.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_id TEXT NOT NULL UNIQUE,
+                original_filename TEXT NOT NULL,
+                stored_filename TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                file_extension TEXT NOT NULL,
+                uploaded_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                metadata TEXT NOT NULL DEFAULT '{}',
+                tags TEXT NOT NULL DEFAULT '[]'
+            );
+            CREATE TABLE IF NOT EXISTS totals (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_files INTEGER NOT NULL,
+                total_size INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO totals (id, total_files, total_size) VALUES (1, 0, 0);
+            """)
+        self._db.commit()
+
+    def add(self, file_info: Dict[str, Any]) -> None:
+        """
+        Add a saved file to the index.
+
+        Args:
+            file_info: File information returned by FileStorage
+        """
+        metadata = file_info.get("metadata") or {}
+        timestamp = file_info["upload_timestamp"]
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO files (file_id, original_filename, stored_filename, "
+                "file_path, file_size, content_hash, file_extension, uploaded_at, "
+                "updated_at, metadata, tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file_info["file_id"],
+                    file_info["original_filename"],
+                    file_info["stored_filename"],
+                    file_info["file_path"],
+                    file_info["file_size"],
+                    file_info["content_hash"],
+                    file_info["file_extension"],
+                    timestamp,
+                    timestamp,
+                    json.dumps(metadata, default=str),
+                    json.dumps(metadata.get("tags") or []),
+                ),
+            )
+            self._db.execute(
+                "UPDATE totals SET total_files = total_files + 1, "
+                "total_size = total_size + ? WHERE id = 1",
+                (file_info["file_size"],),
+            )
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a file by ID.
+
+        Args:
+            file_id: File ID
+
+        Returns:
+            File information if indexed, None otherwise
+        """
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_COLUMNS} FROM files WHERE file_id = ?", (file_id,)
+            ).fetchone()
+        return _row_to_info(row) if row else None
+
+    def update(self, file_id: str, file_size: int, content_hash: str) -> None:
+        """
+        Record new contents of an indexed file.
+
+        Args:
+            file_id: File ID
+            file_size: New size in bytes
+            content_hash: New SHA-256 of the contents
+        """
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT file_size FROM files WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            if row is None:
+                return
+            self._db.execute(
+                "UPDATE files SET file_size = ?, content_hash = ?, updated_at = ? "
+                "WHERE file_id = ?",
+                (file_size, content_hash, datetime.now().isoformat(), file_id),
+            )
+            self._db.execute(
+                "UPDATE totals SET total_size = total_size + ? WHERE id = 1",
+                (file_size - row[0],),
+            )
+
+    def remove(self, file_id: str) -> bool:
+        """
+        Remove a file from the index.
+
+        Args:
+            file_id: File ID
+
+        Returns:
+            True if the file was indexed, False otherwise
+        """
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT file_size FROM files WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._db.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+            self._db.execute(
+                "UPDATE totals SET total_files = total_files - 1, "
+                "total_size = total_size - ? WHERE id = 1",
+                (row[0],),
+            )
+            return True
+
+    def list_page(
+        self, limit: Optional[int] = None, cursor: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        List files, newest first.
+
+        Args:
+            limit: Maximum files to return (all if None)
+            cursor: Cursor returned by a previous call
+
+        Returns:
+            Tuple of (files, cursor for the next page or None)
+        """
+        query = f"SELECT {_COLUMNS} FROM files"
+        params: List[Any] = []
+        if cursor is not None:
+            query += " WHERE seq < ?"
+            params.append(cursor)
+        query += " ORDER BY seq DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        files = [_row_to_info(row) for row in rows[:limit]]
+        next_cursor = (
+            files[-1]["seq"] if limit is not None and len(rows) > limit else None
+        )
+        return files, next_cursor
+
+    def file_ids(self) -> set[str]:
+        """Get the IDs of all indexed files."""
+        with self._lock:
+            return {row[0] for row in self._db.execute("SELECT file_id FROM files")}
+
+    def totals(self) -> Dict[str, int]:
+        """Get the number and total size of indexed files."""
+        with self._lock:
+            total_files, total_size = self._db.execute(
+                "SELECT total_files, total_size FROM totals WHERE id = 1"
+            ).fetchone()
+        return {"total_files": total_files, "total_size": total_size}
+
+    def is_empty(self) -> bool:
+        """Whether no file has been indexed."""
+        return self.totals()["total_files"] == 0
+
+    def backfill(self, upload_dir: str) -> int:
+        """
+        Index files saved before the index existed.
+
+        Args:
+            upload_dir: Upload directory to scan
+
+        Returns:
+            Number of files added
+        """
+        indexed = self.file_ids()
+        added = 0
+        for file_path in sorted(Path(upload_dir).glob("*_*.*")):
+            file_id = file_path.stem.rsplit("_", 1)[-1]
+            if not file_path.is_file() or file_id in indexed:
+                continue
+            try:
+                uuid.UUID(file_id)
+            except ValueError:
+                continue  # not an upload, e.g. the index database itself
+            content = file_path.read_bytes()
+            modified = datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+            self.add(
+                {
+                    "file_id": file_id,
+                    "original_filename": file_path.name,
+                    "stored_filename": file_path.name,
+                    "file_path": str(file_path),
+                    "file_size": len(content),
+                    "content_hash": hashlib.sha256(content).hexdigest(),
+                    "file_extension": file_path.suffix.lstrip("."),
+                    "upload_timestamp": modified,
+                }
+            )
+            added += 1
+        if added:
+            logger.info(f"Indexed {added} existing files in {upload_dir}")
+        return added
+
+
+_file_indexes: Dict[str, FileIndex] = {}
+_file_indexes_lock = threading.Lock()
+
+
+def get_file_index(upload_dir: str) -> FileIndex:
+    """
+    Get the shared file index of an upload directory.
+
+    Files already in the directory are indexed the first time it is opened.
+
+    Args:
+        upload_dir: Upload directory
+
+    Returns:
+        Shared FileIndex instance
+    """
+    with _file_indexes_lock:
+        if upload_dir not in _file_indexes:
+            index = FileIndex(str(Path(upload_dir) / INDEX_FILENAME))
+            if index.is_empty():
+                index.backfill(upload_dir)
+            _file_indexes[upload_dir] = index
+        return _file_indexes[upload_dir]
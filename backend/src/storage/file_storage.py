@@ -1,5 +1,7 @@
 """File storage utilities for handling uploaded files."""
 
+import hashlib
+import json
 import os
 import shutil
 import uuid
@@ -9,7 +11,9 @@ from typing import Optional, Dict, Any
 
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.storage.file_index import get_file_index
 from src.utils.file_utils import ensure_upload_directory, sanitize_filename
+from src.utils.metrics import time_stage
 
 logger = get_logger(__name__)
 
@@ -20,6 +24,7 @@ class FileStorage:
     def __init__(self):
         """Initialize file storage."""
         self.upload_dir = ensure_upload_directory()
+        self.index = get_file_index(self.upload_dir)
         logger.info(f"File storage initialized at: {self.upload_dir}")
 
     def save_uploaded_file(
@@ -51,7 +56,7 @@ class FileStorage:
 
         try:
             # Save file
-            with open(file_path, "wb") as f:
+            with time_stage("file_save"), open(file_path, "wb") as f:
                 f.write(file_content)
 
             # Get file info
@@ -62,10 +67,12 @@ class FileStorage:
                 "stored_filename": new_filename,
                 "file_path": str(file_path),
                 "file_size": file_size,
+                "content_hash": hashlib.sha256(file_content).hexdigest(),
                 "file_extension": file_extension.lstrip("."),
                 "upload_timestamp": datetime.now().isoformat(),
                 "metadata": metadata or {},
             }
+            self.index.add(file_info)
 
             logger.info(
                 f"Saved file: {original_filename} -> {new_filename} ({file_size} bytes)"
@@ -86,15 +93,131 @@ class FileStorage:
         Returns:
             File path if found, None otherwise
         """
-        # This is a simplified implementation
-        # In a real application, you'd want to maintain a database of file mappings
-        for file_path in Path(self.upload_dir).glob(f"*_{file_id}.*"):
-            return str(file_path)
-        return None
+        file_info = self.index.get(file_id)
+        return file_info["file_path"] if file_info else None
+
+    def get_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored information of a file.
+
+        Args:
+            file_id: File ID to look up
+
+        Returns:
+            File information (path, size, hash, timestamps, metadata, tags)
+            if found, None otherwise
+        """
+        return self.index.get(file_id)
+
+    def append_to_file(self, file_id: str, content: bytes) -> Dict[str, Any]:
+        """
+        Append bytes to a stored file.
+
+        A newline is written first if the file does not end with one. The
+        content hash is chained (the SHA-256 of the previous hash and of the
+        appended bytes) so it changes with every append without re-reading
+        the whole file.
+
+        Args:
+            file_id: File ID
+            content: Bytes to append
+
+        Returns:
+            Updated file information, with ``append_offset`` set to where the
+            appended bytes start
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        file_info = self.index.get(file_id)
+        if file_info is None:
+            raise FileNotFoundError(f"File {file_id} not found")
+
+        with time_stage("file_save"), open(file_info["file_path"], "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                last_byte = f.read(1)
+                f.seek(end)
+                if last_byte != b"\n":
+                    f.write(b"\n")
+                    end += 1
+            f.write(content)
+            file_size = f.tell()
+
+        content_hash = hashlib.sha256(
+            f"{file_info['content_hash']}:"
+            f"{hashlib.sha256(content).hexdigest()}".encode()
+        ).hexdigest()
+        self.index.update(file_id, file_size, content_hash)
+        logger.info(f"Appended {len(content)} bytes to file {file_id}")
+        return {
+            **file_info,
+            "file_size": file_size,
+            "content_hash": content_hash,
+            "append_offset": end,
+        }
+
+    def get_sidecar_dir(self, file_id: str, create: bool = False) -> Path:
+        """
+        Get the directory holding derived artifacts for a file.
+
+        Profiles, indexes and other sidecars live under
+        ``<upload_dir>/sidecars/<file_id>`` so they can be removed together
+        with the uploaded file.
+
+        Args:
+            file_id: File ID
+            create: Whether to create the directory if missing
+
+        Returns:
+            Sidecar directory path
+        """
+        sidecar_dir = Path(self.upload_dir) / "sidecars" / file_id
+        if create:
+            sidecar_dir.mkdir(parents=True, exist_ok=True)
+        return sidecar_dir
+
+    def save_profile(self, file_id: str, profile: Dict[str, Any]) -> None:
+        """
+        Persist the dataset profile for a file.
+
+        Args:
+            file_id: File ID
+            profile: Profile dictionary (column stats, summary, ...)
+        """
+        profile_path = self.get_sidecar_dir(file_id, create=True) / "profile.json"
+        tmp_path = profile_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(profile))
+        os.replace(tmp_path, profile_path)
+
+    def load_profile(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the dataset profile for a file.
+
+        Args:
+            file_id: File ID
+
+        Returns:
+            Profile dictionary if one was saved, None otherwise
+        """
+        profile_path = self.get_sidecar_dir(file_id) / "profile.json"
+        if not profile_path.exists():
+            return None
+        return json.loads(profile_path.read_text())
+
+    def list_file_ids(self) -> set[str]:
+        """
+        List the IDs of all stored files.
+
+        Returns:
+            Set of file IDs
+        """
+        return self.index.file_ids()
 
     def delete_file(self, file_id: str) -> bool:
         """
-        Delete a file by its ID.
+        Delete a file and its sidecars by its ID.
 
         Args:
             file_id: File ID to delete
@@ -106,6 +229,8 @@ class FileStorage:
         if file_path and Path(file_path).exists():
             try:
                 Path(file_path).unlink()
+                self.index.remove(file_id)
+                shutil.rmtree(self.get_sidecar_dir(file_id), ignore_errors=True)
                 logger.info(f"Deleted file: {file_path}")
                 return True
             except Exception as e:
@@ -113,32 +238,36 @@ class FileStorage:
                 return False
         return False
 
-    def list_files(self) -> list[Dict[str, Any]]:
+    def list_files(
+        self, limit: Optional[int] = None, cursor: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        List all stored files.
+        List stored files, newest first.
+
+        Args:
+            limit: Maximum files to return (all if None)
+            cursor: ``next_cursor`` from a previous page
 
         Returns:
-            List of file information dictionaries
-        """
-        files = []
-        for file_path in Path(self.upload_dir).glob("*"):
-            if file_path.is_file():
-                try:
-                    stat = file_path.stat()
-                    files.append(
-                        {
-                            "filename": file_path.name,
-                            "size": stat.st_size,
-                            "modified": datetime.fromtimestamp(
-                                stat.st_mtime
-                            ).isoformat(),
-                            "path": str(file_path),
-                        }
-                    )
-                except Exception as e:
-                    logger.warning(f"Error getting file info for {file_path}: {e}")
-
-        return files
+            Dictionary with the files and the cursor of the next page
+        """
+        files, next_cursor = self.index.list_page(limit, cursor)
+        return {
+            "files": [
+                {
+                    "file_id": info["file_id"],
+                    "filename": info["stored_filename"],
+                    "original_filename": info["original_filename"],
+                    "size": info["file_size"],
+                    "modified": info["updated_timestamp"],
+                    "uploaded": info["upload_timestamp"],
+                    "path": info["file_path"],
+                    "tags": info["tags"],
+                }
+                for info in files
+            ],
+            "next_cursor": next_cursor,
+        }
 
     def get_storage_info(self) -> Dict[str, Any]:
         """
@@ -147,17 +276,12 @@ class FileStorage:
         Returns:
             Storage information dictionary
         """
-        total_files = 0
-        total_size = 0
-
-        for file_path in Path(self.upload_dir).glob("*"):
-            if file_path.is_file():
-                total_files += 1
-                total_size += file_path.stat().st_size
+        totals = self.index.totals()
+        total_size = totals["total_size"]
 
         return {
             "upload_directory": self.upload_dir,
-            "total_files": total_files,
+            "total_files": totals["total_files"],
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
         }
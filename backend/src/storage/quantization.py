@@ -0,0 +1,429 @@
+"""Vector quantizers for compact embedding storage.
+
+Two codecs are provided:
+
+- ``ScalarQuantizer`` maps every float32 dimension onto one int8 code using a
+  per-dimension range learned from training vectors (4x smaller).
+- ``ProductQuantizer`` splits vectors into ``m`` sub-vectors and stores one
+  uint8 centroid index per sub-vector (``4 * dim / m`` times smaller).
+
+Both expose the same ``train`` / ``encode`` / ``decode`` / ``score`` interface,
+where ``score`` returns approximate inner products between a query and a
+block of codes without decoding the block back to float32.
+"""
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Rows processed per chunk when scoring codes, bounds temporary float memory.
+SCORE_CHUNK_ROWS = 65536
+
+
+class ScalarQuantizer:
+    """Per-dimension int8 scalar quantizer."""
+
+    method = "int8"
+
+    def __init__(self, dim: int):
+        """
+        Initialize scalar quantizer.
+
+        Args:
+            dim: Vector dimensionality
+        """
+        self.dim = dim
+        self.lower: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the quantizer has learned its ranges."""
+        return self.lower is not None
+
+    @property
+    def code_size(self) -> int:
+        """Number of bytes used per encoded vector."""
+        return self.dim
+
+    @property
+    def code_dtype(self) -> np.dtype:
+        """Numpy dtype of the encoded vectors."""
+        return np.dtype(np.int8)
+
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Learn per-dimension value ranges.
+
+        Args:
+            vectors: Training vectors of shape (n, dim)
+        """
+        lower = vectors.min(axis=0).astype(np.float32)
+        upper = vectors.max(axis=0).astype(np.float32)
+        self.lower = lower
+        self.scale = np.maximum(upper - lower, 1e-12).astype(np.float32) / 255.0
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encode float vectors into int8 codes.
+
+        Args:
+            vectors: Vectors of shape (n, dim)
+
+        Returns:
+            Codes of shape (n, dim)
+        """
+        levels = np.rint((vectors - self.lower) / self.scale)
+        return (np.clip(levels, 0, 255) - 128).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Reconstruct approximate float vectors from codes.
+
+        Args:
+            codes: Codes of shape (n, dim)
+
+        Returns:
+            Reconstructed vectors of shape (n, dim)
+        """
+        return (codes.astype(np.float32) + 128.0) * self.scale + self.lower
+
+    def score(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Approximate inner products between a query and encoded vectors.
+
+        Args:
+            query: Query vector of shape (dim,)
+            codes: Codes of shape (n, dim)
+
+        Returns:
+            Approximate scores of shape (n,)
+        """
+        scaled_query = (query * self.scale).astype(np.float32)
+        offset = float(query @ self.lower) + 128.0 * float(scaled_query.sum())
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), SCORE_CHUNK_ROWS):
+            block = codes[start : start + SCORE_CHUNK_ROWS].astype(np.float32)
+            scores[start : start + len(block)] = block @ scaled_query + offset
+        return scores
+
+    def nbytes(self) -> int:
+        """Bytes held by the trained parameters."""
+        if not self.is_trained:
+            return 0
+        return self.lower.nbytes + self.scale.nbytes
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays needed to restore the trained quantizer."""
+        return {"lower": self.lower, "scale": self.scale}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restore a trained quantizer from ``state()`` output."""
+        self.lower = state["lower"].astype(np.float32)
+        self.scale = state["scale"].astype(np.float32)
+
+
+class ProductQuantizer:
+    """Product quantizer with 256 centroids per sub-space."""
+
+    method = "pq"
+
+    def __init__(
+        self,
+        dim: int,
+        n_subvectors: int,
+        n_iterations: int = 20,
+        max_train_vectors: int = 10000,
+        seed: int = 0,
+    ):
+        """
+        Initialize product quantizer.
+
+        Args:
+            dim: Vector dimensionality
+            n_subvectors: Number of sub-vectors, must divide ``dim``
+            n_iterations: k-means iterations per sub-space
+            max_train_vectors: Training sample size cap
+            seed: Random seed for centroid initialisation
+        """
+        if dim % n_subvectors != 0:
+            raise ValueError(
+                f"Vector dimension {dim} is not divisible by {n_subvectors} sub-vectors"
+            )
+        self.dim = dim
+        self.n_subvectors = n_subvectors
+        self.sub_dim = dim // n_subvectors
+        self.n_iterations = n_iterations
+        self.max_train_vectors = max_train_vectors
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the codebooks have been learned."""
+        return self.centroids is not None
+
+    @property
+    def code_size(self) -> int:
+        """Number of bytes used per encoded vector."""
+        return self.n_subvectors
+
+    @property
+    def code_dtype(self) -> np.dtype:
+        """Numpy dtype of the encoded vectors."""
+        return np.dtype(np.uint8)
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.reshape(len(vectors), self.n_subvectors, self.sub_dim)
+
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Learn one k-means codebook per sub-space.
+
+        Args:
+            vectors: Training vectors of shape (n, dim)
+        """
+        rng = np.random.default_rng(self.seed)
+        if len(vectors) > self.max_train_vectors:
+            vectors = vectors[
+                rng.choice(len(vectors), self.max_train_vectors, replace=False)
+            ]
+        n_centroids = min(256, len(vectors))
+        subspaces = self._split(vectors.astype(np.float32))
+        centroids = np.zeros((self.n_subvectors, 256, self.sub_dim), dtype=np.float32)
+
+        for m in range(self.n_subvectors):
+            data = subspaces[:, m, :]
+            codebook = data[rng.choice(len(data), n_centroids, replace=False)].copy()
+            for _ in range(self.n_iterations):
+                assignment = self._nearest(data, codebook)
+                counts = np.bincount(assignment, minlength=n_centroids)
+                sums = np.stack(
+                    [
+                        np.bincount(
+                            assignment, weights=data[:, d], minlength=n_centroids
+                        )
+                        for d in range(self.sub_dim)
+                    ],
+                    axis=1,
+                )
+                filled = counts > 0
+                codebook[filled] = sums[filled] / counts[filled, None]
+                # Re-seed empty clusters from random training points
+                empty = np.flatnonzero(~filled)
+                if len(empty):
+                    codebook[empty] = data[rng.choice(len(data), len(empty))]
+            centroids[m, :n_centroids] = codebook
+            if n_centroids < 256:
+                centroids[m, n_centroids:] = codebook[0]
+
+        self.centroids = centroids
+
+    @staticmethod
+    def _nearest(data: np.ndarray, codebook: np.ndarray) -> np.ndarray:
+        distances = (
+            (data**2).sum(axis=1, keepdims=True)
+            - 2.0 * data @ codebook.T
+            + (codebook**2).sum(axis=1)[None, :]
+        )
+        return distances.argmin(axis=1)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Encode float vectors into per-sub-space centroid indices.
+
+        Args:
+            vectors: Vectors of shape (n, dim)
+
+        Returns:
+            Codes of shape (n, n_subvectors)
+        """
+        subspaces = self._split(vectors.astype(np.float32))
+        codes = np.empty((len(vectors), self.n_subvectors), dtype=np.uint8)
+        for m in range(self.n_subvectors):
+            codes[:, m] = self._nearest(subspaces[:, m, :], self.centroids[m])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Reconstruct approximate float vectors from codes.
+
+        Args:
+            codes: Codes of shape (n, n_subvectors)
+
+        Returns:
+            Reconstructed vectors of shape (n, dim)
+        """
+        parts = self.centroids[np.arange(self.n_subvectors)[None, :], codes]
+        return parts.reshape(len(codes), self.dim)
+
+    def score(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Approximate inner products using asymmetric distance tables.
+
+        Args:
+            query: Query vector of shape (dim,)
+            codes: Codes of shape (n, n_subvectors)
+
+        Returns:
+            Approximate scores of shape (n,)
+        """
+        sub_queries = query.astype(np.float32).reshape(self.n_subvectors, self.sub_dim)
+        table = np.einsum("md,mkd->mk", sub_queries, self.centroids)
+        subspace_index = np.arange(self.n_subvectors)[None, :]
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), SCORE_CHUNK_ROWS):
+            block = codes[start : start + SCORE_CHUNK_ROWS]
+            scores[start : start + len(block)] = table[subspace_index, block].sum(
+                axis=1
+            )
+        return scores
+
+    def nbytes(self) -> int:
+        """Bytes held by the trained codebooks."""
+        return self.centroids.nbytes if self.is_trained else 0
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays needed to restore the trained quantizer."""
+        return {"centroids": self.centroids}
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restore a trained quantizer from ``state()`` output."""
+        self.centroids = state["centroids"].astype(np.float32)
+
+
+def create_quantizer(method: str, dim: int, pq_subvectors: int = 96):
+    """
+    Create a quantizer for the given method.
+
+    Args:
+        method: Quantization method ("int8" or "pq")
+        dim: Vector dimensionality
+        pq_subvectors: Number of sub-vectors for product quantization
+
+    Returns:
+        Untrained quantizer instance
+    """
+    if method == "int8":
+        return ScalarQuantizer(dim)
+    if method == "pq":
+        return ProductQuantizer(dim, pq_subvectors)
+    raise ValueError(f"Unknown vector quantization method: {method}")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise vectors row-wise so inner product equals cosine similarity."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def benchmark_quantization(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    method: str = "int8",
+    rerank_factor: int = 4,
+    pq_subvectors: int = 96,
+) -> Dict[str, Any]:
+    """
+    Measure memory saved and recall lost by a quantization method.
+
+    Exact cosine top-k over float32 vectors is the ground truth. Recall is
+    reported both for the raw quantized ranking and after exact float
+    re-ranking of the top ``k * rerank_factor`` candidates.
+
+    Args:
+        vectors: Benchmark corpus of shape (n, dim)
+        queries: Benchmark queries of shape (q, dim)
+        k: Number of neighbours to evaluate
+        method: Quantization method ("int8" or "pq")
+        rerank_factor: Candidate multiplier for exact re-ranking
+        pq_subvectors: Number of sub-vectors for product quantization
+
+    Returns:
+        Benchmark report
+    """
+    vectors = normalize(vectors)
+    queries = normalize(queries)
+    quantizer = create_quantizer(method, vectors.shape[1], pq_subvectors)
+
+    start_time = time.perf_counter()
+    quantizer.train(vectors)
+    codes = quantizer.encode(vectors)
+    build_time = time.perf_counter() - start_time
+
+    n_candidates = min(len(vectors), k * rerank_factor)
+    raw_hits = 0
+    reranked_hits = 0
+    start_time = time.perf_counter()
+    for query in queries:
+        truth = set(np.argsort(-(vectors @ query))[:k].tolist())
+        approx = quantizer.score(query, codes)
+        candidates = np.argpartition(-approx, n_candidates - 1)[:n_candidates]
+        raw_top = candidates[np.argsort(-approx[candidates])][:k]
+        exact = vectors[candidates] @ query
+        reranked_top = candidates[np.argsort(-exact)][:k]
+        raw_hits += len(truth.intersection(raw_top.tolist()))
+        reranked_hits += len(truth.intersection(reranked_top.tolist()))
+    search_time = time.perf_counter() - start_time
+
+    float_bytes = vectors.nbytes
+    quantized_bytes = codes.nbytes + quantizer.nbytes()
+    total = k * len(queries)
+    return {
+        "method": method,
+        "vectors": len(vectors),
+        "queries": len(queries),
+        "dimension": vectors.shape[1],
+        "k": k,
+        "rerank_factor": rerank_factor,
+        "float32_bytes": float_bytes,
+        "quantized_bytes": quantized_bytes,
+        "memory_saved_bytes": float_bytes - quantized_bytes,
+        "compression_ratio": round(float_bytes / max(quantized_bytes, 1), 2),
+        "recall_at_k": round(raw_hits / total, 4),
+        "recall_at_k_reranked": round(reranked_hits / total, 4),
+        "recall_lost": round(1.0 - reranked_hits / total, 4),
+        "build_seconds": round(build_time, 4),
+        "search_seconds": round(search_time, 4),
+    }
+
+
+def make_benchmark_set(
+    n_vectors: int = 20000,
+    n_queries: int = 100,
+    dim: int = 1536,
+    n_clusters: int = 200,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Generate a clustered synthetic benchmark set resembling text embeddings.
+
+    Args:
+        n_vectors: Number of corpus vectors
+        n_queries: Number of query vectors
+        dim: Vector dimensionality
+        n_clusters: Number of topic clusters
+        seed: Random seed
+
+    Returns:
+        Tuple of (corpus vectors, query vectors)
+    """
+    rng = np.random.default_rng(seed)
+    centers = normalize(rng.standard_normal((n_clusters, dim)))
+    labels = rng.integers(0, n_clusters, n_vectors + n_queries)
+    noise = rng.standard_normal((n_vectors + n_queries, dim)) * (0.6 / np.sqrt(dim))
+    data = normalize(centers[labels] + noise.astype(np.float32))
+    return data[:n_vectors], data[n_vectors:]
+
+
+if __name__ == "__main__":
+    corpus, benchmark_queries = make_benchmark_set()
+    for quantization_method in ("int8", "pq"):
+        report = benchmark_quantization(
+            corpus, benchmark_queries, method=quantization_method
+        )
+        print(json.dumps(report))
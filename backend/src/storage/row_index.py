@@ -0,0 +1,259 @@
+"""Packed byte-offset index of CSV row boundaries for random-access reads."""
+
+import csv
+import io
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.cancellation import OperationCancelled
+
+# Header: magic, format version, bytes per offset
+_MAGIC = b"ROWIDX"
+_VERSION = 1
+_HEADER = struct.Struct("<6sBB")
+
+_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _record_starts(
+    file: BinaryIO, start: int = 0, cancel_event: Optional[threading.Event] = None
+) -> Tuple[np.ndarray, int]:
+    """
+    Find the byte offset at which every CSV record starts.
+
+    Newlines inside quoted fields do not end a record. A chunk with no
+    quote characters (the common case) is scanned with numpy alone; chunks
+    containing quotes track quote parity line by line.
+
+    Args:
+        file: Binary file, scanned from ``start`` to its end
+        start: Offset of the first record to scan
+        cancel_event: Event that aborts the scan with OperationCancelled
+
+    Returns:
+        Record start offsets (the first is always ``start``) and the end offset
+    """
+    starts: List[np.ndarray] = [np.full(1, start, dtype=np.uint64)]
+    in_quotes = False
+    position = start
+    file.seek(start)
+    while chunk := file.read(_CHUNK_SIZE):
+        if cancel_event is not None and cancel_event.is_set():
+            raise OperationCancelled("Row indexing was cancelled")
+        newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+        if not in_quotes and b'"' not in chunk:
+            ends = newlines
+        else:
+            ends_list = []
+            line_start = 0
+            for newline in newlines.tolist():
+                if chunk.count(b'"', line_start, newline) % 2:
+                    in_quotes = not in_quotes
+                if not in_quotes:
+                    ends_list.append(newline)
+                line_start = newline + 1
+            if chunk.count(b'"', line_start) % 2:
+                in_quotes = not in_quotes
+            ends = np.asarray(ends_list, dtype=np.int64)
+        starts.append(ends.astype(np.uint64) + np.uint64(position + 1))
+        position += len(chunk)
+
+    offsets = np.concatenate(starts)
+    # A trailing newline starts no record
+    if len(offsets) > 1 and offsets[-1] == position:
+        offsets = offsets[:-1]
+    return offsets, position
+
+
+def first_record_end(data: bytes) -> int:
+    """
+    Find where the first CSV record of some bytes ends.
+
+    Args:
+        data: CSV bytes, such as an upload starting with a header row
+
+    Returns:
+        Offset of the second record, or the length of the data if there is
+        only one record
+    """
+    starts, end = _record_starts(io.BytesIO(data))
+    return int(starts[1]) if len(starts) > 1 else end
+
+
+class RowIndex:
+    """
+    Row-boundary index of a CSV file, stored as a packed array of offsets.
+
+    Entry ``k`` is the byte offset where record ``k`` starts (record 0 is the
+    header) and a final entry holds the end of the data, so rows ``i`` to
+    ``j`` span ``[entry i + 1, entry j + 1)``. Offsets take 4 bytes each for
+    files under 4 GiB and 8 bytes otherwise. Reading a page seeks straight
+    to its entries and its bytes, so the cost does not depend on where the
+    page is in the file.
+    """
+
+    def __init__(self, index_path: str):
+        """
+        Open an index written by ``build``.
+
+        Args:
+            index_path: Path of the index file
+        """
+        self.index_path = index_path
+        self._load()
+
+    def _load(self) -> None:
+        """Read the index header and count its entries."""
+        index_path = self.index_path
+        with open(index_path, "rb") as file:
+            magic, version, itemsize = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a row index: {index_path}")
+        self.itemsize = itemsize
+        self.typecode = "I" if itemsize == 4 else "Q"
+        entries = (os.path.getsize(index_path) - _HEADER.size) // itemsize
+        # Entries are the header, the data rows and the end offset
+        self.row_count = max(entries - 2, 0)
+
+    @classmethod
+    def build(
+        cls,
+        csv_path: str,
+        index_path: str,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> "RowIndex":
+        """
+        Scan a CSV file and write its row index.
+
+        Args:
+            csv_path: Path of the CSV file
+            index_path: Path the index is written to
+            cancel_event: Event that aborts the scan with OperationCancelled
+
+        Returns:
+            The opened index
+        """
+        with open(csv_path, "rb") as file:
+            starts, file_size = _record_starts(file, 0, cancel_event)
+        itemsize = 4 if file_size < 2**32 else 8
+        offsets = array("I" if itemsize == 4 else "Q")
+        offsets.frombytes(
+            np.append(starts, np.uint64(file_size)).astype(f"<u{itemsize}").tobytes()
+        )
+
+        tmp_path = Path(index_path).with_suffix(".tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, itemsize))
+            file.write(offsets.tobytes())
+        os.replace(tmp_path, index_path)
+        return cls(index_path)
+
+    def extend(
+        self,
+        csv_path: str,
+        start: int,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Index rows appended to the CSV file, scanning only the new bytes.
+
+        The end offset entry is replaced by the start offsets of the new
+        rows and the new end. An index whose offsets no longer fit is
+        rebuilt from scratch.
+
+        Args:
+            csv_path: Path of the indexed CSV file
+            start: Offset where the first appended row starts
+            cancel_event: Event that aborts the scan with OperationCancelled
+
+        Returns:
+            Number of rows added
+        """
+        with open(csv_path, "rb") as file:
+            starts, file_size = _record_starts(file, start, cancel_event)
+        if len(starts) and starts[-1] == file_size:
+            starts = starts[:-1]
+        if file_size >= 2 ** (8 * self.itemsize):
+            previous = self.row_count
+            RowIndex.build(csv_path, self.index_path, cancel_event)
+            self._load()
+            return self.row_count - previous
+
+        entries = np.append(starts, np.uint64(file_size))
+        with open(self.index_path, "r+b") as file:
+            # Overwrite the old end offset
+            file.seek(_HEADER.size + (self.row_count + 1) * self.itemsize)
+            file.write(entries.astype(f"<u{self.itemsize}").tobytes())
+            file.truncate()
+        self.row_count += len(starts)
+        return len(starts)
+
+    def _entries(self, start: int, count: int) -> array:
+        """Read ``count`` consecutive offsets starting at entry ``start``."""
+        entries = array(self.typecode)
+        with open(self.index_path, "rb") as file:
+            file.seek(_HEADER.size + start * self.itemsize)
+            entries.frombytes(file.read(count * self.itemsize))
+        return entries
+
+    def byte_range(self, start: int, stop: int) -> Tuple[int, int]:
+        """
+        Get the bytes spanned by a range of records.
+
+        Args:
+            start: First record (0 is the header)
+            stop: Record after the last one
+
+        Returns:
+            Start and end byte offsets
+        """
+        entries = self._entries(start, 1)
+        end = self._entries(stop, 1) if stop > start else entries
+        return entries[0], end[0]
+
+    def read_records(self, csv_path: str, start: int, stop: int) -> List[List[str]]:
+        """
+        Read and parse a range of records from the CSV file.
+
+        Args:
+            csv_path: Path of the indexed CSV file
+            start: First record (0 is the header)
+            stop: Record after the last one
+
+        Returns:
+            Parsed records
+        """
+        if stop <= start:
+            return []
+        begin, end = self.byte_range(start, stop)
+        with open(csv_path, "rb") as file:
+            file.seek(begin)
+            text = file.read(end - begin).decode("utf-8")
+        return list(csv.reader(io.StringIO(text, newline="")))
+
+    def read_header(self, csv_path: str) -> List[str]:
+        """Read the header row of the CSV file."""
+        records = self.read_records(csv_path, 0, 1)
+        return records[0] if records else []
+
+    def read_rows(self, csv_path: str, offset: int, limit: int) -> List[List[str]]:
+        """
+        Read a page of data rows.
+
+        Args:
+            csv_path: Path of the indexed CSV file
+            offset: Index of the first data row
+            limit: Maximum rows to read
+
+        Returns:
+            Data rows, fewer than ``limit`` at the end of the file
+        """
+        offset = min(max(offset, 0), self.row_count)
+        stop = min(offset + limit, self.row_count)
+        return self.read_records(csv_path, offset + 1, stop + 1)
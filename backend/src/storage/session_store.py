@@ -0,0 +1,286 @@
+"""Conversation session store with an in-memory LRU over SQLite."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.utils.token_counter import estimate_tokens
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SessionTurn:
+    """One question/answer exchange in a session."""
+
+    question: str
+    answer: str
+    tokens: int
+    created_at: float
+
+
+@dataclass
+class SessionState:
+    """Recent turns of a session plus a rolling summary of older ones."""
+
+    turns: Deque[SessionTurn]
+    summary: str = ""
+
+
+def sqlite_path_from_url(database_url: str) -> str:
+    """
+    Extract the file path from a ``sqlite:///`` database URL.
+
+    Args:
+        database_url: Database URL, e.g. ``sqlite:///./data_ghost.db``
+
+    Returns:
+        Filesystem path of the SQLite database
+    """
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Only sqlite:/// database URLs are supported: {database_url}")
+    return database_url[len(prefix) :]
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+class SessionStore:
+    """
+    Session history persisted in SQLite with a bounded in-memory LRU.
+
+    Only the most recent ``max_turns`` of each session are kept verbatim.
+    Older turns are folded into a short extractive summary, so both the
+    cached state and the history sent with a prompt stay bounded.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_sessions: int = 1000,
+        max_turns: int = 20,
+        summary_chars: int = 1500,
+    ):
+        """
+        Initialize session store.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_sessions: Sessions kept in the in-memory LRU
+            max_turns: Turns kept verbatim per session
+            summary_chars: Maximum length of a session's rolling summary
+        """
+        self.max_sessions = max_sessions
+        self.max_turns = max_turns
+        self.summary_chars = summary_chars
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL DEFAULT '',
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS session_turns (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_session_turns_session
+                ON session_turns (session_id, id);
+            """)
+        self._db.commit()
+
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, SessionState]" = OrderedDict()
+
+    def _load(self, session_id: str) -> SessionState:
+        """Get a session from the LRU, loading it from SQLite on a miss."""
+        state = self._cache.get(session_id)
+        if state is not None:
+            self._cache.move_to_end(session_id)
+            return state
+
+        row = self._db.execute(
+            "SELECT summary FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        turns = self._db.execute(
+            "SELECT question, answer, tokens, created_at FROM session_turns "
+            "WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+            (session_id, self.max_turns),
+        ).fetchall()
+        state = SessionState(
+            turns=deque(
+                (SessionTurn(*turn) for turn in reversed(turns)),
+                maxlen=self.max_turns,
+            ),
+            summary=row[0] if row else "",
+        )
+
+        self._cache[session_id] = state
+        while len(self._cache) > self.max_sessions:
+            self._cache.popitem(last=False)
+        return state
+
+    def _fold_into_summary(self, state: SessionState, turn: SessionTurn) -> None:
+        """Append an evicted turn to the rolling summary, dropping the oldest text."""
+        entry = f"Q: {_clip(turn.question, 150)} A: {_clip(turn.answer, 250)}"
+        summary = f"{state.summary}\n{entry}".strip()
+        if len(summary) > self.summary_chars:
+            summary = summary[-self.summary_chars :]
+            summary = summary[summary.find("\n") + 1 :] if "\n" in summary else summary
+        state.summary = summary
+
+    def append_turn(self, session_id: str, question: str, answer: str) -> None:
+        """
+        Record a question and its answer.
+
+        Args:
+            session_id: Session identifier
+            question: Question asked
+            answer: Answer returned
+        """
+        turn = SessionTurn(
+            question=question,
+            answer=answer,
+            tokens=estimate_tokens([question, answer]),
+            created_at=time.time(),
+        )
+        with self._lock:
+            state = self._load(session_id)
+            if len(state.turns) == self.max_turns:
+                self._fold_into_summary(state, state.turns[0])
+            state.turns.append(turn)
+
+            with self._db:
+                self._db.execute(
+                    "INSERT INTO session_turns "
+                    "(session_id, question, answer, tokens, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (session_id, question, answer, turn.tokens, turn.created_at),
+                )
+                self._db.execute(
+                    "INSERT INTO sessions (session_id, summary, updated_at) "
+                    "VALUES (?, ?, ?) ON CONFLICT(session_id) DO UPDATE SET "
+                    "summary = excluded.summary, updated_at = excluded.updated_at",
+                    (session_id, state.summary, turn.created_at),
+                )
+
+    def get_history(self, session_id: str) -> Dict[str, Any]:
+        """
+        Get the stored history of a session.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Dictionary with the rolling summary and recent turns
+        """
+        with self._lock:
+            state = self._load(session_id)
+            return {
+                "summary": state.summary,
+                "turns": [asdict(turn) for turn in state.turns],
+            }
+
+    def get_context_window(self, session_id: str, token_budget: int) -> Dict[str, Any]:
+        """
+        Get the most recent turns that fit in a token budget.
+
+        Turns are taken newest first until the budget is spent; the rolling
+        summary is included only if it still fits afterwards.
+
+        Args:
+            session_id: Session identifier
+            token_budget: Maximum tokens of history to return
+
+        Returns:
+            Dictionary with the summary (possibly empty) and turns, oldest first
+        """
+        with self._lock:
+            state = self._load(session_id)
+            turns: List[SessionTurn] = []
+            used = 0
+            for turn in reversed(state.turns):
+                if used + turn.tokens > token_budget:
+                    break
+                turns.append(turn)
+                used += turn.tokens
+            summary = state.summary
+            if summary and (
+                len(turns) < len(state.turns)
+                or used + estimate_tokens(summary) > token_budget
+            ):
+                summary = ""
+            return {"summary": summary, "turns": list(reversed(turns))}
+
+    def has_history(self, session_id: str) -> bool:
+        """Whether a session has any recorded turns."""
+        with self._lock:
+            state = self._load(session_id)
+            return bool(state.turns or state.summary)
+
+    def clear(self, session_id: str) -> bool:
+        """
+        Delete a session and its turns.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            True if the session existed, False otherwise
+        """
+        with self._lock:
+            self._cache.pop(session_id, None)
+            with self._db:
+                deleted = self._db.execute(
+                    "DELETE FROM session_turns WHERE session_id = ?", (session_id,)
+                ).rowcount
+                deleted += self._db.execute(
+                    "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+                ).rowcount
+            return deleted > 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get in-memory cache statistics."""
+        with self._lock:
+            return {
+                "cached_sessions": len(self._cache),
+                "max_sessions": self.max_sessions,
+                "max_turns": self.max_turns,
+            }
+
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """
+    Get the process-wide session store.
+
+    Returns:
+        Shared SessionStore instance
+    """
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = SessionStore(
+                sqlite_path_from_url(settings.database_url),
+                max_sessions=settings.session_cache_size,
+                max_turns=settings.session_max_turns,
+            )
+        return _session_store
@@ -0,0 +1,463 @@
+"""Quantized on-disk vector index with exact float re-ranking."""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.storage.quantization import create_quantizer, normalize
+
+logger = get_logger(__name__)
+
+
+class QuantizedVectorIndex:
+    """
+    Vector index that keeps only quantized codes in memory.
+
+    Full-precision vectors are appended to a float32 file on disk and memory
+    mapped, so they are paged in only for the handful of candidates that get
+    re-ranked exactly. Documents and metadata live in a small SQLite table.
+    Rows added before the quantizer is trained are scored exactly.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        method: str = "int8",
+        rerank_factor: int = 4,
+        train_size: int = 1024,
+        pq_subvectors: int = 96,
+    ):
+        """
+        Initialize the index, loading any persisted state.
+
+        Args:
+            path: Directory holding the index files
+            method: Quantization method ("int8" or "pq")
+            rerank_factor: Candidate multiplier for exact re-ranking
+            train_size: Number of vectors collected before training the quantizer
+            pq_subvectors: Number of sub-vectors for product quantization
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.method = method
+        self.rerank_factor = rerank_factor
+        self.train_size = train_size
+        self.pq_subvectors = pq_subvectors
+
+        self._lock = threading.RLock()
+        self._vectors_file = self.path / "vectors.f32"
+        self._codes_file = self.path / "codes.bin"
+        self._quantizer_file = self.path / "quantizer.npz"
+        self._config_file = self.path / "index.json"
+
+        self._db = sqlite3.connect(
+            str(self.path / "documents.sqlite3"), check_same_thread=False
+        )
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS vectors (
+                row INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                document TEXT,
+                metadata TEXT,
+                deleted INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+        self._db.commit()
+
+        self.dim: Optional[int] = None
+        self.quantizer = None
+        self._codes: Optional[np.ndarray] = None
+        self._live = np.zeros(0, dtype=bool)
+        self._load()
+
+    def _load(self) -> None:
+        """Load configuration, quantizer state, codes and the live-row mask."""
+        if self._config_file.exists():
+            config = json.loads(self._config_file.read_text())
+            self.dim = config["dim"]
+            if config["method"] != self.method:
+                logger.warning(
+                    f"Vector index at {self.path} was built with "
+                    f"'{config['method']}', ignoring configured '{self.method}'"
+                )
+                self.method = config["method"]
+            self.quantizer = create_quantizer(self.method, self.dim, self.pq_subvectors)
+            if self._quantizer_file.exists():
+                with np.load(self._quantizer_file) as state:
+                    self.quantizer.load_state(dict(state))
+                codes = np.fromfile(self._codes_file, dtype=self.quantizer.code_dtype)
+                self._codes = codes.reshape(-1, self.quantizer.code_size)
+
+        rows = self._db.execute("SELECT row, deleted FROM vectors").fetchall()
+        self._live = np.zeros(len(rows), dtype=bool)
+        for row, deleted in rows:
+            self._live[row] = not deleted
+
+    @property
+    def size(self) -> int:
+        """Number of stored rows, including deleted ones."""
+        return len(self._live)
+
+    def _float_vectors(self) -> np.ndarray:
+        """Memory-map the full-precision vectors."""
+        return np.memmap(
+            self._vectors_file, dtype=np.float32, mode="r", shape=(self.size, self.dim)
+        )
+
+    def _train(self) -> None:
+        """Train the quantizer on the stored vectors and encode all rows."""
+        vectors = np.asarray(self._float_vectors())
+        self.quantizer.train(vectors)
+        np.savez(self._quantizer_file, **self.quantizer.state())
+        self._codes = self.quantizer.encode(vectors)
+        self._codes.tofile(self._codes_file)
+        logger.info(
+            f"Trained {self.method} quantizer on {len(vectors)} vectors at {self.path}"
+        )
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Add vectors with their documents and metadata.
+
+        Args:
+            ids: Document IDs
+            embeddings: Embedding vectors
+            documents: Document texts
+            metadatas: Metadata dictionaries
+        """
+        vectors = normalize(embeddings)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self.quantizer = create_quantizer(
+                    self.method, self.dim, self.pq_subvectors
+                )
+                self._config_file.write_text(
+                    json.dumps({"dim": self.dim, "method": self.method})
+                )
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match index "
+                    f"dimension {self.dim}"
+                )
+
+            start_row = self.size
+            with open(self._vectors_file, "ab") as f:
+                vectors.tofile(f)
+            self._db.executemany(
+                "INSERT INTO vectors (row, id, document, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (start_row + i, doc_id, document, json.dumps(metadata or {}))
+                    for i, (doc_id, document, metadata) in enumerate(
+                        zip(ids, documents, metadatas)
+                    )
+                ],
+            )
+            self._db.commit()
+            self._live = np.concatenate([self._live, np.ones(len(ids), dtype=bool)])
+
+            if self.quantizer.is_trained:
+                codes = self.quantizer.encode(vectors)
+                with open(self._codes_file, "ab") as f:
+                    codes.tofile(f)
+                self._codes = np.concatenate([self._codes, codes])
+            elif self.size >= self.train_size:
+                self._train()
+
+    def _filter_rows(self, where: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Return a boolean mask of live rows matching a flat equality filter."""
+        if not where:
+            return self._live.copy()
+        clauses = []
+        params: List[Any] = []
+        for key, value in where.items():
+            if key.startswith("$") or isinstance(value, dict):
+                raise ValueError(f"Unsupported filter for quantized index: {key}")
+            clauses.append("json_extract(metadata, ?) = ?")
+            params.extend([f"$.{key}", value])
+        rows = self._db.execute(
+            f"SELECT row FROM vectors WHERE deleted = 0 AND {' AND '.join(clauses)}",
+            params,
+        ).fetchall()
+        mask = np.zeros(self.size, dtype=bool)
+        mask[[row for (row,) in rows]] = True
+        return mask
+
+    def search(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[int, float]]:
+        """
+        Find the nearest live rows to a query vector.
+
+        Args:
+            query_embedding: Query vector
+            n_results: Number of results to return
+            where: Flat metadata equality filter
+
+        Returns:
+            List of (row, cosine distance) pairs, nearest first
+        """
+        query = normalize(query_embedding)
+        with self._lock:
+            if self.dim is None:
+                return []
+            mask = self._filter_rows(where)
+            if not mask.any():
+                return []
+            vectors = self._float_vectors()
+
+            n_encoded = len(self._codes) if self._codes is not None else 0
+            encoded_rows = np.flatnonzero(mask[:n_encoded])
+            exact_rows = np.flatnonzero(mask[n_encoded:]) + n_encoded
+
+            candidates = exact_rows
+            if len(encoded_rows):
+                approx = self.quantizer.score(query, self._codes[encoded_rows])
+                n_candidates = min(len(encoded_rows), n_results * self.rerank_factor)
+                top = np.argpartition(-approx, n_candidates - 1)[:n_candidates]
+                candidates = np.concatenate([encoded_rows[top], exact_rows])
+
+            candidates = np.sort(candidates)
+            scores = np.asarray(vectors[candidates]) @ query
+            order = np.argsort(-scores)[:n_results]
+            return [(int(candidates[i]), float(1.0 - scores[i])) for i in order]
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Query the index, returning results shaped like a Chroma query.
+
+        Args:
+            query_embeddings: Query vectors
+            n_results: Number of results per query
+            where: Flat metadata equality filter
+
+        Returns:
+            Dictionary with ids, documents, metadatas and distances lists
+        """
+        results: Dict[str, Any] = {
+            "ids": [],
+            "documents": [],
+            "metadatas": [],
+            "distances": [],
+        }
+        for query_embedding in query_embeddings:
+            hits = self.search(query_embedding, n_results, where)
+            records = {}
+            if hits:
+                placeholders = ",".join("?" for _ in hits)
+                records = {
+                    row: (doc_id, document, metadata)
+                    for row, doc_id, document, metadata in self._db.execute(
+                        "SELECT row, id, document, metadata FROM vectors "
+                        f"WHERE row IN ({placeholders})",
+                        [row for row, _ in hits],
+                    )
+                }
+            results["ids"].append([records[row][0] for row, _ in hits])
+            results["documents"].append([records[row][1] for row, _ in hits])
+            results["metadatas"].append(
+                [json.loads(records[row][2]) for row, _ in hits]
+            )
+            results["distances"].append([distance for _, distance in hits])
+        return results
+
+    def delete(self, ids: List[str]) -> int:
+        """
+        Mark documents as deleted.
+
+        Args:
+            ids: Document IDs to delete
+
+        Returns:
+            Number of rows deleted
+        """
+        if not ids:
+            return 0
+        with self._lock:
+            placeholders = ",".join("?" for _ in ids)
+            rows = self._db.execute(
+                f"SELECT row FROM vectors WHERE deleted = 0 AND id IN ({placeholders})",
+                ids,
+            ).fetchall()
+            self._db.execute(
+                f"UPDATE vectors SET deleted = 1 WHERE id IN ({placeholders})", ids
+            )
+            self._db.commit()
+            for (row,) in rows:
+                self._live[row] = False
+            return len(rows)
+
+    def delete_where(self, where: Dict[str, Any]) -> int:
+        """
+        Mark all documents matching a metadata filter as deleted.
+
+        Args:
+            where: Flat metadata equality filter
+
+        Returns:
+            Number of rows deleted
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._filter_rows(where))
+            if not len(rows):
+                return 0
+            self._db.executemany(
+                "UPDATE vectors SET deleted = 1 WHERE row = ?",
+                [(int(row),) for row in rows],
+            )
+            self._db.commit()
+            self._live[rows] = False
+            return len(rows)
+
+    def metadata_values(self, key: str) -> set[str]:
+        """
+        Get the distinct values of a metadata key across live documents.
+
+        Args:
+            key: Metadata key
+
+        Returns:
+            Set of distinct values
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT json_extract(metadata, ?) FROM vectors "
+                "WHERE deleted = 0",
+                [f"$.{key}"],
+            ).fetchall()
+        return {value for (value,) in rows if value is not None}
+
+    def _disk_bytes(self) -> int:
+        """Total size of the index files on disk."""
+        return sum(f.stat().st_size for f in self.path.iterdir() if f.is_file())
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Drop deleted rows from every index file and renumber the rest.
+
+        Float vectors, codes and the document table are rewritten so that
+        disk usage, memory and scan cost stay proportional to live rows.
+
+        Returns:
+            Dictionary with removed row count and reclaimed bytes
+        """
+        with self._lock:
+            bytes_before = self._disk_bytes()
+            live_rows = np.flatnonzero(self._live)
+            removed = self.size - len(live_rows)
+
+            if removed and self.dim is not None:
+                vectors = self._float_vectors()
+                tmp_file = self._vectors_file.with_suffix(".tmp")
+                with open(tmp_file, "wb") as f:
+                    for start in range(0, len(live_rows), 65536):
+                        chunk = live_rows[start : start + 65536]
+                        np.asarray(vectors[chunk]).tofile(f)
+                del vectors
+                os.replace(tmp_file, self._vectors_file)
+
+                if self._codes is not None:
+                    self._codes = self._codes[live_rows[live_rows < len(self._codes)]]
+                    tmp_file = self._codes_file.with_suffix(".tmp")
+                    self._codes.tofile(tmp_file)
+                    os.replace(tmp_file, self._codes_file)
+
+                records = self._db.execute(
+                    "SELECT id, document, metadata FROM vectors "
+                    "WHERE deleted = 0 ORDER BY row"
+                ).fetchall()
+                with self._db:
+                    self._db.execute("DELETE FROM vectors")
+                    self._db.executemany(
+                        "INSERT INTO vectors (row, id, document, metadata) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(i, *record) for i, record in enumerate(records)],
+                    )
+                self._live = np.ones(len(live_rows), dtype=bool)
+
+            self._db.execute("VACUUM")
+
+            reclaimed = max(bytes_before - self._disk_bytes(), 0)
+            logger.info(
+                f"Compacted vector index at {self.path}: removed {removed} rows, "
+                f"reclaimed {reclaimed} bytes"
+            )
+            return {"removed_rows": removed, "reclaimed_bytes": reclaimed}
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """
+        Report in-memory footprint compared with holding float32 vectors.
+
+        Returns:
+            Memory usage dictionary
+        """
+        with self._lock:
+            dim = self.dim or 0
+            float_bytes = self.size * dim * 4
+            n_encoded = len(self._codes) if self._codes is not None else 0
+            quantized_bytes = (
+                (self._codes.nbytes if self._codes is not None else 0)
+                + (self.quantizer.nbytes() if self.quantizer else 0)
+                # Rows not yet encoded are scored from the memory map
+                + (self.size - n_encoded) * dim * 4
+            )
+            return {
+                "method": self.method,
+                "trained": bool(self.quantizer and self.quantizer.is_trained),
+                "vectors": self.size,
+                "live_vectors": int(self._live.sum()),
+                "deleted_vectors": int(self.size - self._live.sum()),
+                "disk_bytes": self._disk_bytes(),
+                "dimension": dim,
+                "float32_bytes": float_bytes,
+                "quantized_bytes": quantized_bytes,
+                "memory_saved_bytes": float_bytes - quantized_bytes,
+            }
+
+
+_indexes: Dict[str, QuantizedVectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index() -> QuantizedVectorIndex:
+    """
+    Get the shared quantized vector index for the configured ChromaDB path.
+
+    The index is loaded once per process and shared between clients, since
+    the quantized codes are what we are trying to keep small in memory.
+
+    Returns:
+        Shared QuantizedVectorIndex instance
+    """
+    path = str(Path(settings.chroma_db_path) / "quantized_index")
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = QuantizedVectorIndex(
+                path,
+                method=settings.vector_quantization,
+                rerank_factor=settings.vector_rerank_factor,
+                train_size=settings.vector_quantization_train_size,
+                pq_subvectors=settings.pq_subvectors,
+            )
+        return _indexes[path]
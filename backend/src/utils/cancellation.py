@@ -0,0 +1,93 @@
+"""Cancellation of request work when the client disconnects."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+
+from fastapi import Request
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ClientDisconnected(Exception):
+    """Raised when request work was cancelled because the client went away."""
+
+
+class OperationCancelled(Exception):
+    """Raised inside blocking work when its cancel event is set."""
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def record_wasted(endpoint: str, tokens: int = 0, cpu_seconds: float = 0.0) -> None:
+    """
+    Record work spent on a request that was cancelled before completion.
+
+    Args:
+        endpoint: Endpoint or job the work belonged to
+        tokens: OpenAI tokens already spent
+        cpu_seconds: CPU time already spent
+    """
+    with _stats_lock:
+        stats = _stats.setdefault(
+            endpoint, {"cancelled": 0, "wasted_tokens": 0, "wasted_cpu_seconds": 0.0}
+        )
+        stats["cancelled"] += 1
+        stats["wasted_tokens"] += tokens
+        stats["wasted_cpu_seconds"] += cpu_seconds
+
+
+def get_cancellation_stats() -> Dict[str, Dict[str, float]]:
+    """Get cancelled request counts and wasted work per endpoint."""
+    with _stats_lock:
+        return {endpoint: dict(stats) for endpoint, stats in _stats.items()}
+
+
+async def run_until_disconnected(
+    request: Request,
+    work: Awaitable[T],
+    cancel_event: Optional[threading.Event] = None,
+    poll_interval: float = 0.25,
+) -> T:
+    """
+    Await request work, cancelling it if the client disconnects first.
+
+    Cancellation propagates into the work as ``asyncio.CancelledError``, which
+    aborts in-flight OpenAI calls. Work running in threads cannot be
+    interrupted that way, so ``cancel_event`` is set for it to poll.
+
+    Args:
+        request: Incoming request to watch
+        work: Coroutine doing the request's work
+        cancel_event: Event set on disconnect for work running in threads
+        poll_interval: Seconds between disconnect checks
+
+    Returns:
+        Result of the work
+    """
+    task: asyncio.Task[Any] = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                break
+    finally:
+        if not task.done():
+            if cancel_event is not None:
+                cancel_event.set()
+            task.cancel()
+
+    try:
+        await task
+    except (asyncio.CancelledError, Exception):
+        pass
+    logger.info(f"Client disconnected; cancelled {request.url.path}")
+    raise ClientDisconnected(f"Client disconnected from {request.url.path}")
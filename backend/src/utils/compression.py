@@ -0,0 +1,195 @@
+"""Response compression negotiated from the client's Accept-Encoding."""
+
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from src.utils.metrics import HTTP_RESPONSE_BYTES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Event streams are left alone so each event reaches the client unbuffered
+_EXCLUDED_TYPES = ("text/event-stream",)
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def supported_encodings() -> tuple:
+    """Get the encodings this server can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Choose a content encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``gzip, deflate, br;q=0.9``
+
+    Returns:
+        The supported encoding with the highest quality value (brotli on
+        ties), or None if the client accepts none of them
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """Incremental gzip or brotli compressor."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 16 + MAX_WBITS writes a gzip header and trailer
+            self._zlib = zlib.compressobj(
+                gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """
+        Compress a chunk of the body.
+
+        Args:
+            data: Body bytes
+            final: Whether this is the last chunk; otherwise the output is
+                flushed so the client can decode everything sent so far
+
+        Returns:
+            Compressed bytes
+        """
+        if self.encoding == "br":
+            output = self._brotli.process(data)
+            return output + (self._brotli.finish() if final else self._brotli.flush())
+        output = self._zlib.compress(data)
+        return output + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with gzip or brotli.
+
+    The encoding is negotiated from Accept-Encoding (brotli needs the
+    ``brotli`` package). JSON and text bodies under ``minimum_size`` bytes
+    are sent as they are. Streamed bodies, such as JSON lines, are
+    compressed chunk by chunk and flushed after each one, so every line
+    still reaches the client as soon as it is produced.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 5,
+        brotli_quality: int = 4,
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Smallest body, in bytes, worth compressing
+            gzip_level: zlib compression level (1-9)
+            brotli_quality: Brotli quality (0-11)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _should_compress(self, headers: Headers, body: bytes, more_body: bool) -> bool:
+        content_type = headers.get("content-type", "")
+        if "content-encoding" in headers or content_type.startswith(_EXCLUDED_TYPES):
+            return False
+        if not content_type.startswith(_COMPRESSIBLE_TYPES):
+            return False
+        if more_body:
+            # A streamed body is compressed unless it declares a small size
+            length = headers.get("content-length")
+            return length is None or int(length) >= self.minimum_size
+        return len(body) >= self.minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[dict] = None
+        compressor: Optional[_Compressor] = None
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows its size
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                # e.g. a file sent by path, which is passed on uncompressed
+                if start_message is not None:
+                    message_start, start_message = start_message, None
+                    await send(message_start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                message_start, start_message = start_message, None
+                headers = MutableHeaders(raw=message_start["headers"])
+                if not self._should_compress(headers, body, more_body):
+                    await send(message_start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                data = compressor.compress(body, final=not more_body)
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    headers["content-length"] = str(len(data))
+                await send(message_start)
+            elif compressor is None:
+                await send(message)
+                return
+            else:
+                data = compressor.compress(body, final=not more_body)
+            HTTP_RESPONSE_BYTES.inc(len(body), encoding, "raw")
+            HTTP_RESPONSE_BYTES.inc(len(data), encoding, "sent")
+            await send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_wrapper)
+        if start_message is not None:
+            # The app started a response but sent no body
+            await send(start_message)
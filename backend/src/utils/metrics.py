@@ -0,0 +1,333 @@
+"""In-process metrics exposed in the Prometheus text format."""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds; covers sub-millisecond lookups up to slow LLM calls
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+LabelValues = Tuple[str, ...]
+# (labels, value) pairs of one metric family
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(v))}"' for name, v in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        """
+        Initialize counter.
+
+        Args:
+            name: Metric name
+            help: Help text
+            labelnames: Names of the labels, in order
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount: Amount to add
+            labelvalues: Label values, in ``labelnames`` order
+        """
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self) -> Samples:
+        """Get the current value of every label set."""
+        with self._lock:
+            items = list(self._values.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets.
+
+    Observing takes a lock and a binary search over the bucket bounds, so it
+    is cheap enough for per-request hot paths.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize histogram.
+
+        Args:
+            name: Metric name
+            help: Help text
+            labelnames: Names of the labels, in order
+            buckets: Sorted bucket upper bounds
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket plus +Inf, sum]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value
+            labelvalues: Label values, in ``labelnames`` order
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labelvalues)
+            if entry is None:
+                entry = ([0] * (len(self.buckets) + 1), [0.0])
+                self._values[labelvalues] = entry
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def samples(self) -> Samples:
+        """Get bucket, sum and count samples of every label set."""
+        with self._lock:
+            items = [
+                (key, list(counts), total[0])
+                for key, (counts, total) in self._values.items()
+            ]
+
+        samples: Samples = []
+        for key, counts, total in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(({**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(({**labels, "__suffix__": "_sum"}, total))
+            samples.append(({**labels, "__suffix__": "_count"}, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together for scraping."""
+
+    def __init__(self):
+        """Initialize metrics registry."""
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, help: str, labelnames: Tuple[str, ...] = ()
+    ) -> Counter:
+        """Get or create a counter."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help, labelnames)
+            return self._metrics[name]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help, labelnames, buckets)
+            return self._metrics[name]
+
+    def render(self, extra: Iterable[Tuple[str, str, str, Samples]] = ()) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            extra: Additional families as (name, type, help, samples), for
+                values read from other components at scrape time
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = [(m.name, m.kind, m.help, m.samples()) for m in metrics]
+
+        lines: List[str] = []
+        for name, kind, help, samples in [*families, *extra]:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                suffix = labels.pop("__suffix__", "_bucket" if "le" in labels else "")
+                lines.append(
+                    f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "data_ghost_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ("stage",),
+)
+HTTP_REQUESTS = registry.counter(
+    "data_ghost_http_requests_total",
+    "HTTP requests by route and status code",
+    ("method", "route", "status"),
+)
+HTTP_SECONDS = registry.histogram(
+    "data_ghost_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route"),
+)
+HTTP_RESPONSE_BYTES = registry.counter(
+    "data_ghost_http_response_bytes_total",
+    "Compressed response body bytes by encoding, before (raw) and after (sent)",
+    ("encoding", "kind"),
+)
+LLM_TOKENS = registry.counter(
+    "data_ghost_llm_tokens_total",
+    "OpenAI tokens used by model and kind (prompt or completion)",
+    ("model", "kind"),
+)
+LLM_COST = registry.counter(
+    "data_ghost_llm_cost_usd_total",
+    "Estimated OpenAI cost in USD by model",
+    ("model",),
+)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Record the duration of a pipeline stage.
+
+    Args:
+        stage: Stage name, e.g. ``csv_parse`` or ``llm_call``
+        seconds: Duration in seconds
+    """
+    STAGE_SECONDS.observe(seconds, stage)
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """
+    Time the enclosed block as a pipeline stage, including when it raises.
+
+    Args:
+        stage: Stage name
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start_time, stage)
+
+
+def record_token_usage(
+    model: str, prompt_tokens: int, completion_tokens: int = 0
+) -> None:
+    """
+    Record tokens used by an OpenAI call and their estimated cost.
+
+    Args:
+        model: Model that served the call
+        prompt_tokens: Input tokens
+        completion_tokens: Output tokens
+    """
+    # Imported here; token_counter pulls in tiktoken
+    from src.utils.token_counter import estimate_cost
+
+    LLM_TOKENS.inc(prompt_tokens, model, "prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, model, "completion")
+    LLM_COST.inc(estimate_cost(prompt_tokens + completion_tokens, model), model)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route.
+
+    Routes are labelled by their path template (``/upload/files/{file_id}``)
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status: Optional[int] = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_SECONDS.observe(time.perf_counter() - start_time, method, path)
+            HTTP_REQUESTS.inc(1, method, path, str(status or 500))
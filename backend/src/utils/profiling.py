@@ -0,0 +1,287 @@
+"""On-demand cProfile capture of individual requests."""
+
+import asyncio
+import cProfile
+import functools
+import hmac
+import io
+import json
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_HEADER = "x-debug-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+class ProfileSession:
+    """
+    Profiles collected for one request.
+
+    The request's own profiler runs on the event loop thread; blocking work
+    sent to worker threads with ``profile_thread`` is profiled separately and
+    merged in when the request finishes.
+    """
+
+    def __init__(self, profile_id: str, method: str, path: str, reason: str):
+        """
+        Initialize profile session.
+
+        Args:
+            profile_id: ID the profile is stored under
+            method: HTTP method of the request
+            path: Path of the request
+            reason: Why the request was profiled (``header`` or ``sampled``)
+        """
+        self.profile_id = profile_id
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.profiler = cProfile.Profile()
+        self.thread_profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add_thread_profiler(self, profiler: cProfile.Profile) -> None:
+        """Add the profile of work run in a worker thread."""
+        with self._lock:
+            self.thread_profilers.append(profiler)
+
+    def stats(self) -> pstats.Stats:
+        """Combine the request and worker thread profiles."""
+        stats = pstats.Stats(self.profiler)
+        with self._lock:
+            for profiler in self.thread_profilers:
+                stats.add(profiler)
+        return stats
+
+
+_current_session: ContextVar[Optional[ProfileSession]] = ContextVar(
+    "profile_session", default=None
+)
+# cProfile supports one active profiler per thread, so profile one request
+# at a time; other requests asking for a profile run unprofiled
+_session_lock = threading.Lock()
+
+
+def profile_thread(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap a function sent to a worker thread so it joins the request profile.
+
+    ``asyncio.to_thread`` copies the request's context into the thread, so
+    the wrapper finds the active session there. With no active session it
+    only costs a context variable lookup.
+
+    Args:
+        fn: Function to run in a worker thread
+
+    Returns:
+        Wrapped function
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = _current_session.get()
+        if session is None:
+            return fn(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn, *args, **kwargs)
+        finally:
+            session.add_thread_profiler(profiler)
+
+    return wrapper
+
+
+def get_profile_dir() -> Path:
+    """Get the directory profiles are stored in."""
+    return Path(settings.profiling_dir)
+
+
+def save_profile(session: ProfileSession, duration_seconds: float) -> Path:
+    """
+    Store a finished profile for download.
+
+    Writes ``<id>.prof`` (pstats format, for snakeviz or ``pstats``),
+    ``<id>.txt`` (top functions by cumulative time) and ``<id>.json``
+    (request details), then removes the oldest profiles beyond
+    ``settings.profiling_max_profiles``.
+
+    Args:
+        session: Finished profile session
+        duration_seconds: Wall-clock duration of the request
+
+    Returns:
+        Path of the ``.prof`` file
+    """
+    profile_dir = get_profile_dir()
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    stats = session.stats()
+
+    prof_path = profile_dir / f"{session.profile_id}.prof"
+    stats.dump_stats(str(prof_path))
+
+    summary = io.StringIO()
+    summary_stats = pstats.Stats(str(prof_path), stream=summary)
+    summary_stats.sort_stats("cumulative").print_stats(40)
+    (profile_dir / f"{session.profile_id}.txt").write_text(summary.getvalue())
+
+    info = {
+        "profile_id": session.profile_id,
+        "method": session.method,
+        "path": session.path,
+        "reason": session.reason,
+        "duration_seconds": round(duration_seconds, 4),
+        "worker_threads": len(session.thread_profilers),
+        "created": datetime.now().isoformat(),
+    }
+    (profile_dir / f"{session.profile_id}.json").write_text(json.dumps(info))
+
+    _prune_profiles(profile_dir, settings.profiling_max_profiles)
+    return prof_path
+
+
+def _prune_profiles(profile_dir: Path, max_profiles: int) -> None:
+    infos = sorted(profile_dir.glob("*.json"))
+    for info_path in infos[: max(len(infos) - max_profiles, 0)]:
+        for suffix in (".prof", ".txt", ".json"):
+            info_path.with_suffix(suffix).unlink(missing_ok=True)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """List stored profiles, newest first."""
+    profile_dir = get_profile_dir()
+    if not profile_dir.exists():
+        return []
+    profiles = []
+    for info_path in sorted(profile_dir.glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(info_path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def get_profile_file(profile_id: str, suffix: str) -> Optional[Path]:
+    """
+    Get a stored profile file.
+
+    Args:
+        profile_id: Profile ID
+        suffix: ``.prof``, ``.txt`` or ``.json``
+
+    Returns:
+        Path if the profile exists, None otherwise
+    """
+    if Path(profile_id).name != profile_id:
+        return None
+    path = get_profile_dir() / f"{profile_id}{suffix}"
+    return path if path.is_file() else None
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """
+    Check a debug header value against the configured profiling token.
+
+    Without a configured token, any value is accepted in debug mode only.
+
+    Args:
+        token: Value of the debug header, if sent
+
+    Returns:
+        True if the caller may request and download profiles
+    """
+    if token is None:
+        return False
+    if settings.profiling_token:
+        return hmac.compare_digest(token, settings.profiling_token)
+    return settings.debug
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests on demand.
+
+    A request is profiled when it carries an authorized ``X-Debug-Profile``
+    header, or is picked at ``settings.profiling_sample_rate``. The profile
+    ID is returned in the ``X-Profile-Id`` response header and the profile
+    is saved once the response has been sent. Unprofiled requests pay one
+    header scan and, with sampling on, one random draw.
+
+    The event loop thread is shared, so a profile also includes whatever
+    other requests ran on it meanwhile; profile on a quiet instance for a
+    clean trace.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize middleware.
+
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+
+    def _reason(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER.encode():
+                if is_authorized(value.decode("latin-1")):
+                    return "header"
+                break
+        rate = settings.profiling_sample_rate
+        if rate > 0 and random.random() < rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._reason(scope)
+        if reason is None or not _session_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        # Sortable by time, so pruning removes the oldest
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        profile_id = f"{timestamp}_{uuid.uuid4().hex[:6]}"
+        session = ProfileSession(profile_id, scope["method"], scope["path"], reason)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER.encode(), profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_session.set(session)
+        start_time = time.perf_counter()
+        session.profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session.profiler.disable()
+            _current_session.reset(token)
+            _session_lock.release()
+            duration = time.perf_counter() - start_time
+            try:
+                await asyncio.to_thread(save_profile, session, duration)
+                logger.info(
+                    f"Profiled {scope['method']} {scope['path']} "
+                    f"({reason}, {duration:.3f}s) as {profile_id}"
+                )
+            except Exception as e:
+                logger.error(f"Error saving profile {profile_id}: {e}")
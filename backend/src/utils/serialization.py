@@ -0,0 +1,76 @@
+"""Fast JSON encoding for API responses and JSON lines streams."""
+
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _default(value: Any) -> Any:
+    """Encode values the stdlib encoder does not know, as orjson would."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a value to compact UTF-8 JSON.
+
+    Uses orjson when it is installed, which also encodes numpy values and
+    non-string dict keys, and the standard library otherwise.
+
+    Args:
+        content: Value to serialize
+
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with ``dumps``.
+
+    Return it from endpoints that build large dicts (row pages, column
+    statistics) so FastAPI does not walk the payload with
+    ``jsonable_encoder`` and ``json.dumps``. Endpoints with a response model
+    already serialize through pydantic's compiled encoder and need nothing.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+async def json_lines(items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    """
+    Encode items as JSON lines, one per item as it arrives.
+
+    Args:
+        items: Values to stream
+
+    Yields:
+        One newline-terminated JSON document per item
+    """
+    async for item in items:
+        yield dumps(item) + b"\n"
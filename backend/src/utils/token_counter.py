@@ -1,34 +1,58 @@
 """Token counting utilities using tiktoken."""
 
-import tiktoken
 from typing import Union
 
+from src.utils.tokenizer import approximate_token_count, get_tokenizer
 
-def count_tokens(text: Union[str, list[str]], model: str = "gpt-4o-mini") -> int:
+
+def count_tokens(
+    text: Union[str, list[str]],
+    model: str = "gpt-4o-mini",
+    approximate: bool = False,
+) -> int:
     """
     Count the number of tokens in text using tiktoken.
 
+    Encoders are loaded once per model and counts of repeated strings are
+    memoized; lists are batch-encoded across threads.
+
     Args:
         text: Text or list of texts to count tokens for
         model: OpenAI model name to use for tokenization
+        approximate: Estimate from length instead of encoding
 
     Returns:
         Number of tokens
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fallback to cl100k_base encoding for newer models
-        encoding = tiktoken.get_encoding("cl100k_base")
-
+    tokenizer = get_tokenizer(model)
     if isinstance(text, str):
-        return len(encoding.encode(text))
+        return tokenizer.count(text, approximate)
     elif isinstance(text, list):
-        return sum(len(encoding.encode(t)) for t in text)
+        return sum(tokenizer.count_batch(text, approximate))
     else:
         raise ValueError("Text must be a string or list of strings")
 
 
+def estimate_tokens(text: Union[str, list[str]], model: str = "gpt-4o-mini") -> int:
+    """
+    Count tokens, approximating if the tokenizer is unavailable.
+
+    For reporting where a rough count is acceptable.
+
+    Args:
+        text: Text or list of texts to count tokens for
+        model: OpenAI model name to use for tokenization
+
+    Returns:
+        Number of tokens
+    """
+    try:
+        return count_tokens(text, model)
+    except Exception:
+        texts = [text] if isinstance(text, str) else text
+        return sum(approximate_token_count(t) for t in texts)
+
+
 def estimate_cost(tokens: int, model: str = "gpt-4o-mini") -> float:
     """
     Estimate the cost of processing tokens.
@@ -45,6 +69,7 @@ def estimate_cost(tokens: int, model: str = "gpt-4o-mini") -> float:
         "gpt-4o": 0.005,  # $5 per 1M input tokens
         "gpt-4o-mini": 0.00015,  # $0.15 per 1M input tokens
         "gpt-3.5-turbo": 0.0005,  # $0.5 per 1M input tokens
+        "text-embedding-3-small": 0.00002,  # $0.02 per 1M tokens
     }
 
     cost_per_1k = costs.get(model, costs["gpt-4o-mini"])
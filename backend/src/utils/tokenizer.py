@@ -0,0 +1,270 @@
+"""Tokenizer with cached encoders, batch encoding and memoized counts."""
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import tiktoken
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> "tiktoken.Encoding":
+    """
+    Load the encoding for a model once.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        tiktoken encoding, falling back to cl100k_base for unknown models
+    """
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Fallback to cl100k_base encoding for newer models
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def approximate_token_count(text: str) -> int:
+    """
+    Estimate tokens from character length (about four characters per token).
+
+    Much faster than encoding and needs no tokenizer files; use it for
+    budget checks that tolerate an error of a few tens of percent.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated number of tokens
+    """
+    return (len(text) + 3) // 4
+
+
+class Tokenizer:
+    """
+    Token counter for one model.
+
+    Counts of short strings are memoized in a bounded LRU, since the same
+    column rows, system prompts and questions are counted repeatedly. Lists
+    of uncached strings are encoded with ``encode_batch`` across threads.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        cache_size: int = 8192,
+        max_cached_chars: int = 2000,
+        batch_threshold: int = 16,
+        num_threads: int = 4,
+    ):
+        """
+        Initialize tokenizer.
+
+        Args:
+            model: OpenAI model whose encoding is used
+            cache_size: Maximum number of memoized counts
+            max_cached_chars: Longest string whose count is memoized
+            batch_threshold: Uncached strings needed before batch encoding
+            num_threads: Threads used by ``encode_batch``
+        """
+        self.model = model
+        self.cache_size = cache_size
+        self.max_cached_chars = max_cached_chars
+        self.batch_threshold = batch_threshold
+        self.num_threads = num_threads
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def encoding(self) -> "tiktoken.Encoding":
+        """Encoding of the model, loaded on first use."""
+        return get_encoding(self.model)
+
+    def _lookup(self, text: str) -> Optional[int]:
+        """Get a memoized count, or None if the text is not cached."""
+        if len(text) > self.max_cached_chars:
+            return None
+        with self._lock:
+            count = self._cache.get(text)
+            if count is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._cache.move_to_end(text)
+            return count
+
+    def _store(self, text: str, count: int) -> None:
+        if len(text) > self.max_cached_chars:
+            return
+        with self._lock:
+            self._cache[text] = count
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def count(self, text: str, approximate: bool = False) -> int:
+        """
+        Count the tokens in a string.
+
+        Args:
+            text: Text to count
+            approximate: Estimate from length instead of encoding
+
+        Returns:
+            Number of tokens
+        """
+        if approximate:
+            return approximate_token_count(text)
+        count = self._lookup(text)
+        if count is None:
+            count = len(self.encoding.encode(text))
+            self._store(text, count)
+        return count
+
+    def count_batch(self, texts: List[str], approximate: bool = False) -> List[int]:
+        """
+        Count the tokens in each of several strings.
+
+        Args:
+            texts: Texts to count
+            approximate: Estimate from length instead of encoding
+
+        Returns:
+            Token count per text, in order
+        """
+        if approximate:
+            return [approximate_token_count(text) for text in texts]
+
+        counts: Dict[str, int] = {}
+        missing: Dict[str, None] = {}  # ordered set of texts to encode
+        for text in texts:
+            if text in counts or text in missing:
+                continue
+            count = self._lookup(text)
+            if count is None:
+                missing[text] = None
+            else:
+                counts[text] = count
+        missing_texts = list(missing)
+
+        if len(missing_texts) >= self.batch_threshold:
+            encoded = self.encoding.encode_batch(
+                missing_texts, num_threads=self.num_threads
+            )
+            computed = [len(tokens) for tokens in encoded]
+        else:
+            computed = [len(self.encoding.encode(text)) for text in missing_texts]
+        for text, count in zip(missing_texts, computed):
+            counts[text] = count
+            self._store(text, count)
+
+        return [counts[text] for text in texts]
+
+    def cache_info(self) -> Dict[str, int]:
+        """Get memoized count hits, misses and size."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+            }
+
+
+_tokenizers: Dict[str, Tokenizer] = {}
+_tokenizers_lock = threading.Lock()
+
+
+def get_tokenizer(model: str = "gpt-4o-mini") -> Tokenizer:
+    """
+    Get the process-wide tokenizer for a model.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        Shared Tokenizer instance
+    """
+    with _tokenizers_lock:
+        if model not in _tokenizers:
+            _tokenizers[model] = Tokenizer(model)
+        return _tokenizers[model]
+
+
+def get_tokenizer_stats() -> Dict[str, Dict[str, int]]:
+    """Get the memoized count statistics of every shared tokenizer."""
+    with _tokenizers_lock:
+        tokenizers = dict(_tokenizers)
+    return {model: tokenizer.cache_info() for model, tokenizer in tokenizers.items()}
+
+
+def benchmark_tokenizer(
+    texts: List[str], model: str = "gpt-4o-mini", repeats: int = 3
+) -> Dict[str, Any]:
+    """
+    Compare token counting strategies on the same texts.
+
+    Args:
+        texts: Texts to count
+        model: OpenAI model name
+        repeats: Passes over the texts per strategy (repeats hit the memo)
+
+    Returns:
+        Seconds per strategy and the approximate mode's relative error
+    """
+    import tiktoken
+
+    def timed(fn) -> float:
+        start_time = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        return time.perf_counter() - start_time
+
+    exact = sum(len(get_encoding(model).encode(text)) for text in texts)
+    results: Dict[str, Any] = {"texts": len(texts), "repeats": repeats}
+    results["naive_seconds"] = timed(
+        lambda: sum(
+            len(tiktoken.encoding_for_model(model).encode(text)) for text in texts
+        )
+    )
+    results["cached_encoder_seconds"] = timed(
+        lambda: sum(len(get_encoding(model).encode(text)) for text in texts)
+    )
+    results["encode_batch_seconds"] = timed(
+        lambda: sum(len(tokens) for tokens in get_encoding(model).encode_batch(texts))
+    )
+    memoized = Tokenizer(model, cache_size=len(texts) * 2)
+    results["memoized_seconds"] = timed(lambda: sum(memoized.count_batch(texts)))
+    results["approximate_seconds"] = timed(
+        lambda: sum(approximate_token_count(text) for text in texts)
+    )
+    approximate = sum(approximate_token_count(text) for text in texts)
+    results["approximate_relative_error"] = (
+        round(abs(approximate - exact) / exact, 4) if exact else 0.0
+    )
+    return results
+
+
+def make_benchmark_texts(n: int = 5000, seed: Optional[int] = 0) -> List[str]:
+    """Build prompt-like texts with many repeats, as seen in prompt packing."""
+    rng = random.Random(seed)
+    words = ["revenue", "region", "north", "2024-01-05", "42.5", "customer", "id"]
+    rows = [
+        " | ".join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+        for _ in range(n // 5)
+    ]
+    return [rng.choice(rows) for _ in range(n)]
+
+
+if __name__ == "__main__":
+    import json
+
+    print(json.dumps(benchmark_tokenizer(make_benchmark_texts()), indent=2))
@@ -0,0 +1,101 @@
+"""Background warm-up of lazily loaded dependencies."""
+
+import asyncio
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Heavy dependencies imported on first use instead of at startup
+LAZY_MODULES = ("openai", "chromadb", "tiktoken")
+
+_warmup_status: Dict[str, Any] = {
+    "state": "pending",
+    "seconds": None,
+    "steps": {},
+    "failed": [],
+}
+_warmup_lock = threading.Lock()
+
+
+def _open_chroma() -> None:
+    # Opens the client requests share, so they do not open another one
+    from src.storage import get_chroma_client
+
+    get_chroma_client()
+
+
+def _load_encoding() -> None:
+    from src.utils.tokenizer import get_encoding
+
+    get_encoding(settings.openai_model)
+
+
+def _warmup_steps() -> List[Tuple[str, Callable[[], Any]]]:
+    steps: List[Tuple[str, Callable[[], Any]]] = [
+        (f"import_{name}", lambda name=name: importlib.import_module(name))
+        for name in LAZY_MODULES
+    ]
+    steps.append(("tokenizer_encoding", _load_encoding))
+    steps.append(("chroma_client", _open_chroma))
+    return steps
+
+
+def warm_up() -> Dict[str, Any]:
+    """
+    Load lazily imported dependencies so the first request does not pay for it.
+
+    Imports the modules in ``LAZY_MODULES``, loads the tokenizer encoding of
+    the default model and opens the vector store. A failing step is logged
+    and skipped; the request that needs it will load it again and surface
+    the error itself.
+
+    Returns:
+        Warm-up status with seconds per step
+    """
+    with _warmup_lock:
+        _warmup_status["state"] = "running"
+    start_time = time.perf_counter()
+
+    for name, step in _warmup_steps():
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {e}")
+            with _warmup_lock:
+                _warmup_status["failed"].append(name)
+            continue
+        with _warmup_lock:
+            _warmup_status["steps"][name] = round(time.perf_counter() - step_start, 4)
+
+    duration = time.perf_counter() - start_time
+    with _warmup_lock:
+        _warmup_status["state"] = "done"
+        _warmup_status["seconds"] = round(duration, 4)
+    logger.info(f"Warm-up finished in {duration:.2f}s")
+    return get_warmup_status()
+
+
+async def run_warmup() -> None:
+    """Run the warm-up in a worker thread, off the event loop."""
+    try:
+        await asyncio.to_thread(warm_up)
+    except Exception as e:
+        logger.error(f"Warm-up failed: {e}")
+
+
+def get_warmup_status() -> Dict[str, Any]:
+    """Get the warm-up state and seconds spent per step."""
+    with _warmup_lock:
+        return {
+            "state": _warmup_status["state"],
+            "seconds": _warmup_status["seconds"],
+            "steps": dict(_warmup_status["steps"]),
+            "failed": list(_warmup_status["failed"]),
+        }
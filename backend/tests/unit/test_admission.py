@@ -0,0 +1,89 @@
+"""Unit tests for admission control."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.services.admission import (
+    AdmissionController,
+    OverloadedError,
+    Priority,
+    request_context,
+)
+
+
+class TestAdmissionController:
+    """Test cases for AdmissionController."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.controller = AdmissionController("test", max_concurrency=1, max_queue=2)
+
+    def test_limits_concurrency_and_orders_by_priority(self):
+        """Test queued calls are admitted one at a time, highest priority first."""
+        order = []
+
+        async def call(name, priority):
+            async with self.controller.slot(priority=priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await self.controller.acquire()
+            tasks = [
+                asyncio.create_task(call("background", Priority.BACKGROUND)),
+                asyncio.create_task(call("interactive", Priority.INTERACTIVE)),
+            ]
+            await asyncio.sleep(0)
+            assert self.controller.get_stats()["queue_depth"] == 2
+            self.controller.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        assert order == ["interactive", "background"]
+        assert self.controller.get_stats()["active"] == 0
+
+    def test_rejects_when_queue_full(self):
+        """Test calls beyond the queue bound are rejected with a retry hint."""
+
+        async def run():
+            await self.controller.acquire()
+            waiters = [asyncio.create_task(self.controller.acquire()) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadedError) as exc_info:
+                await self.controller.acquire()
+            for task in waiters:
+                task.cancel()
+            return exc_info.value
+
+        error = asyncio.run(run())
+        assert error.retry_after >= 1
+        assert self.controller.get_stats()["rejected"] == 1
+
+    def test_sheds_when_deadline_passes(self):
+        """Test queued calls are shed once their deadline passes."""
+
+        async def run():
+            await self.controller.acquire()
+            with request_context(Priority.INTERACTIVE, timeout_seconds=0.05):
+                self.controller._service_time = 0.0
+                with pytest.raises(OverloadedError):
+                    await self.controller.acquire()
+
+        asyncio.run(run())
+        stats = self.controller.get_stats()
+        assert stats["shed"] == 1
+        assert stats["queue_depth"] == 0
+
+    def test_sheds_early_when_estimated_wait_exceeds_deadline(self):
+        """Test calls that cannot meet their deadline are shed without queueing."""
+
+        async def run():
+            await self.controller.acquire()
+            start_time = time.monotonic()
+            with pytest.raises(OverloadedError):
+                await self.controller.acquire(deadline=time.monotonic() + 0.1)
+            return time.monotonic() - start_time
+
+        assert asyncio.run(run()) < 0.05
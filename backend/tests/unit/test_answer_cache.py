@@ -0,0 +1,68 @@
+"""Unit tests for the semantic answer cache."""
+
+import time
+
+from src.services.answer_cache import SemanticAnswerCache, normalize_question
+
+
+class TestSemanticAnswerCache:
+    """Test cases for SemanticAnswerCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = SemanticAnswerCache(
+            max_entries=3, ttl_seconds=60, similarity_threshold=0.9
+        )
+        self.key = SemanticAnswerCache.dataset_key("file-1", "v1")
+
+    def test_normalize_question(self):
+        """Test punctuation and case do not affect the normalized question."""
+        assert normalize_question("How many ROWS?") == "how many rows"
+
+    def test_exact_hit_without_embedding(self):
+        """Test repeated questions hit on normalized text."""
+        self.cache.store(self.key, "How many rows?", None, "42 rows")
+
+        assert self.cache.lookup_exact(self.key, "how many rows") == "42 rows"
+        assert self.cache.get_stats()["exact_hits"] == 1
+
+    def test_semantic_hit_above_threshold(self):
+        """Test similar embeddings hit and dissimilar ones miss."""
+        self.cache.store(self.key, "how many rows", [1.0, 0.0], "42 rows")
+
+        assert self.cache.lookup(self.key, [0.95, 0.05]) == "42 rows"
+        assert self.cache.lookup(self.key, [0.0, 1.0]) is None
+
+        stats = self.cache.get_stats()
+        assert stats["semantic_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_scoped_to_dataset_version(self):
+        """Test answers are not shared across dataset versions."""
+        self.cache.store(self.key, "how many rows", [1.0, 0.0], "42 rows")
+        new_key = SemanticAnswerCache.dataset_key("file-1", "v2")
+
+        assert self.cache.lookup(new_key, [1.0, 0.0]) is None
+        assert self.cache.invalidate("file-1", keep_version="v2") == 1
+        assert self.cache.get_stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        for i in range(3):
+            self.cache.store(self.key, f"question {i}", None, f"answer {i}")
+        self.cache.lookup_exact(self.key, "question 0")
+        self.cache.store(self.key, "question 3", None, "answer 3")
+
+        assert self.cache.lookup_exact(self.key, "question 0") == "answer 0"
+        assert self.cache.lookup_exact(self.key, "question 1") is None
+        assert self.cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test expired entries are not served."""
+        self.cache.ttl_seconds = 0.01
+        self.cache.store(self.key, "how many rows", None, "42 rows")
+        time.sleep(0.02)
+
+        assert self.cache.lookup_exact(self.key, "how many rows") is None
+        assert self.cache.get_stats()["expirations"] == 1
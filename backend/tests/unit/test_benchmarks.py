@@ -0,0 +1,62 @@
+"""Unit tests for the benchmark dataset generator and comparison."""
+
+import csv
+
+from benchmarks.datasets import DatasetSpec, generate_csv, get_dataset
+from benchmarks.run import compare_results
+
+
+def make_run(seconds):
+    """Build benchmark output with one result per (name, seconds) pair."""
+    return {
+        "results": [
+            {"name": name, "dataset": "narrow.csv", "seconds_median": value}
+            for name, value in seconds.items()
+        ]
+    }
+
+
+class TestDatasets:
+    """Test cases for the synthetic dataset generator."""
+
+    def test_generation_is_deterministic(self, tmp_path):
+        """Test the same spec produces the same bytes and shape."""
+        spec = DatasetSpec("narrow", 500, 9, seed=3)
+        first = generate_csv(spec, tmp_path / "a.csv")
+        second = generate_csv(spec, tmp_path / "b.csv")
+
+        assert first.read_bytes() == second.read_bytes()
+        with open(first, newline="") as file:
+            rows = list(csv.reader(file))
+        assert len(rows) == 501
+        assert all(len(row) == 9 for row in rows)
+
+    def test_get_dataset_reuses_generated_file(self, tmp_path):
+        """Test a cached dataset is not regenerated."""
+        spec = DatasetSpec("narrow", 10, 3)
+        path = get_dataset(spec, tmp_path)
+        path.write_text("cached")
+        assert get_dataset(spec, tmp_path).read_text() == "cached"
+
+
+class TestCompareResults:
+    """Test cases for baseline comparison."""
+
+    def test_flags_only_slowdowns_beyond_threshold_and_noise(self):
+        """Test regressions need both a relative and an absolute slowdown."""
+        baseline = make_run({"parse": 1.0, "analyze": 1.0, "tiny": 0.001})
+        results = make_run({"parse": 1.5, "analyze": 1.1, "tiny": 0.003})
+
+        comparisons = {
+            c["name"]: c for c in compare_results(results, baseline, threshold=0.25)
+        }
+
+        assert comparisons["parse"]["regressed"]
+        assert comparisons["parse"]["change"] == 0.5
+        assert not comparisons["analyze"]["regressed"]
+        assert not comparisons["tiny"]["regressed"]  # within the noise floor
+
+    def test_ignores_benchmarks_missing_from_baseline(self):
+        """Test new benchmarks are not compared."""
+        comparisons = compare_results(make_run({"new": 1.0}), make_run({}))
+        assert comparisons == []
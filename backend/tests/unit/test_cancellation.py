@@ -0,0 +1,132 @@
+"""Unit tests for cancelling work when the client disconnects."""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.routers import upload
+from src.services.csv_service import CSVService
+from src.utils.cancellation import (
+    ClientDisconnected,
+    OperationCancelled,
+    get_cancellation_stats,
+    record_wasted,
+    run_until_disconnected,
+)
+
+
+class FakeRequest:
+    """Request stub that disconnects after a number of checks."""
+
+    def __init__(self, disconnect_after):
+        self.checks = 0
+        self.disconnect_after = disconnect_after
+        self.url = SimpleNamespace(path="/ask/")
+
+    async def is_disconnected(self):
+        self.checks += 1
+        return self.checks >= self.disconnect_after
+
+
+class TestRunUntilDisconnected:
+    """Test cases for run_until_disconnected."""
+
+    def test_returns_result_when_connected(self):
+        """Test work that finishes first returns normally."""
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "answer"
+
+        result = asyncio.run(
+            run_until_disconnected(FakeRequest(100), work(), poll_interval=0.005)
+        )
+        assert result == "answer"
+
+    def test_cancels_work_on_disconnect(self):
+        """Test work is cancelled and the cancel event set on disconnect."""
+        cancelled = []
+        cancel_event = threading.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        with pytest.raises(ClientDisconnected):
+            asyncio.run(
+                run_until_disconnected(
+                    FakeRequest(2), work(), cancel_event, poll_interval=0.005
+                )
+            )
+        assert cancelled == [True]
+        assert cancel_event.is_set()
+
+    def test_record_wasted(self):
+        """Test wasted work is accumulated per endpoint."""
+        record_wasted("test", tokens=10)
+        record_wasted("test", tokens=5, cpu_seconds=0.5)
+
+        stats = get_cancellation_stats()["test"]
+        assert stats["cancelled"] == 2
+        assert stats["wasted_tokens"] == 15
+        assert stats["wasted_cpu_seconds"] == 0.5
+
+
+class TestCancelParse:
+    """Test cases for cancelling CSV parsing."""
+
+    def test_parse_csv_cancelled(self):
+        """Test parsing stops when the cancel event is set."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write("name,age\nJohn,30\n")
+            temp_file = f.name
+
+        try:
+            cancel_event = threading.Event()
+            cancel_event.set()
+            with pytest.raises(OperationCancelled):
+                CSVService().parse_csv(temp_file, cancel_event)
+        finally:
+            os.unlink(temp_file)
+
+    def test_cancelled_ingest_waits_for_parse_thread(self, monkeypatch):
+        """Test a disconnect returns only after the parse thread stopped writing."""
+        writes = []
+
+        class SlowCSVService:
+            def parse_csv(self, file_path, cancel_event):
+                # Finishes a moment after the cancel, without checking it again
+                cancel_event.wait()
+                time.sleep(0.05)
+                writes.append("parsed")
+                return {}
+
+        class FakeDatasetService:
+            def build_row_index(self, file_id, file_path, cancel_event):
+                writes.append("row_index")
+
+        monkeypatch.setattr(upload, "CSVService", SlowCSVService)
+        file_info = {"file_id": "f1", "file_path": "unused.csv"}
+        cancel_event = threading.Event()
+
+        async def ingest():
+            try:
+                await run_until_disconnected(
+                    FakeRequest(2),
+                    upload._ingest(FakeDatasetService(), file_info, cancel_event),
+                    cancel_event,
+                    poll_interval=0.005,
+                )
+            except ClientDisconnected:
+                # The caller deletes the dataset now; nothing may be written later
+                return list(writes)
+
+        assert asyncio.run(ingest()) == ["parsed", "row_index"]
@@ -0,0 +1,122 @@
+"""Unit tests for on-demand column statistics."""
+
+import asyncio
+import csv
+import statistics
+
+import pytest
+
+from src.services.column_stats import ColumnStatsCache, describe_column
+
+
+def write_csv(path, rows):
+    """Write rows to a CSV file."""
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerows(rows)
+
+
+class TestDescribeColumn:
+    """Test cases for describe_column."""
+
+    def test_numeric_column(self):
+        """Test numeric statistics match the statistics module."""
+        values = [str(v) for v in [4, 8, 15, 16, 23, 42]] + ["", " "]
+        stats = describe_column(values, bins=4, top_k=3)
+        numbers = [4, 8, 15, 16, 23, 42]
+
+        assert stats["data_type"] == "numeric"
+        assert stats["count"] == 8
+        assert stats["empty"] == 2
+        numeric = stats["numeric"]
+        assert numeric["min"] == 4 and numeric["max"] == 42
+        assert numeric["mean"] == pytest.approx(statistics.mean(numbers))
+        assert numeric["stddev"] == pytest.approx(statistics.pstdev(numbers))
+        assert numeric["median"] == pytest.approx(15.5)
+        assert sum(numeric["histogram"]["counts"]) == 6
+        assert len(numeric["histogram"]["edges"]) == 5
+
+    def test_thousands_separators_are_numeric(self):
+        """Test values with separators fall back to per-cell parsing."""
+        stats = describe_column(["1,000", "2,500", "300"])
+        assert stats["numeric"]["max"] == 2500
+
+    def test_text_column_top_values(self):
+        """Test top-k frequencies are ordered by count."""
+        values = ["north"] * 5 + ["south"] * 3 + ["east"] * 1
+        stats = describe_column(values, top_k=2)
+
+        assert stats["data_type"] == "text"
+        assert stats["numeric"] is None
+        assert stats["distinct"] == 3
+        assert stats["top_values"] == [
+            {"value": "north", "count": 5},
+            {"value": "south", "count": 3},
+        ]
+        assert stats["length"]["max"] == 5
+
+    def test_empty_column(self):
+        """Test a column with no values has no numeric statistics."""
+        stats = describe_column(["", ""])
+        assert stats["non_empty"] == 0
+        assert stats["numeric"] is None
+        assert stats["length"]["min"] is None
+
+
+class TestColumnStatsCache:
+    """Test cases for ColumnStatsCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.cache = ColumnStatsCache(max_entries=10)
+        self.computed = []
+        compute = self.cache.compute
+
+        def counting_compute(file_path, columns):
+            self.computed.append(sorted(columns))
+            return compute(file_path, columns)
+
+        self.cache.compute = counting_compute
+
+    def test_results_are_cached_per_version(self, tmp_path):
+        """Test a column is computed once per dataset version."""
+        path = tmp_path / "data.csv"
+        write_csv(path, [["a", "b"], ["1", "x"], ["2", "y"]])
+
+        async def run():
+            first = await self.cache.get("f", "v1", str(path), ["a", "b"])
+            second = await self.cache.get("f", "v1", str(path), ["b"])
+            await self.cache.get("f", "v2", str(path), ["b"])
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert self.computed == [["a", "b"], ["b"]]
+        assert list(first) == ["a", "b"]
+        assert second["b"] == first["b"]
+        assert self.cache.get_stats()["hits"] == 1
+
+    def test_concurrent_requests_share_computation(self, tmp_path):
+        """Test overlapping concurrent requests compute each column once."""
+        path = tmp_path / "data.csv"
+        write_csv(path, [["a", "b", "c"]] + [[str(i), str(i), "z"] for i in range(50)])
+
+        async def run():
+            return await asyncio.gather(
+                self.cache.get("f", "v1", str(path), ["a", "b"]),
+                self.cache.get("f", "v1", str(path), ["b", "c"]),
+                self.cache.get("f", "v1", str(path), ["a"]),
+            )
+
+        results = asyncio.run(run())
+        computed = sorted(column for batch in self.computed for column in batch)
+        assert computed == ["a", "b", "c"]
+        assert results[0]["b"] == results[1]["b"]
+        assert results[2]["a"]["numeric"]["max"] == 49
+
+    def test_invalidate(self, tmp_path):
+        """Test invalidation drops every column of a dataset."""
+        path = tmp_path / "data.csv"
+        write_csv(path, [["a", "b"], ["1", "2"]])
+        asyncio.run(self.cache.get("f", "v1", str(path), ["a", "b"]))
+
+        assert self.cache.invalidate("f") == 2
+        assert self.cache.get_stats()["size"] == 0
@@ -0,0 +1,114 @@
+"""Unit tests for response compression."""
+
+import asyncio
+import gzip
+import zlib
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.utils.compression import CompressionMiddleware, negotiate_encoding
+from src.utils.serialization import NDJSON_MEDIA_TYPE, FastJSONResponse
+
+ROWS = [[str(i), f"name {i}", "note"] for i in range(200)]
+
+
+class TestNegotiateEncoding:
+    """Test cases for negotiate_encoding."""
+
+    def test_quality_values(self):
+        """Test zero quality refuses an encoding and wildcards match."""
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("GZIP;q=0.5") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding("*") == negotiate_encoding("br, gzip")
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("") is None
+
+
+class TestCompressionMiddleware:
+    """Test cases for CompressionMiddleware."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        app = FastAPI()
+
+        @app.get("/rows")
+        async def rows(limit: int = 200):
+            return FastJSONResponse({"rows": ROWS[:limit]})
+
+        @app.get("/lines")
+        async def lines():
+            async def stream():
+                for row in ROWS[:3]:
+                    yield ",".join(row) + "\n"
+
+            return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+
+        @app.get("/events")
+        async def events():
+            async def stream():
+                yield "event: delta\ndata: {}\n\n"
+
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        self.app = CompressionMiddleware(app, minimum_size=500, gzip_level=5)
+        self.client = TestClient(self.app)
+
+    def test_large_json_is_gzipped(self):
+        """Test bodies over the threshold are compressed with a length."""
+        response = self.client.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json()["rows"] == ROWS
+        assert int(response.headers["content-length"]) < len(response.content)
+
+    def test_small_and_unaccepted_bodies_are_unchanged(self):
+        """Test small bodies and clients without gzip get plain JSON."""
+        small = self.client.get("/rows?limit=1", headers={"Accept-Encoding": "gzip"})
+        plain = self.client.get("/rows", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in plain.headers
+        assert plain.json()["rows"] == ROWS
+
+    def test_event_streams_are_not_compressed(self):
+        """Test Server-Sent Events pass through untouched."""
+        response = self.client.get("/events", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_streamed_lines_are_flushed_one_by_one(self):
+        """Test each streamed chunk decodes as soon as it is received."""
+        messages = []
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            # The client stays connected until the response is complete
+            await asyncio.Event().wait()
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/lines",
+            "raw_path": b"/lines",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"accept-encoding", b"gzip")],
+            "scheme": "http",
+            "server": ("test", 80),
+        }
+        asyncio.run(self.app(scope, receive, send))
+
+        start, *bodies = messages
+        assert (b"content-encoding", b"gzip") in start["headers"]
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        decoded = [decoder.decompress(body["body"]) for body in bodies]
+        assert decoded[:3] == [(",".join(row) + "\n").encode() for row in ROWS[:3]]
+        assert gzip.decompress(b"".join(b["body"] for b in bodies)).count(b"\n") == 3
@@ -88,3 +88,35 @@ class TestCSVService:
         assert "3 columns" in summary
         assert "name, age, city" in summary
         assert "Data completeness" in summary
+
+    def test_parse_append(self):
+        """Test appended rows are parsed after a matching header row."""
+        result = self.csv_service.parse_append(
+            b'name,age\nAnn,41\n"Bo, Jr",7\n', ["name", "age"]
+        )
+
+        assert result["body"] == b'Ann,41\n"Bo, Jr",7\n'
+        assert result["rows"] == [["Ann", "41"], ["Bo, Jr", "7"]]
+        assert result["column_stats"]["age"]["total_cells"] == 2
+
+        with pytest.raises(ValueError, match="Header row does not match"):
+            self.csv_service.parse_append(b"name,city\nAnn,NYC\n", ["name", "age"])
+
+    def test_merge_column_stats(self):
+        """Test counts are summed and types are re-inferred for small datasets."""
+        headers = ["name", "age"]
+        old_rows = [["John", ""], ["Jane", "n/a"]]
+        new_rows = [["Ann", "41"], ["Bo", "7"], ["Cy", "12"], ["Di", "3"]]
+        existing = self.csv_service._analyze_columns(headers, old_rows)
+        appended = self.csv_service._analyze_columns(headers, new_rows)
+
+        merged = self.csv_service.merge_column_stats(existing, appended)
+        assert merged["age"]["total_cells"] == 6
+        assert merged["age"]["empty_cells"] == 1
+        assert merged["age"]["data_type"] == existing["age"]["data_type"]
+
+        merged = self.csv_service.merge_column_stats(
+            existing, appended, old_rows + new_rows
+        )
+        full = self.csv_service._analyze_columns(headers, old_rows + new_rows)
+        assert merged == full
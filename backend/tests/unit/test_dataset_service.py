@@ -0,0 +1,194 @@
+"""Unit tests for the dataset service."""
+
+import asyncio
+
+import pytest
+
+from src.core.config import settings
+from src.services import dataset_service
+from src.services.answer_cache import SemanticAnswerCache
+from src.services.column_stats import ColumnStatsCache
+from src.services.csv_service import CSVService
+from src.services.dataset_service import DatasetService
+from src.storage import ChromaClient, FileStorage
+
+
+class FakeCollection:
+    """In-memory stand-in for a Chroma collection."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def add(self, documents, metadatas, ids, embeddings=None):
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            self.documents[doc_id] = (document, metadata)
+
+    def get(self, where=None, include=None, limit=None, offset=0):
+        items = [
+            (doc_id, metadata)
+            for doc_id, (_, metadata) in self.documents.items()
+            if not where
+            or all(metadata.get(key) == value for key, value in where.items())
+        ]
+        items = items[offset : offset + limit if limit else None]
+        return {
+            "ids": [doc_id for doc_id, _ in items],
+            "metadatas": [metadata for _, metadata in items],
+        }
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.documents.pop(doc_id, None)
+
+    def file_ids(self):
+        return {metadata["file_id"] for _, metadata in self.documents.values()}
+
+
+class FakeChromaClient(ChromaClient):
+    """ChromaClient over FakeCollection, so no Chroma database is opened."""
+
+    def __init__(self):
+        self.collection_name = "test"
+        self.collection = FakeCollection()
+        self.vector_index = None
+
+
+class FakeEmbeddingService:
+    """EmbeddingService stub recording the texts it embeds."""
+
+    client = object()
+    embedded = []
+
+    async def batch_create_embeddings(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """DatasetService over a temporary upload directory and fake vectors."""
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path / "uploads"))
+    return DatasetService(FileStorage(), FakeChromaClient())
+
+
+def upload(service, name="sales.csv"):
+    """Store a file and index one document for it."""
+    file_id = service.file_storage.save_uploaded_file(b"a,b\n1,2\n", name)["file_id"]
+    service.chroma_client.add_documents(["a,b"], [{"file_id": file_id}])
+    return file_id
+
+
+def ingest(service, content):
+    """Upload, parse and index a CSV as the upload endpoint does."""
+    file_info = service.file_storage.save_uploaded_file(content, "sales.csv")
+    csv_service = CSVService()
+    csv_data = csv_service.parse_csv(file_info["file_path"])
+    service.build_row_index(file_info["file_id"], file_info["file_path"])
+    data_summary = {
+        "total_rows": csv_data["total_rows"],
+        "total_columns": csv_data["total_columns"],
+        "headers": csv_data["headers"],
+        "column_stats": csv_data["column_stats"],
+        "summary": csv_service.generate_summary(csv_data),
+    }
+    asyncio.run(service.index_dataset(file_info, csv_data, data_summary))
+    return file_info["file_id"]
+
+
+class TestDatasetService:
+    """Test cases for DatasetService."""
+
+    def test_delete_dataset_removes_vectors_and_file(self, service):
+        """Test deleting a dataset removes its vectors and keeps the others."""
+        deleted, kept = upload(service), upload(service)
+
+        assert service.delete_dataset(deleted)
+        assert not service.delete_dataset(deleted)
+        assert service.file_storage.get_file_path(deleted) is None
+        assert service.chroma_client.collection.file_ids() == {kept}
+
+    def test_delete_dataset_drops_append_lock(self, service):
+        """Test the per-dataset append lock does not outlive the dataset."""
+        file_id = upload(service)
+        dataset_service._append_lock(file_id)
+
+        assert service.delete_dataset(file_id)
+        assert file_id not in dataset_service._append_locks
+
+    def test_append_rows(self, service, monkeypatch):
+        """Test appends merge statistics, extend the index and embed new rows."""
+        answer_cache, column_stats = SemanticAnswerCache(), ColumnStatsCache()
+        monkeypatch.setattr(dataset_service, "get_answer_cache", lambda: answer_cache)
+        monkeypatch.setattr(
+            dataset_service, "get_column_stats_cache", lambda: column_stats
+        )
+        monkeypatch.setattr(dataset_service, "EmbeddingService", FakeEmbeddingService)
+        monkeypatch.setattr(FakeEmbeddingService, "embedded", [])
+
+        file_id = ingest(service, b"name,amount\na,1\nb,2\n")
+        old_key = SemanticAnswerCache.dataset_key(
+            file_id, service.get_dataset_version(file_id)
+        )
+        answer_cache.store(old_key, "What is the total?", None, "3")
+        asyncio.run(service.get_column_stats(file_id, ["amount"]))
+        FakeEmbeddingService.embedded.clear()
+
+        summary = asyncio.run(service.append_rows(file_id, b"name,amount\nc,\nd,4\n"))
+
+        assert summary["appended_rows"] == 2
+        assert summary["total_rows"] == 4
+        amount = summary["column_stats"]["amount"]
+        assert amount["total_cells"] == 4
+        assert amount["non_empty_cells"] == 3
+        assert service.get_profile(file_id)["total_rows"] == 4
+
+        file_path = service.file_storage.get_file_path(file_id)
+        row_index = service.get_row_index(file_id)
+        assert row_index.row_count == 4
+        assert row_index.read_rows(file_path, 2, 2) == [["c", ""], ["d", "4"]]
+
+        assert answer_cache.lookup_exact(old_key, "What is the total?") is None
+        assert column_stats.invalidate(file_id) == 0
+        stats = asyncio.run(service.get_column_stats(file_id, ["amount"]))
+        assert stats["version"] == summary["version"]
+        assert stats["columns"]["amount"]["numeric"]["count"] == 3
+
+        documents = service.chroma_client.collection.documents
+        assert FakeEmbeddingService.embedded == [
+            summary["summary"],
+            "Rows 3 to 4 were appended to the dataset with columns: name, amount",
+            "Row 3: c, ",
+            "Row 4: d, 4",
+        ]
+        assert documents[f"{file_id}:1"][0] == summary["summary"]
+        assert documents[f"{file_id}:6"][0] == "Row 4: d, 4"
+        assert len(documents) == 7
+
+    def test_compact_removes_orphans_and_keeps_live_datasets(self, service):
+        """Test compaction removes vectors of missing files only."""
+        live = upload(service)
+        orphan = upload(service)
+        service.file_storage.delete_file(orphan)
+
+        stats = service.compact()
+
+        assert stats["orphaned_datasets"] == 1
+        assert service.chroma_client.collection.file_ids() == {live}
+
+    def test_compact_keeps_datasets_uploaded_while_running(self, service):
+        """Test a dataset indexed during compaction is not treated as an orphan."""
+        live = upload(service)
+        list_file_ids = service.file_storage.list_file_ids
+        uploaded = []
+
+        def list_during_upload():
+            # An upload finishes right after the live files were listed
+            file_ids = list_file_ids()
+            uploaded.append(upload(service, "late.csv"))
+            return file_ids
+
+        service.file_storage.list_file_ids = list_during_upload
+        stats = service.compact()
+
+        assert stats["orphaned_datasets"] == 0
+        assert service.chroma_client.collection.file_ids() == {live, *uploaded}
@@ -0,0 +1,119 @@
+"""Unit tests for the fake OpenAI-compatible server."""
+
+import asyncio
+import random
+
+import httpx
+import openai
+import pytest
+
+from benchmarks.fake_openai import (
+    FakeOpenAIConfig,
+    LatencyDistribution,
+    create_fake_app,
+)
+from benchmarks.load import percentile
+
+MESSAGES = [{"role": "user", "content": "What is the total revenue?"}]
+
+
+def make_client(config=None):
+    """Build an OpenAI client talking to the fake server in-process."""
+    transport = httpx.ASGITransport(app=create_fake_app(config))
+    return openai.AsyncOpenAI(
+        api_key="fake",
+        base_url="http://fake/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=transport),
+    )
+
+
+class TestFakeOpenAI:
+    """Test cases for the fake OpenAI server."""
+
+    def test_completion_is_deterministic(self):
+        """Test the same messages get the same answer and usage."""
+
+        async def complete():
+            client = make_client()
+            return await client.chat.completions.create(
+                model="gpt-4o-mini", messages=MESSAGES, max_tokens=20
+            )
+
+        first = asyncio.run(complete())
+        second = asyncio.run(complete())
+        assert first.choices[0].message.content == second.choices[0].message.content
+        assert 0 < first.usage.completion_tokens <= 20
+
+    def test_stream_matches_completion(self):
+        """Test streamed chunks join to the non-streamed answer, with usage."""
+
+        async def run():
+            client = make_client()
+            full = await client.chat.completions.create(
+                model="gpt-4o-mini", messages=MESSAGES, max_tokens=20
+            )
+            stream = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=MESSAGES,
+                max_tokens=20,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            parts, usage = [], None
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+            return full, "".join(parts), usage
+
+        full, streamed, usage = asyncio.run(run())
+        assert streamed == full.choices[0].message.content
+        assert usage.completion_tokens == full.usage.completion_tokens
+
+    def test_embeddings_are_deterministic_unit_vectors(self):
+        """Test embeddings depend only on the text and have unit length."""
+
+        async def embed():
+            client = make_client(FakeOpenAIConfig(embedding_dimensions=64))
+            return await client.embeddings.create(
+                model="text-embedding-3-small", input=["a", "b", "a"]
+            )
+
+        response = asyncio.run(embed())
+        vectors = [item.embedding for item in response.data]
+        assert len(vectors[0]) == 64
+        assert vectors[0] == vectors[2] != vectors[1]
+        assert sum(v * v for v in vectors[0]) == pytest.approx(1.0)
+
+    def test_injected_rate_limit_errors(self):
+        """Test the error rate turns calls into 429 rate-limit errors."""
+
+        async def complete():
+            client = make_client(FakeOpenAIConfig(error_rate=1.0))
+            await client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+
+        with pytest.raises(openai.RateLimitError):
+            asyncio.run(complete())
+
+
+class TestLatencyDistribution:
+    """Test cases for LatencyDistribution."""
+
+    def test_parse_and_sample(self):
+        """Test specs parse and samples stay within their distribution."""
+        rng = random.Random(0)
+        assert LatencyDistribution.parse("fixed:0.2").sample(rng) == 0.2
+        uniform = LatencyDistribution.parse("uniform:0.1,0.3")
+        assert all(0.1 <= uniform.sample(rng) <= 0.3 for _ in range(100))
+        assert LatencyDistribution.parse("normal:0,1").sample(rng) >= 0.0
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse("pareto:1")
+
+    def test_percentile_nearest_rank(self):
+        """Test percentiles use the nearest-rank method."""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
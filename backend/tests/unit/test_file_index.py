@@ -0,0 +1,78 @@
+"""Unit tests for the file metadata index."""
+
+import uuid
+
+from src.storage.file_index import INDEX_FILENAME, FileIndex
+
+
+def make_file_info(tmp_path, size=10, tags=None):
+    """Build file information as FileStorage returns it."""
+    file_id = str(uuid.uuid4())
+    return {
+        "file_id": file_id,
+        "original_filename": "sales.csv",
+        "stored_filename": f"sales_{file_id}.csv",
+        "file_path": str(tmp_path / f"sales_{file_id}.csv"),
+        "file_size": size,
+        "content_hash": "0" * 64,
+        "file_extension": ".csv",
+        "upload_timestamp": "2024-01-01T00:00:00",
+        "metadata": {"description": "Sales", "tags": tags or []},
+    }
+
+
+class TestFileIndex:
+    """Test cases for FileIndex."""
+
+    def test_add_get_remove_keeps_totals(self, tmp_path):
+        """Test lookups and storage totals follow adds, updates and removals."""
+        index = FileIndex(str(tmp_path / INDEX_FILENAME))
+        first = make_file_info(tmp_path, size=10, tags=["q1"])
+        second = make_file_info(tmp_path, size=5)
+        index.add(first)
+        index.add(second)
+
+        info = index.get(first["file_id"])
+        assert info["file_path"] == first["file_path"]
+        assert info["tags"] == ["q1"]
+        assert info["metadata"]["description"] == "Sales"
+        assert index.totals() == {"total_files": 2, "total_size": 15}
+
+        index.update(first["file_id"], file_size=25, content_hash="1" * 64)
+        assert index.get(first["file_id"])["content_hash"] == "1" * 64
+        assert index.totals()["total_size"] == 30
+
+        assert index.remove(second["file_id"])
+        assert not index.remove(second["file_id"])
+        assert index.get(second["file_id"]) is None
+        assert index.totals() == {"total_files": 1, "total_size": 25}
+
+    def test_cursor_pagination(self, tmp_path):
+        """Test pages are returned newest first and end with a None cursor."""
+        index = FileIndex(str(tmp_path / INDEX_FILENAME))
+        infos = [make_file_info(tmp_path) for _ in range(5)]
+        for info in infos:
+            index.add(info)
+
+        seen, cursor = [], None
+        while True:
+            files, cursor = index.list_page(limit=2, cursor=cursor)
+            seen.extend(info["file_id"] for info in files)
+            if cursor is None:
+                break
+
+        assert seen == [info["file_id"] for info in reversed(infos)]
+        files, cursor = index.list_page()
+        assert len(files) == 5 and cursor is None
+
+    def test_backfill_indexes_existing_uploads_only(self, tmp_path):
+        """Test backfill picks up saved uploads but not other files."""
+        file_id = str(uuid.uuid4())
+        (tmp_path / f"sales_{file_id}.csv").write_text("a,b\n1,2\n")
+        (tmp_path / "notes_draft.txt").write_text("not an upload")
+
+        index = FileIndex(str(tmp_path / INDEX_FILENAME))
+        assert index.backfill(str(tmp_path)) == 1
+        assert index.backfill(str(tmp_path)) == 0
+        assert index.file_ids() == {file_id}
+        assert index.totals()["total_size"] == 8
@@ -0,0 +1,135 @@
+"""Unit tests for the background health monitor."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from src.services.health_monitor import HealthMonitor
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Starts the app with its background warm-up and prober, and immediately
+# sends requests that open the vector store too
+STARTUP_SCRIPT = """
+import json, time
+from fastapi.testclient import TestClient
+from src.main import app
+
+with TestClient(app) as client:
+    ask = client.post("/ask/", json={"question": "How many rows are there?"})
+    ready = client.get("/health/ready")
+    deadline = time.monotonic() + 30
+    while ready.status_code != 200 and time.monotonic() < deadline:
+        time.sleep(0.1)
+        ready = client.get("/health/ready")
+    print(json.dumps([ask.status_code, ask.text, ready.status_code, ready.text]))
+"""
+
+
+class TestHealthMonitor:
+    """Test cases for HealthMonitor."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.monitor = HealthMonitor(interval_seconds=10.0)
+        self.chroma_calls = 0
+
+        def check_chromadb():
+            self.chroma_calls += 1
+            return {"status": "healthy", "collection_count": 3}
+
+        self.monitor._check_chromadb = check_chromadb
+        self.monitor._check_file_storage = lambda: {
+            "status": "healthy",
+            "total_files": 1,
+            "total_size_mb": 0.1,
+        }
+
+    def test_not_ready_before_first_probe(self):
+        """Test readiness waits for the first probe."""
+        assert self.monitor.snapshot() is None
+        assert self.monitor.readiness() == {
+            "ready": False,
+            "reason": "starting",
+            "checked_at": None,
+        }
+
+    def test_snapshot_is_served_without_probing(self):
+        """Test reads use the stored snapshot instead of checking again."""
+        self.monitor.probe()
+        for _ in range(5):
+            snapshot = self.monitor.snapshot()
+
+        assert self.chroma_calls == 1
+        assert snapshot["components"]["chromadb"]["collection_count"] == 3
+        assert "checked_at" in snapshot["components"]["file_storage"]
+        assert snapshot["age_seconds"] >= 0
+        assert self.monitor.readiness()["ready"]
+
+    def test_failed_component_degrades_and_blocks_readiness(self):
+        """Test a failing required component is reported and not ready."""
+
+        def broken():
+            raise RuntimeError("store locked")
+
+        self.monitor._check_chromadb = broken
+        snapshot = self.monitor.probe()
+
+        assert snapshot["status"] == "degraded"
+        assert snapshot["components"]["chromadb"]["error"] == "store locked"
+        readiness = self.monitor.readiness()
+        assert not readiness["ready"]
+        assert readiness["reason"] == "unhealthy: chromadb"
+
+    def test_missing_openai_key_degrades_but_stays_ready(self):
+        """Test the optional OpenAI component does not block readiness."""
+        with patch("src.services.health_monitor.settings.openai_api_key", None):
+            snapshot = self.monitor.probe()
+
+        assert snapshot["status"] == "degraded"
+        assert self.monitor.readiness()["ready"]
+
+    def test_stale_snapshot_is_not_ready(self):
+        """Test a prober that stopped probing makes the instance unready."""
+        self.monitor.probe()
+        self.monitor._checked_monotonic = time.monotonic() - 31.0
+
+        readiness = self.monitor.readiness()
+        assert not readiness["ready"]
+        assert readiness["reason"] == "stale"
+
+
+class TestStartup:
+    """Test cases for requests served while background startup work runs."""
+
+    def test_requests_right_after_startup(self, tmp_path):
+        """Test /ask and readiness succeed while warm-up and probing open Chroma."""
+        env = {
+            **os.environ,
+            "OPENAI_API_KEY": "",
+            "CHROMA_DB_PATH": str(tmp_path / "chroma"),
+            "UPLOAD_DIR": str(tmp_path / "uploads"),
+            "PROFILING_DIR": str(tmp_path / "profiles"),
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'db.sqlite3'}",
+            "WARMUP_ON_STARTUP": "true",
+            "HEALTH_PROBE_INTERVAL_SECONDS": "15",
+            "LOG_LEVEL": "ERROR",
+        }
+        completed = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            capture_output=True,
+            text=True,
+            cwd=BACKEND_DIR,
+            env=env,
+            timeout=120,
+        )
+        assert completed.returncode == 0, completed.stderr
+        ask_status, ask_body, ready_status, ready_body = json.loads(
+            completed.stdout.strip().splitlines()[-1]
+        )
+        assert ask_status == 200, ask_body
+        assert ready_status == 200, ready_body
@@ -0,0 +1,175 @@
+"""Unit tests for hedged and retried calls."""
+
+import asyncio
+
+import openai
+import pytest
+
+from src.services.admission import AdmissionController
+from src.services.hedging import LatencyTracker, RetryBudget, hedged_call
+
+
+class TestHedgedCall:
+    """Test cases for hedged_call."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.budget = RetryBudget(ratio=0.1, max_tokens=2)
+        self.tracker = LatencyTracker(min_samples=1)
+        self.started = 0
+        self.cancelled = 0
+
+    def _call(self, delays, errors=()):
+        """Build a call factory whose attempts take the given delays."""
+
+        async def call():
+            attempt = self.started
+            self.started += 1
+            try:
+                await asyncio.sleep(delays[attempt])
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            if attempt < len(errors) and errors[attempt]:
+                raise errors[attempt]
+            return attempt
+
+        return call
+
+    def _run(self, call, timeout=1.0, hedge_delay=None, **kwargs):
+        return asyncio.run(
+            hedged_call(
+                call,
+                timeout=timeout,
+                hedge_delay=hedge_delay,
+                budget=self.budget,
+                tracker=self.tracker,
+                **kwargs,
+            )
+        )
+
+    def test_hedge_wins_and_loser_is_cancelled(self):
+        """Test a slow first attempt is hedged and the duplicate's result used."""
+        result = self._run(self._call([0.5, 0.01]), hedge_delay=0.02)
+
+        assert result == 1
+        assert self.cancelled == 1
+        assert self.budget.get_stats()["hedges"] == 1
+
+    def test_no_hedge_when_fast(self):
+        """Test fast calls are not duplicated."""
+        assert self._run(self._call([0.0]), hedge_delay=0.1) == 0
+        assert self.started == 1
+
+    def test_timeout(self):
+        """Test calls are abandoned at their deadline."""
+        with pytest.raises(asyncio.TimeoutError):
+            self._run(self._call([1.0]), timeout=0.05)
+        assert self.cancelled == 1
+
+    def test_retries_retryable_errors_within_budget(self):
+        """Test retryable failures are retried until the budget runs out."""
+        error = openai.APIConnectionError(request=None)
+        assert self._run(self._call([0, 0, 0], errors=[error, error])) == 2
+
+        self.started = 0
+        with pytest.raises(openai.APIConnectionError):
+            self._run(self._call([0, 0, 0], errors=[error, error, error]))
+        assert self.budget.get_stats()["denied"] == 1
+
+    def test_does_not_retry_other_errors(self):
+        """Test non-retryable failures are raised immediately."""
+        with pytest.raises(ValueError):
+            self._run(self._call([0, 0], errors=[ValueError("bad request")]))
+        assert self.started == 1
+
+    def test_attempts_finishing_together_release_the_loser(self):
+        """Test a loser finishing in the same wakeup as the winner is discarded."""
+        discarded = []
+
+        async def run():
+            both_started = asyncio.Event()
+            attempts = []
+
+            async def call():
+                attempt = len(attempts)
+                attempts.append(attempt)
+                if attempt == 1:
+                    both_started.set()
+                await both_started.wait()
+                return f"stream {attempt}"
+
+            async def on_discard(result):
+                discarded.append(result)
+
+            return await hedged_call(
+                call,
+                timeout=1.0,
+                hedge_delay=0.01,
+                budget=self.budget,
+                tracker=self.tracker,
+                on_discard=on_discard,
+            )
+
+        result = asyncio.run(run())
+
+        assert len(discarded) == 1
+        assert {result, discarded[0]} == {"stream 0", "stream 1"}
+
+    def test_hedges_need_a_free_admission_slot(self):
+        """Test hedges are skipped without a free slot and release theirs."""
+        admission = AdmissionController("chat", max_concurrency=1)
+
+        async def run(max_concurrency):
+            admission.max_concurrency = max_concurrency
+            async with admission.slot():
+                result = await hedged_call(
+                    self._call([0.1, 0.01, 0.1, 0.01]),
+                    timeout=1.0,
+                    hedge_delay=0.02,
+                    budget=self.budget,
+                    tracker=self.tracker,
+                    admission=admission,
+                )
+                return result, admission.get_stats()["active"]
+
+        assert asyncio.run(run(1)) == (0, 1)
+        assert self.started == 1
+
+        self.started = 0
+        result, active = asyncio.run(run(2))
+        assert result == 1
+        assert active == 1
+        assert self.budget.get_stats()["hedges"] == 1
+
+    def test_denied_hedge_does_not_disable_hedging_of_retries(self):
+        """Test a retry is hedged even though the first attempt could not be."""
+        admission = AdmissionController("chat", max_concurrency=2)
+        error = openai.APIConnectionError(request=None)
+
+        async def run():
+            # Another call holds the spare slot while the first attempt runs
+            await admission.acquire()
+            await admission.acquire()
+
+            async def call():
+                attempt = self.started
+                self.started += 1
+                if attempt == 0:
+                    await asyncio.sleep(0.05)
+                    admission.release()
+                    raise error
+                await asyncio.sleep(0.2 if attempt == 1 else 0.01)
+                return attempt
+
+            return await hedged_call(
+                call,
+                timeout=1.0,
+                hedge_delay=0.02,
+                budget=self.budget,
+                tracker=self.tracker,
+                admission=admission,
+            )
+
+        assert asyncio.run(run()) == 2
+        assert self.started == 3
@@ -0,0 +1,92 @@
+"""Unit tests for precomputed dataset insights."""
+
+import os
+import tempfile
+
+from src.services.csv_service import CSVService
+from src.services.insight_service import InsightService
+
+
+class TestInsightService:
+    """Test cases for InsightService."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(
+                "date,region,sales,notes\n"
+                "2024-01-05,North,100,\n"
+                "2024-01-20,South,250,late\n"
+                "2024-02-03,North,50,\n"
+                "2024-03-11,North,1000,\n"
+            )
+            self.temp_file = f.name
+        self.insight_service = InsightService()
+        column_stats = CSVService().parse_csv(self.temp_file)["column_stats"]
+        self.pack = self.insight_service.build_insight_pack(
+            self.temp_file, column_stats
+        )
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        os.unlink(self.temp_file)
+
+    def test_build_insight_pack(self):
+        """Test totals, categories, trend and missing data are computed."""
+        assert self.pack["overview"]["total_rows"] == 4
+        assert self.pack["totals"]["sales"]["sum"] == 1400
+        assert self.pack["totals"]["sales"]["max"] == 1000
+        assert self.pack["top_categories"]["region"][0] == {
+            "value": "North",
+            "count": 3,
+        }
+        assert self.pack["trend"]["rows_per_month"] == {
+            "2024-01": 2,
+            "2024-02": 1,
+            "2024-03": 1,
+        }
+        assert self.pack["missing_data"][0]["column"] == "notes"
+
+    def test_answer_standard_questions(self):
+        """Test standard questions are answered from the pack."""
+        answer = self.insight_service.answer_question
+        assert answer("How many rows are there?", self.pack) == (
+            "The dataset has 4 rows."
+        )
+        assert "1,400" in answer("What is the total sales?", self.pack)
+        assert "350" in answer("What's the average sales?", self.pack)
+        assert "North (3)" in answer("Top region values?", self.pack)
+        assert "notes" in answer("Which columns have missing data?", self.pack)
+        assert "4 columns" in answer("What are the columns?", self.pack)
+        assert "2024-01" in answer("Show the trend by month", self.pack)
+
+    def test_other_questions_go_to_model(self):
+        """Test questions outside the pack are not answered."""
+        assert (
+            self.insight_service.answer_question(
+                "Why did sales drop in February?", self.pack
+            )
+            is None
+        )
+
+    def test_filtered_and_grouped_questions_go_to_model(self):
+        """Test questions about part of the data are not answered dataset-wide."""
+        questions = [
+            "What are total sales in the South region?",
+            "Average sales in February",
+            "Which region has the highest total sales?",
+            "How many rows have region North?",
+            "What is the total sales for North?",
+            "Total sales by region",
+            "Average sales per month",
+            "Maximum sales where notes is late",
+            "What is the total sales of each region?",
+            "Is the blank value in row 3 an error?",
+            "Is the blank value an error?",
+            "How many rows have notes?",
+            "Compare sales and region",
+        ]
+        for question in questions:
+            assert (
+                self.insight_service.answer_question(question, self.pack) is None
+            ), question
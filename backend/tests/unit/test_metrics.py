@@ -0,0 +1,99 @@
+"""Unit tests for the metrics registry."""
+
+import asyncio
+
+import pytest
+
+from src.routers.metrics import collect_component_metrics
+from src.services import admission
+from src.utils import cancellation
+from src.utils.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.registry = MetricsRegistry()
+
+    def test_counter_renders_per_label_set(self):
+        """Test counters accumulate separately per label values."""
+        requests = self.registry.counter("requests_total", "Requests", ("route",))
+        requests.inc(1, "/ask")
+        requests.inc(2, "/ask")
+        requests.inc(1, "/upload")
+
+        text = self.registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{route="/ask"} 3' in text
+        assert 'requests_total{route="/upload"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test observations land in cumulative buckets with sum and count."""
+        latency = self.registry.histogram(
+            "latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, "parse")
+
+        lines = self.registry.render().splitlines()
+        assert 'latency_seconds_bucket{stage="parse",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{stage="parse",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{stage="parse"} 4' in lines
+        sum_line = next(l for l in lines if l.startswith("latency_seconds_sum"))
+        assert float(sum_line.split()[-1]) == pytest.approx(3.65)
+
+    def test_extra_families_and_label_escaping(self):
+        """Test scrape-time families are rendered with escaped label values."""
+        text = self.registry.render(
+            [("queue_depth", "gauge", "Queue depth", [({"pool": 'a"b'}, 4)])]
+        )
+        assert "# TYPE queue_depth gauge" in text
+        assert 'queue_depth{pool="a\\"b"} 4' in text
+
+    def test_get_or_create_returns_same_metric(self):
+        """Test registering a name twice returns the existing metric."""
+        first = self.registry.counter("calls_total", "Calls")
+        assert self.registry.counter("calls_total", "Calls") is first
+
+
+class TestComponentMetrics:
+    """Test cases for scrape-time component metrics."""
+
+    def test_wait_times_and_wasted_cpu_are_exported(self, monkeypatch):
+        """Test admission wait times and wasted CPU seconds reach the scrape."""
+        controller = admission.AdmissionController("chat", max_concurrency=1)
+        monkeypatch.setattr(admission, "_controllers", {"chat": controller})
+        monkeypatch.setattr(cancellation, "_stats", {})
+
+        async def wait_for_slot():
+            await controller.acquire()
+            waiter = asyncio.ensure_future(controller.acquire())
+            await asyncio.sleep(0.05)
+            controller.release()
+            await waiter
+            controller.release()
+
+        asyncio.run(wait_for_slot())
+        cancellation.record_wasted("/ask", tokens=120, cpu_seconds=0.25)
+
+        text = MetricsRegistry().render(collect_component_metrics())
+        lines = text.splitlines()
+        assert "# TYPE data_ghost_admission_wait_seconds_avg gauge" in lines
+        max_wait = next(
+            line
+            for line in lines
+            if line.startswith('data_ghost_admission_wait_seconds_max{pool="chat"}')
+        )
+        assert float(max_wait.split()[-1]) >= 0.04
+        assert any(
+            line.startswith('data_ghost_admission_wait_seconds_avg{pool="chat"}')
+            for line in lines
+        )
+        assert (
+            'data_ghost_cancelled_wasted_cpu_seconds_total{endpoint="/ask"} 0.25'
+            in lines
+        )
+        assert 'data_ghost_cancelled_wasted_tokens_total{endpoint="/ask"} 120' in lines
@@ -0,0 +1,88 @@
+"""Unit tests for complexity-based model routing."""
+
+from src.core.config import settings
+from src.services import model_router
+from src.services.model_router import ModelRouter
+
+
+class TestModelRouter:
+    """Test cases for ModelRouter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.router = ModelRouter(
+            simple_model="small",
+            complex_model="large",
+            simple_max_tokens=200,
+            complex_max_tokens=1000,
+            max_simple_prompt_tokens=50,
+        )
+        self.messages = [{"role": "user", "content": "Total rows: 100"}]
+
+    def test_simple_question_uses_small_model(self):
+        """Test lookups go to the small model with a tight limit."""
+        route = self.router.route("How many rows are there?", self.messages)
+
+        assert route.model == "small"
+        assert route.max_tokens == 200
+        assert route.complexity == "simple"
+
+    def test_reasoning_question_uses_large_model(self):
+        """Test reasoning phrases route to the large model."""
+        route = self.router.route("Why did sales drop in March?", self.messages)
+
+        assert route.model == "large"
+        assert route.max_tokens == 1000
+        assert "why" in route.reason
+
+    def test_multiple_questions_are_complex(self):
+        """Test several questions at once route to the large model."""
+        route = self.router.route("What is the max age? And the min?", self.messages)
+        assert route.complexity == "complex"
+
+    def test_large_prompt_is_complex(self):
+        """Test a prompt over the token threshold routes to the large model."""
+        messages = [{"role": "user", "content": "history " * 400}]
+        route = self.router.route("What is the total?", messages)
+        assert route.complexity == "complex"
+
+    def test_stats(self):
+        """Test routing decisions are counted."""
+        self.router.route("How many rows?", self.messages)
+        self.router.route("Explain the trend", self.messages)
+
+        stats = self.router.get_stats()
+        assert stats["simple"] == 1
+        assert stats["complex"] == 1
+
+
+class TestGetModelRouter:
+    """Test cases for get_model_router."""
+
+    def _router(self, monkeypatch, simple_model, complex_model):
+        monkeypatch.setattr(model_router, "_model_router", None)
+        monkeypatch.setattr(settings, "model_routing_enabled", True)
+        monkeypatch.setattr(settings, "routing_simple_model", simple_model)
+        monkeypatch.setattr(settings, "routing_complex_model", complex_model)
+        return model_router.get_model_router()
+
+    def test_routing_is_off_by_default(self):
+        """Test routing must be enabled explicitly."""
+        assert type(settings).model_fields["model_routing_enabled"].default is False
+
+    def test_distinct_simple_model_is_routed(self, monkeypatch):
+        """Test a cheaper simple model gets simple questions with its limit."""
+        router = self._router(monkeypatch, "small", "large")
+        route = router.route("How many rows?", [])
+
+        assert route.model == "small"
+        assert route.max_tokens == settings.routing_simple_max_tokens
+
+    def test_same_model_is_not_routed(self, monkeypatch):
+        """Test simple answers are not cut short when both models are the same."""
+        router = self._router(monkeypatch, "gpt-4o-mini", "gpt-4o-mini")
+        simple = router.route("How many rows?", [])
+        complex_route = router.route("Why did sales drop?", [])
+
+        assert simple.max_tokens == complex_route.max_tokens
+        assert simple.temperature == complex_route.temperature
@@ -0,0 +1,83 @@
+"""Unit tests for on-demand request profiling."""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+from src.utils.profiling import (
+    PROFILE_ID_HEADER,
+    ProfilingMiddleware,
+    get_profile_file,
+    list_profiles,
+    profile_thread,
+)
+
+
+def busy_work(n: int) -> int:
+    """Burn a little CPU in a worker thread."""
+    return sum(i * i for i in range(n))
+
+
+class TestProfilingMiddleware:
+    """Test cases for ProfilingMiddleware."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware)
+
+        @app.get("/work")
+        async def work():
+            return {"result": await asyncio.to_thread(profile_thread(busy_work), 1000)}
+
+        self.client = TestClient(app)
+
+    def test_requests_without_header_are_not_profiled(self, tmp_path, monkeypatch):
+        """Test requests run unprofiled unless asked for or sampled."""
+        monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "profiling_token", "secret")
+        monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+
+        response = self.client.get("/work")
+        wrong = self.client.get("/work", headers={"X-Debug-Profile": "guess"})
+
+        assert PROFILE_ID_HEADER not in response.headers
+        assert PROFILE_ID_HEADER not in wrong.headers
+        assert list_profiles() == []
+
+    def test_header_profiles_request_and_worker_threads(self, tmp_path, monkeypatch):
+        """Test an authorized header stores a profile including thread work."""
+        monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "profiling_token", "secret")
+
+        response = self.client.get("/work", headers={"X-Debug-Profile": "secret"})
+        profile_id = response.headers[PROFILE_ID_HEADER]
+
+        [info] = list_profiles()
+        assert info["profile_id"] == profile_id
+        assert info["path"] == "/work"
+        assert info["reason"] == "header"
+        assert info["worker_threads"] == 1
+        assert get_profile_file(profile_id, ".prof") is not None
+        assert "busy_work" in get_profile_file(profile_id, ".txt").read_text()
+
+    def test_sampling_and_retention(self, tmp_path, monkeypatch):
+        """Test sampled requests are profiled and old profiles are pruned."""
+        monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "profiling_sample_rate", 1.0)
+        monkeypatch.setattr(settings, "profiling_max_profiles", 2)
+
+        for _ in range(3):
+            self.client.get("/work")
+
+        profiles = list_profiles()
+        assert len(profiles) == 2
+        assert {info["reason"] for info in profiles} == {"sampled"}
+
+    def test_profile_ids_cannot_escape_profile_dir(self, tmp_path, monkeypatch):
+        """Test path-like profile IDs are rejected."""
+        monkeypatch.setattr(settings, "profiling_dir", str(tmp_path / "profiles"))
+        (tmp_path / "secret.txt").write_text("x")
+        assert get_profile_file("../secret", ".txt") is None
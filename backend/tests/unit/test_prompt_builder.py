@@ -0,0 +1,88 @@
+"""Unit tests for token-budgeted prompt assembly."""
+
+import pytest
+
+from src.services.prompt_builder import PromptBuilder, encode_column_profile
+from src.utils import tokenizer
+from src.utils.token_counter import count_tokens
+
+
+class FakeEncoding:
+    """Encoding stub splitting on whitespace, so no tokenizer files are needed."""
+
+    def encode(self, text):
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=1):
+        return [text.split() for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def fake_encoding(monkeypatch):
+    """Count tokens with FakeEncoding instead of downloading an encoding."""
+    monkeypatch.setattr(tokenizer, "get_encoding", lambda model: FakeEncoding())
+    monkeypatch.setattr(tokenizer, "_tokenizers", {})
+
+
+class TestPromptBuilder:
+    """Test cases for PromptBuilder."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.dataset = {
+            "headers": [f"col_{i}" for i in range(50)] + ["revenue"],
+            "total_rows": 1000,
+            "summary": "This dataset contains 1,000 rows and 51 columns.",
+            "column_stats": {
+                name: {
+                    "data_type": "numeric",
+                    "total_cells": 1000,
+                    "non_empty_cells": 990,
+                    "unique_values_count": 100,
+                    "sample_unique_values": ["1", "2", "3", "4"],
+                }
+                for name in [f"col_{i}" for i in range(50)] + ["revenue"]
+            },
+        }
+
+    def test_encode_column_profile(self):
+        """Test column profiles are encoded as one compact table row."""
+        row = encode_column_profile("revenue", self.dataset["column_stats"]["revenue"])
+        assert row == "revenue | numeric | 990/1000 | 100 | 1; 2; 3"
+
+    def test_prompt_stays_within_budget(self):
+        """Test packing never exceeds the token budget."""
+        builder = PromptBuilder(token_budget=150)
+        prompt, stats = builder.build("What is the total revenue?", self.dataset)
+
+        assert count_tokens(prompt) <= 150
+        assert stats["dropped_units"] > 0
+        assert "Total rows: 1000" in prompt
+
+    def test_mentioned_columns_and_chunks_are_prioritised(self):
+        """Test columns named in the question and retrieved chunks come first."""
+        builder = PromptBuilder(token_budget=200)
+        prompt, stats = builder.build(
+            "What is the total revenue?",
+            self.dataset,
+            chunks=["Row 1: 5, 6, 7"],
+        )
+
+        assert "revenue | numeric" in prompt
+        assert "Row 1: 5, 6, 7" in prompt
+        assert stats["chunks"] == 1
+
+    def test_unavailable_encoding_falls_back_to_estimates(self, monkeypatch):
+        """Test packing still respects the budget when the encoding cannot load."""
+
+        def unavailable(model):
+            raise OSError("encoding download failed")
+
+        monkeypatch.setattr(tokenizer, "get_encoding", unavailable)
+        builder = PromptBuilder(token_budget=150)
+        prompt, stats = builder.build("What is the total revenue?", self.dataset)
+
+        assert stats["approximate_tokens"] is True
+        assert stats["tokens"] <= 150
+        assert stats["dropped_units"] > 0
+        assert "Total rows: 1000" in prompt
@@ -0,0 +1,194 @@
+"""Unit tests for the query router."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.routers import query
+from src.services.admission import OverloadedError
+from src.utils.serialization import NDJSON_MEDIA_TYPE
+
+DONE_EVENT = {
+    "type": "done",
+    "model": "gpt-4o-mini",
+    "cached": False,
+    "time_to_first_token": 0.1,
+    "generation_time": 0.2,
+    "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+}
+
+
+class FakeQueryService:
+    """QueryService stub streaming scripted events."""
+
+    events = []
+    error = None
+
+    async def stream_query(self, **kwargs):
+        for event in self.events:
+            yield event
+        if self.error is not None:
+            raise self.error
+
+    async def process_batch(self, questions, **kwargs):
+        # Results arrive in completion order, here the reverse of the request
+        for index in reversed(range(len(questions))):
+            yield {
+                "index": index,
+                "question": questions[index],
+                "answer": f"answer {index}",
+                "error": None,
+                "processing_time": 0.01,
+            }
+            if self.error is not None:
+                raise self.error
+
+
+def parse_sse(text):
+    """Parse Server-Sent Events into (event, data) pairs."""
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def parse_json_lines(text):
+    """Parse JSON lines events into (event, data) pairs."""
+    events = []
+    for line in text.strip().splitlines():
+        data = json.loads(line)
+        events.append((data.pop("event"), data))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client for the query router with a stubbed QueryService."""
+    monkeypatch.setattr(query, "QueryService", FakeQueryService)
+    monkeypatch.setattr(FakeQueryService, "events", [])
+    monkeypatch.setattr(FakeQueryService, "error", None)
+    app = FastAPI()
+    app.include_router(query.router)
+    return TestClient(app)
+
+
+def stream(client, json_lines=False):
+    """Ask a question on the streaming endpoint and parse its events."""
+    headers = {"Accept": NDJSON_MEDIA_TYPE} if json_lines else {}
+    response = client.post(
+        "/ask/stream", json={"question": "What is the total?"}, headers=headers
+    )
+    assert response.status_code == 200
+    if json_lines:
+        assert response.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+        return parse_json_lines(response.text)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return parse_sse(response.text)
+
+
+class TestAskStream:
+    """Test cases for POST /ask/stream."""
+
+    @pytest.mark.parametrize("json_lines", [False, True])
+    def test_deltas_then_done(self, client, json_lines):
+        """Test answer chunks are sent as delta events followed by done."""
+        FakeQueryService.events = [
+            {"type": "delta", "content": "The total "},
+            {"type": "delta", "content": "is 42."},
+            DONE_EVENT,
+        ]
+        events = stream(client, json_lines)
+
+        assert events[:2] == [
+            ("delta", {"content": "The total "}),
+            ("delta", {"content": "is 42."}),
+        ]
+        name, done = events[2]
+        assert name == "done"
+        assert done["model"] == "gpt-4o-mini"
+        assert done["usage"]["total_tokens"] == 12
+        assert done["processing_time"] >= 0
+
+    @pytest.mark.parametrize("json_lines", [False, True])
+    def test_failure_mid_stream_sends_error_event(self, client, json_lines):
+        """Test an error after the first delta ends the stream with an error."""
+        FakeQueryService.events = [{"type": "delta", "content": "The total "}]
+        FakeQueryService.error = RuntimeError("upstream reset")
+        events = stream(client, json_lines)
+
+        assert events[0] == ("delta", {"content": "The total "})
+        assert events[1][0] == "error"
+        assert "upstream reset" in events[1][1]["detail"]
+        assert len(events) == 2
+
+    @pytest.mark.parametrize("json_lines", [False, True])
+    def test_overload_sends_retry_after(self, client, json_lines):
+        """Test an overloaded server sends an error event with retry_after."""
+        FakeQueryService.error = OverloadedError("Server is overloaded", 2.4)
+        events = stream(client, json_lines)
+
+        assert events == [
+            ("error", {"detail": "Server is overloaded", "retry_after": 2})
+        ]
+
+
+class TestAskBatch:
+    """Test cases for POST /ask/batch."""
+
+    QUESTIONS = ["question 0", "question 1", "question 2"]
+
+    def test_results_are_returned_in_request_order(self, client):
+        """Test results completing out of order are sorted by index."""
+        response = client.post("/ask/batch", json={"questions": self.QUESTIONS})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["index"] for result in results] == [0, 1, 2]
+        assert [result["answer"] for result in results] == [
+            "answer 0",
+            "answer 1",
+            "answer 2",
+        ]
+
+    def test_stream_sends_results_as_they_complete(self, client):
+        """Test streamed results are JSON lines in completion order."""
+        response = client.post(
+            "/ask/batch", json={"questions": self.QUESTIONS, "stream": True}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+        lines = [json.loads(line) for line in response.text.strip().splitlines()]
+        assert [line["index"] for line in lines] == [2, 1, 0]
+        assert lines[0]["question"] == "question 2"
+
+    def test_overload_returns_503_with_retry_after(self, client):
+        """Test an overloaded server answers 503 like /ask."""
+        FakeQueryService.error = OverloadedError("Server is overloaded", 2.4)
+        response = client.post("/ask/batch", json={"questions": self.QUESTIONS})
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "2"
+
+    def test_stream_failure_ends_with_error_line(self, client):
+        """Test a failure after streaming started is sent as an error line."""
+        FakeQueryService.error = RuntimeError("dataset vanished")
+        response = client.post(
+            "/ask/batch", json={"questions": self.QUESTIONS, "stream": True}
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.strip().splitlines()]
+        assert lines[0]["index"] == 2
+        assert lines[1]["event"] == "error"
+        assert "dataset vanished" in lines[1]["detail"]
+
+    def test_too_many_questions_are_rejected(self, client, monkeypatch):
+        """Test batches above the configured maximum are rejected."""
+        monkeypatch.setattr(query.settings, "batch_max_questions", 2)
+        response = client.post("/ask/batch", json={"questions": self.QUESTIONS})
+
+        assert response.status_code == 400
@@ -0,0 +1,219 @@
+"""Unit tests for the query service."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config import settings
+from src.services import query_service as query_service_module
+from src.services.query_service import QueryService
+from src.utils import cancellation, tokenizer
+
+
+class FakeEncoding:
+    """Encoding stub splitting on whitespace, so no tokenizer files are needed."""
+
+    def encode(self, text):
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=1):
+        return [text.split() for text in texts]
+
+
+class FakeUsage:
+    """Token usage of a fake completion."""
+
+    prompt_tokens = 10
+    completion_tokens = 2
+
+    def model_dump(self):
+        return {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12}
+
+
+def delta_chunk(content):
+    """Build a streamed completion chunk carrying answer text."""
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeStream:
+    """Streamed completion yielding the given texts, then usage."""
+
+    def __init__(self, contents, stall=False):
+        self.chunks = [delta_chunk(content) for content in contents]
+        self.chunks.append(SimpleNamespace(usage=FakeUsage(), choices=[]))
+        self.stall = stall
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.stall and len(self.chunks) == 1:
+            # The upstream stops sending before the answer is complete
+            await asyncio.Event().wait()
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    """Chat completions endpoint returning fake streams."""
+
+    def __init__(self, contents=("The total ", "is 42."), stall=False):
+        self.contents = contents
+        self.stall = stall
+        self.streams = []
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"] is True
+        stream = FakeStream(self.contents, self.stall)
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    """Build QueryServices with a fake OpenAI client and no storage."""
+    monkeypatch.setattr(tokenizer, "get_encoding", lambda model: FakeEncoding())
+    monkeypatch.setattr(tokenizer, "_tokenizers", {})
+    monkeypatch.setattr(query_service_module, "get_chroma_client", lambda: None)
+    monkeypatch.setattr(query_service_module, "get_session_store", lambda: None)
+    monkeypatch.setattr(settings, "openai_api_key", "")
+    monkeypatch.setattr(settings, "answer_cache_enabled", False)
+    monkeypatch.setattr(cancellation, "_stats", {})
+
+    def make(completions=None):
+        service = QueryService()
+        service.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=completions or FakeCompletions())
+        )
+        return service
+
+    return make
+
+
+async def collect(events):
+    """Collect every event of a stream."""
+    return [event async for event in events]
+
+
+class TestStreamQuery:
+    """Test cases for QueryService.stream_query."""
+
+    def test_streams_deltas_then_done(self, make_service):
+        """Test each chunk is a delta event and usage arrives with done."""
+        service = make_service()
+        events = asyncio.run(
+            collect(service.stream_query("What is the total?", {"total_rows": 3}))
+        )
+
+        assert [event["type"] for event in events] == ["delta", "delta", "done"]
+        assert "".join(event["content"] for event in events[:-1]) == (
+            "The total is 42."
+        )
+        assert events[-1]["cached"] is False
+        assert events[-1]["usage"]["completion_tokens"] == 2
+        assert events[-1]["time_to_first_token"] is not None
+
+    def test_without_client_streams_configuration_message(self, make_service):
+        """Test a missing API key yields one explanatory delta and done."""
+        service = make_service()
+        service.client = None
+        events = asyncio.run(collect(service.stream_query("What is the total?")))
+
+        assert [event["type"] for event in events] == ["delta", "done"]
+        assert "not configured" in events[0]["content"]
+
+    def test_closing_the_stream_closes_upstream(self, make_service):
+        """Test a client disconnect closes the upstream stream and is recorded."""
+        completions = FakeCompletions()
+        service = make_service(completions)
+
+        async def read_first_delta():
+            events = service.stream_query("What is the total?")
+            first = await anext(events)
+            # The response stops iterating when the client disconnects
+            await events.aclose()
+            return first
+
+        first = asyncio.run(read_first_delta())
+
+        assert first == {"type": "delta", "content": "The total "}
+        assert completions.streams[0].closed
+        stats = cancellation.get_cancellation_stats()["ask_stream"]
+        assert stats["cancelled"] == 1
+        assert stats["wasted_tokens"] > 0
+
+    def test_cancellation_closes_upstream(self, make_service):
+        """Test cancelling the consumer closes a stalled upstream stream."""
+        completions = FakeCompletions(stall=True)
+        service = make_service(completions)
+
+        async def cancel_while_waiting():
+            received = []
+
+            async def consume():
+                async for event in service.stream_query("What is the total?"):
+                    received.append(event)
+
+            task = asyncio.create_task(consume())
+            while len(received) < 2:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return received
+
+        received = asyncio.run(cancel_while_waiting())
+
+        assert [event["type"] for event in received] == ["delta", "delta"]
+        assert completions.streams[0].closed
+        assert cancellation.get_cancellation_stats()["ask_stream"]["cancelled"] == 1
+
+
+class TestProcessBatch:
+    """Test cases for QueryService.process_batch."""
+
+    def test_results_keep_index_bound_concurrency_and_errors(
+        self, make_service, monkeypatch
+    ):
+        """Test results carry their index, calls are bounded and errors isolated."""
+        monkeypatch.setattr(settings, "batch_max_concurrency", 8)
+        service = make_service()
+        running = []
+        peak = []
+
+        async def complete(question, prepared):
+            running.append(question)
+            peak.append(len(running))
+            try:
+                # Later questions finish first
+                await asyncio.sleep(0.05 - 0.01 * int(question[-1]))
+                if question.endswith("2"):
+                    raise ValueError("model refused")
+                return f"answer to {question}"
+            finally:
+                running.remove(question)
+
+        monkeypatch.setattr(service, "_complete", complete)
+        questions = [f"question {i}" for i in range(5)]
+        results = asyncio.run(
+            collect(service.process_batch(questions, {"total_rows": 3}, None, 2))
+        )
+
+        assert max(peak) == 2
+        assert sorted(result["index"] for result in results) == list(range(5))
+        assert [result["index"] for result in results] != list(range(5))
+        for result in results:
+            assert result["question"] == questions[result["index"]]
+            if result["index"] == 2:
+                assert result["answer"] is None
+                assert result["error"] == "model refused"
+            else:
+                assert result["answer"] == f"answer to {result['question']}"
+                assert result["error"] is None
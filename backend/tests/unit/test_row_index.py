@@ -0,0 +1,108 @@
+"""Unit tests for the CSV row-offset index."""
+
+import csv
+import io
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.storage import row_index
+from src.storage.row_index import RowIndex
+from src.utils.cancellation import OperationCancelled
+
+
+def write_csv(path, rows, line_terminator="\n"):
+    """Write rows as CSV and return them as csv.reader parses them back."""
+    buffer = io.StringIO(newline="")
+    csv.writer(buffer, lineterminator=line_terminator).writerows(rows)
+    path.write_bytes(buffer.getvalue().encode("utf-8"))
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.reader(file))
+
+
+class TestRowIndex:
+    """Test cases for RowIndex."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.rows = [["id", "name", "note"]] + [
+            [str(i), f"name {i}", f"line one\nline two {i}" if i % 7 == 0 else "x"]
+            for i in range(500)
+        ]
+
+    def test_pages_match_csv_reader(self, tmp_path):
+        """Test every page equals the same slice of a full parse."""
+        parsed = write_csv(tmp_path / "data.csv", self.rows)
+        index = RowIndex.build(str(tmp_path / "data.csv"), str(tmp_path / "rows.bin"))
+
+        assert index.row_count == 500
+        assert index.read_header(str(tmp_path / "data.csv")) == parsed[0]
+        for offset in (0, 1, 137, 490):
+            page = index.read_rows(str(tmp_path / "data.csv"), offset, 25)
+            assert page == parsed[1:][offset : offset + 25]
+        assert index.read_rows(str(tmp_path / "data.csv"), 500, 25) == []
+
+    def test_quotes_across_chunk_boundaries(self, tmp_path):
+        """Test quoted newlines are handled when chunks split records."""
+        parsed = write_csv(tmp_path / "data.csv", self.rows, line_terminator="\r\n")
+        with patch.object(row_index, "_CHUNK_SIZE", 7):
+            index = RowIndex.build(
+                str(tmp_path / "data.csv"), str(tmp_path / "rows.bin")
+            )
+
+        assert index.row_count == 500
+        page = index.read_rows(str(tmp_path / "data.csv"), 0, 500)
+        assert page == parsed[1:]
+
+    def test_missing_trailing_newline(self, tmp_path):
+        """Test the last row is indexed without a final newline."""
+        (tmp_path / "data.csv").write_bytes(b"a,b\n1,2\n3,4")
+        index = RowIndex.build(str(tmp_path / "data.csv"), str(tmp_path / "rows.bin"))
+
+        assert index.row_count == 2
+        assert index.read_rows(str(tmp_path / "data.csv"), 1, 10) == [["3", "4"]]
+
+    def test_offsets_are_packed(self, tmp_path):
+        """Test offsets of small files take four bytes each."""
+        write_csv(tmp_path / "data.csv", self.rows)
+        index = RowIndex.build(str(tmp_path / "data.csv"), str(tmp_path / "rows.bin"))
+
+        assert index.itemsize == 4
+        # Header, 500 rows and the end offset, after the 8-byte file header
+        assert (tmp_path / "rows.bin").stat().st_size == 8 + 4 * 502
+
+    def test_build_can_be_cancelled(self, tmp_path):
+        """Test a set cancel event aborts the scan."""
+        write_csv(tmp_path / "data.csv", self.rows)
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(OperationCancelled):
+            RowIndex.build(
+                str(tmp_path / "data.csv"), str(tmp_path / "rows.bin"), cancel_event
+            )
+
+    def test_extend_matches_rebuild(self, tmp_path):
+        """Test extending with appended rows equals indexing the whole file."""
+        write_csv(tmp_path / "data.csv", self.rows[:201])
+        index = RowIndex.build(str(tmp_path / "data.csv"), str(tmp_path / "rows.bin"))
+        start = (tmp_path / "data.csv").stat().st_size
+        parsed = write_csv(tmp_path / "data.csv", self.rows)
+
+        assert index.extend(str(tmp_path / "data.csv"), start) == 300
+        assert index.row_count == 500
+        assert index.read_rows(str(tmp_path / "data.csv"), 190, 20) == parsed[191:211]
+        rebuilt = RowIndex.build(
+            str(tmp_path / "data.csv"), str(tmp_path / "rebuilt.bin")
+        )
+        assert (tmp_path / "rows.bin").read_bytes() == (
+            tmp_path / "rebuilt.bin"
+        ).read_bytes()
+        assert RowIndex(str(tmp_path / "rows.bin")).row_count == 500
+
+    def test_first_record_end_skips_quoted_newlines(self):
+        """Test the header record may contain quoted newlines."""
+        data = b'a,"b\nc"\n1,2\n'
+        assert row_index.first_record_end(data) == 8
+        assert row_index.first_record_end(b"a,b") == 3
@@ -0,0 +1,54 @@
+"""Unit tests for fast JSON serialization."""
+
+import asyncio
+import json
+from datetime import datetime
+
+import numpy as np
+
+from src.utils import serialization
+from src.utils.serialization import FastJSONResponse, dumps, json_lines
+
+
+class TestSerialization:
+    """Test cases for dumps and JSON lines."""
+
+    def test_dumps_matches_stdlib(self):
+        """Test output parses to the same value as the standard library's."""
+        value = {"rows": [["1", "é"]], "stats": {"mean": 1.5, "empty": None}}
+        assert json.loads(dumps(value)) == value
+
+    def test_dumps_numpy_dates_and_int_keys(self, monkeypatch):
+        """Test values FastAPI would otherwise pre-encode, with and without orjson."""
+        value = {
+            "counts": np.arange(3),
+            "max": np.float64(2.5),
+            "at": datetime(2024, 1, 1),
+            1: "one",
+        }
+        expected = {
+            "counts": [0, 1, 2],
+            "max": 2.5,
+            "at": "2024-01-01T00:00:00",
+            "1": "one",
+        }
+        assert json.loads(dumps(value)) == expected
+
+        monkeypatch.setattr(serialization, "orjson", None)
+        value["max"] = 2.5
+        assert json.loads(dumps(value)) == expected
+
+    def test_response_and_json_lines(self):
+        """Test the response renders with dumps and lines are newline-framed."""
+        assert FastJSONResponse({"a": 1}).body == b'{"a":1}'
+
+        async def items():
+            for i in range(3):
+                yield {"index": i}
+
+        async def collect():
+            return [line async for line in json_lines(items())]
+
+        lines = asyncio.run(collect())
+        assert [json.loads(line) for line in lines] == [{"index": i} for i in range(3)]
+        assert all(line.endswith(b"\n") for line in lines)
@@ -0,0 +1,87 @@
+"""Unit tests for the session store."""
+
+import pytest
+
+from src.storage.session_store import SessionStore, sqlite_path_from_url
+from src.utils import tokenizer
+
+
+class FakeEncoding:
+    """Encoding stub splitting on whitespace, so no tokenizer files are needed."""
+
+    def encode(self, text):
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=1):
+        return [text.split() for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def fake_encoding(monkeypatch):
+    """Count tokens with FakeEncoding instead of downloading an encoding."""
+    monkeypatch.setattr(tokenizer, "get_encoding", lambda model: FakeEncoding())
+    monkeypatch.setattr(tokenizer, "_tokenizers", {})
+
+
+class TestSessionStore:
+    """Test cases for SessionStore."""
+
+    def test_sqlite_path_from_url(self):
+        """Test the database path is taken from a sqlite URL."""
+        assert sqlite_path_from_url("sqlite:///./data_ghost.db") == "./data_ghost.db"
+        with pytest.raises(ValueError):
+            sqlite_path_from_url("postgresql://localhost/db")
+
+    def test_history_round_trip(self, tmp_path):
+        """Test turns are persisted and reloaded from SQLite."""
+        db_path = str(tmp_path / "sessions.db")
+        store = SessionStore(db_path)
+        store.append_turn("s1", "How many rows?", "There are 42 rows.")
+
+        reopened = SessionStore(db_path)
+        turns = reopened.get_history("s1")["turns"]
+        assert [turn["question"] for turn in turns] == ["How many rows?"]
+
+    def test_old_turns_fold_into_summary(self, tmp_path):
+        """Test turns beyond the limit are kept only in the rolling summary."""
+        store = SessionStore(str(tmp_path / "sessions.db"), max_turns=2)
+        for i in range(3):
+            store.append_turn("s1", f"question {i}", f"answer {i}")
+
+        history = store.get_history("s1")
+        assert len(history["turns"]) == 2
+        assert "question 0" in history["summary"]
+
+    def test_context_window_respects_budget(self, tmp_path):
+        """Test only the newest turns that fit the budget are returned."""
+        store = SessionStore(str(tmp_path / "sessions.db"))
+        for i in range(5):
+            store.append_turn("s1", f"question {i}", "answer " * 20)
+
+        window = store.get_context_window("s1", token_budget=30)
+        assert [turn.question for turn in window["turns"]] == ["question 4"]
+
+    def test_lru_bounds_memory_and_clear(self, tmp_path):
+        """Test the in-memory cache is bounded and clearing removes a session."""
+        store = SessionStore(str(tmp_path / "sessions.db"), max_sessions=2)
+        for session_id in ("s1", "s2", "s3"):
+            store.append_turn(session_id, "question", "answer")
+
+        assert store.get_stats()["cached_sessions"] == 2
+        assert store.has_history("s1")
+        assert store.clear("s1")
+        assert not store.has_history("s1")
+
+    def test_unavailable_encoding_falls_back_to_estimates(self, tmp_path, monkeypatch):
+        """Test turns are still recorded when the encoding cannot load."""
+
+        def unavailable(model):
+            raise OSError("encoding download failed")
+
+        monkeypatch.setattr(tokenizer, "get_encoding", unavailable)
+        store = SessionStore(str(tmp_path / "sessions.db"))
+        store.append_turn("s1", "How many rows?", "There are 42 rows.")
+
+        window = store.get_context_window("s1", token_budget=100)
+        assert [turn.question for turn in window["turns"]] == ["How many rows?"]
+        assert window["turns"][0].tokens > 0
@@ -0,0 +1,74 @@
+"""Unit tests for in-flight call deduplication."""
+
+import asyncio
+
+import pytest
+
+from src.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.flight = SingleFlight()
+        self.calls = 0
+
+    async def _answer(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return "42 rows"
+
+    def test_concurrent_duplicates_share_one_call(self):
+        """Test identical concurrent calls run once and share the result."""
+
+        async def run():
+            return await asyncio.gather(
+                *(self.flight.do("rows", self._answer) for _ in range(10))
+            )
+
+        assert asyncio.run(run()) == ["42 rows"] * 10
+        assert self.calls == 1
+        assert self.flight.get_stats() == {"calls": 1, "shared": 9, "in_flight": 0}
+
+    def test_sequential_calls_are_not_shared(self):
+        """Test a finished call is not reused."""
+
+        async def run():
+            await self.flight.do("rows", self._answer)
+            await self.flight.do("rows", self._answer)
+
+        asyncio.run(run())
+        assert self.calls == 2
+
+    def test_errors_are_shared(self):
+        """Test every waiter receives the call's exception."""
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        async def run():
+            return await asyncio.gather(
+                self.flight.do("rows", fail),
+                self.flight.do("rows", fail),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(r, ValueError) for r in asyncio.run(run()))
+
+    def test_cancelling_one_waiter_keeps_call_running(self):
+        """Test the call survives until its last waiter is cancelled."""
+
+        async def run():
+            first = asyncio.create_task(self.flight.do("rows", self._answer))
+            second = asyncio.create_task(self.flight.do("rows", self._answer))
+            await asyncio.sleep(0)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(run()) == "42 rows"
+        assert self.calls == 1
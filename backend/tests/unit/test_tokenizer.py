@@ -0,0 +1,75 @@
+"""Unit tests for the tokenizer."""
+
+from src.utils.tokenizer import Tokenizer, approximate_token_count
+
+
+class FakeEncoding:
+    """Encoding stub splitting on whitespace and recording calls."""
+
+    def __init__(self):
+        self.encoded = []
+        self.batches = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=1):
+        self.batches.append(list(texts))
+        return [text.split() for text in texts]
+
+
+class FakeTokenizer(Tokenizer):
+    """Tokenizer using FakeEncoding so no tokenizer files are needed."""
+
+    fake = None
+
+    @property
+    def encoding(self):
+        return self.fake
+
+
+class TestTokenizer:
+    """Test cases for Tokenizer."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.tokenizer = FakeTokenizer(cache_size=3, batch_threshold=3)
+        self.tokenizer.fake = FakeEncoding()
+
+    def test_counts_are_memoized(self):
+        """Test repeated strings are encoded once."""
+        assert self.tokenizer.count("a b c") == 3
+        assert self.tokenizer.count("a b c") == 3
+
+        assert self.tokenizer.fake.encoded == ["a b c"]
+        assert self.tokenizer.cache_info()["hits"] == 1
+
+    def test_lru_is_bounded(self):
+        """Test the least recently used count is evicted."""
+        for text in ["a", "b", "c", "d"]:
+            self.tokenizer.count(text)
+
+        assert self.tokenizer.cache_info()["size"] == 3
+        self.tokenizer.count("a")
+        assert self.tokenizer.fake.encoded.count("a") == 2
+
+    def test_count_batch_encodes_uncached_texts_together(self):
+        """Test uncached texts are batch encoded once each, in order."""
+        self.tokenizer.count("x y")
+        counts = self.tokenizer.count_batch(["a", "b c", "x y", "a", "d e f"])
+
+        assert counts == [1, 2, 2, 1, 3]
+        assert self.tokenizer.fake.batches == [["a", "b c", "d e f"]]
+
+    def test_small_batches_encode_individually(self):
+        """Test batches under the threshold skip encode_batch."""
+        assert self.tokenizer.count_batch(["a", "b"]) == [1, 1]
+        assert self.tokenizer.fake.batches == []
+
+    def test_approximate_mode(self):
+        """Test approximate counts need no encoding."""
+        assert self.tokenizer.count("abcdefgh", approximate=True) == 2
+        assert self.tokenizer.count_batch(["abcd", "a"], approximate=True) == [1, 1]
+        assert self.tokenizer.fake.encoded == []
+        assert approximate_token_count("") == 0
@@ -0,0 +1,135 @@
+"""Unit tests for quantized vector storage."""
+
+import numpy as np
+import pytest
+
+from src.storage.quantization import (
+    ProductQuantizer,
+    ScalarQuantizer,
+    benchmark_quantization,
+    make_benchmark_set,
+)
+from src.storage.vector_index import QuantizedVectorIndex
+
+
+class TestQuantizers:
+    """Test cases for the scalar and product quantizers."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.vectors, self.queries = make_benchmark_set(
+            n_vectors=2000, n_queries=20, dim=64, n_clusters=20
+        )
+
+    def test_scalar_round_trip(self):
+        """Test int8 codes decode close to the original vectors."""
+        quantizer = ScalarQuantizer(64)
+        quantizer.train(self.vectors)
+        codes = quantizer.encode(self.vectors)
+
+        assert codes.dtype == np.int8
+        error = np.abs(quantizer.decode(codes) - self.vectors).max()
+        assert error <= quantizer.scale.max()
+
+    def test_scalar_score_matches_decoded_inner_product(self):
+        """Test approximate scores equal inner products with decoded vectors."""
+        quantizer = ScalarQuantizer(64)
+        quantizer.train(self.vectors)
+        codes = quantizer.encode(self.vectors)
+
+        expected = quantizer.decode(codes) @ self.queries[0]
+        np.testing.assert_allclose(
+            quantizer.score(self.queries[0], codes), expected, atol=1e-4
+        )
+
+    def test_product_quantizer_code_size(self):
+        """Test product quantization stores one byte per sub-vector."""
+        quantizer = ProductQuantizer(64, n_subvectors=8, n_iterations=5)
+        quantizer.train(self.vectors)
+        codes = quantizer.encode(self.vectors)
+
+        assert codes.shape == (2000, 8)
+        assert codes.dtype == np.uint8
+
+    def test_benchmark_reports_memory_and_recall(self):
+        """Test the benchmark reports savings and reranked recall."""
+        report = benchmark_quantization(self.vectors, self.queries, k=5)
+
+        assert report["compression_ratio"] > 3.5
+        assert report["memory_saved_bytes"] > 0
+        assert report["recall_at_k_reranked"] >= 0.95
+        assert report["recall_lost"] == pytest.approx(
+            1.0 - report["recall_at_k_reranked"]
+        )
+
+
+class TestQuantizedVectorIndex:
+    """Test cases for QuantizedVectorIndex."""
+
+    def _add_vectors(self, index, vectors, file_id="file-1"):
+        ids = [f"{file_id}-{i}" for i in range(len(vectors))]
+        index.add(
+            ids,
+            vectors.tolist(),
+            [f"doc {i}" for i in range(len(vectors))],
+            [{"file_id": file_id} for _ in vectors],
+        )
+        return ids
+
+    def test_query_returns_nearest_after_training(self, tmp_path):
+        """Test exact re-ranking finds the query vector itself."""
+        vectors, _ = make_benchmark_set(n_vectors=300, dim=32, n_clusters=10)
+        index = QuantizedVectorIndex(str(tmp_path), train_size=100)
+        ids = self._add_vectors(index, vectors)
+
+        assert index.quantizer.is_trained
+        results = index.query([vectors[42].tolist()], n_results=3)
+        assert results["ids"][0][0] == ids[42]
+        assert results["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+        assert results["metadatas"][0][0] == {"file_id": "file-1"}
+
+    def test_delete_and_filter(self, tmp_path):
+        """Test deleted rows and filtered-out rows are never returned."""
+        vectors, _ = make_benchmark_set(n_vectors=40, dim=16, n_clusters=4)
+        index = QuantizedVectorIndex(str(tmp_path), train_size=1000)
+        first_ids = self._add_vectors(index, vectors[:20], "file-1")
+        self._add_vectors(index, vectors[20:], "file-2")
+
+        assert index.delete([first_ids[0]]) == 1
+        results = index.query([vectors[0].tolist()], n_results=5)
+        assert first_ids[0] not in results["ids"][0]
+
+        results = index.query(
+            [vectors[0].tolist()], n_results=5, where={"file_id": "file-2"}
+        )
+        assert all(doc_id.startswith("file-2") for doc_id in results["ids"][0])
+
+    def test_reload_from_disk(self, tmp_path):
+        """Test a reopened index keeps its codes and deletions."""
+        vectors, _ = make_benchmark_set(n_vectors=200, dim=32, n_clusters=10)
+        index = QuantizedVectorIndex(str(tmp_path), train_size=100)
+        ids = self._add_vectors(index, vectors)
+        index.delete(ids[:10])
+
+        reopened = QuantizedVectorIndex(str(tmp_path), train_size=100)
+        usage = reopened.memory_usage()
+        assert usage["trained"]
+        assert usage["live_vectors"] == 190
+        assert usage["memory_saved_bytes"] > 0
+
+    def test_compact_reclaims_deleted_rows(self, tmp_path):
+        """Test compaction rewrites the index without deleted rows."""
+        vectors, _ = make_benchmark_set(n_vectors=200, dim=32, n_clusters=10)
+        index = QuantizedVectorIndex(str(tmp_path), train_size=100)
+        self._add_vectors(index, vectors[:100], "file-1")
+        kept_ids = self._add_vectors(index, vectors[100:], "file-2")
+
+        assert index.delete_where({"file_id": "file-1"}) == 100
+        stats = index.compact()
+
+        assert stats["removed_rows"] == 100
+        assert stats["reclaimed_bytes"] > 0
+        assert index.size == 100
+        assert index.metadata_values("file_id") == {"file-2"}
+        results = index.query([vectors[150].tolist()], n_results=1)
+        assert results["ids"][0] == [kept_ids[50]]
@@ -0,0 +1,68 @@
+"""Unit tests for lazy imports and the startup warm-up."""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from src.utils import warmup
+from src.utils.warmup import LAZY_MODULES, get_warmup_status, warm_up
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class TestLazyImports:
+    """Test cases for keeping heavy dependencies out of startup."""
+
+    def test_app_import_does_not_load_heavy_modules(self, tmp_path):
+        """Test importing the app leaves openai, chromadb and tiktoken unloaded."""
+        script = (
+            "import sys, src.main; "
+            f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            cwd=BACKEND_DIR,
+            env={
+                "PATH": "",
+                "UPLOAD_DIR": str(tmp_path / "uploads"),
+                "CHROMA_DB_PATH": str(tmp_path / "chroma"),
+                "PROFILING_DIR": str(tmp_path / "profiles"),
+            },
+            check=True,
+        )
+        assert completed.stdout.strip().splitlines()[-1] == "[]"
+
+
+class TestWarmup:
+    """Test cases for the background warm-up."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.steps = []
+        self.patcher = patch.object(
+            warmup,
+            "_warmup_steps",
+            return_value=[
+                ("first", lambda: self.steps.append("first")),
+                ("broken", lambda: 1 / 0),
+                ("last", lambda: self.steps.append("last")),
+            ],
+        )
+        self.patcher.start()
+
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        self.patcher.stop()
+
+    def test_failed_step_does_not_stop_warmup(self):
+        """Test a failing step is recorded and later steps still run."""
+        status = warm_up()
+
+        assert self.steps == ["first", "last"]
+        assert status["state"] == "done"
+        assert set(status["steps"]) >= {"first", "last"}
+        assert "broken" in status["failed"]
+        assert get_warmup_status()["seconds"] is not None